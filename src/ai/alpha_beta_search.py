@@ -0,0 +1,338 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from ai.educated_guess_heuristic import eval_material_state
+from ai.endgame_tablebase import EndgameTablebase, Outcome, TablebaseEntry
+from ai.move_ordering import MoveOrderer
+from ai.transposition_table import Bound, TranspositionTable
+from board import Board
+from component.game import P
+from state.move_sequence import MoveSequence
+
+# Score of a won position, far above any material score
+WIN_SCORE = 10_000
+INFINITY = 10 * WIN_SCORE
+# How many nodes are searched between two clock checks
+TIME_CHECK_INTERVAL = 256
+# Deepest iteration of iterative deepening, in practice the time or node budget stops it first
+MAX_SEARCH_DEPTH = 64
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time or node budget runs out.
+    """
+
+
+@dataclass
+class SearchResult:
+    """
+    Outcome of a search: the chosen move, its score for the player to move and the expected line of play.
+    """
+    best_move: Optional[MoveSequence]
+    score: int
+    principal_variation: list[MoveSequence] = field(default_factory=list)
+    depth: int = 0
+    nodes: int = 0
+    # False when the budget ran out before every root move was searched
+    is_complete: bool = True
+    # True when the move was taken from the opening book without a search
+    is_book_move: bool = False
+    # True when the move and score were read from the endgame tablebase
+    is_tablebase_move: bool = False
+
+
+def get_opponent_name(player: str) -> str:
+    return P.P2.name if player == P.P1.name else P.P1.name
+
+
+class AlphaBetaSearch:
+    """
+    Negamax search with alpha-beta pruning over the position of a Board.
+
+    Moves are explored in place with make_move and unmake_move, so the board is left as it was found.
+    Run it inside an AIContextManager to search the AI copy of the game instead of the main game.
+    A chain capture is searched as a single move with all its hops, so every ply switches sides.
+    Searched positions are kept in a transposition table by their hash key, so positions reached
+    again through another order of moves are not searched twice.
+    Moves are tried in the order given by a MoveOrderer, so most cutoffs happen on the first moves.
+    The heuristic scores the piece counts the board keeps up to date, so evaluating a position does not scan the cells.
+    With an endgame tablebase, positions it covers are scored by their exact result instead of being searched.
+    A position repeated from the game or the line searched, or one past the turn limit without progress, is a draw.
+    """
+
+    def __init__(
+            self, board: Board, heuristic: Callable = eval_material_state, win_score: int = WIN_SCORE,
+            transposition_table: Optional[TranspositionTable] = None, move_orderer: Optional[MoveOrderer] = None,
+            tablebase: Optional[EndgameTablebase] = None
+    ):
+        self.board = board
+        self.heuristic = heuristic
+        self.win_score = win_score
+        self.transposition_table = transposition_table if transposition_table is not None else TranspositionTable()
+        self.move_orderer = move_orderer if move_orderer is not None else MoveOrderer()
+        self.tablebase = tablebase
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+        self._node_limit: Optional[int] = None
+        self._stop_event: Optional[threading.Event] = None
+
+    def search(
+            self, max_depth: int, time_limit: Optional[float] = None, node_limit: Optional[int] = None
+    ) -> SearchResult:
+        """
+        Search the current position to the given depth and return the best move found.
+
+        Args:
+            max_depth: Number of turns to look ahead.
+            time_limit: Optional budget in seconds, when it runs out the best root move found so far is returned.
+            node_limit: Optional budget of searched positions, handled like the time limit.
+        """
+        self._start_budget(time_limit, node_limit)
+        return self._search_root(max_depth)
+
+    def iterative_deepening(
+            self, max_depth: int = MAX_SEARCH_DEPTH, time_limit: Optional[float] = None,
+            node_limit: Optional[int] = None, stop_event: Optional[threading.Event] = None
+    ) -> SearchResult:
+        """
+        Search to depth 1, 2, ... max_depth until the time or node budget runs out.
+
+        An iteration cut short by the budget is dropped and the deepest completed one is returned,
+        only a cut short first iteration is used as is, so there is always a move to play.
+        Every iteration searches the best moves stored by the previous one first, which keeps the repeated work small.
+        Setting the optional stop event from another thread ends the search like a spent budget.
+        """
+        self._start_budget(time_limit, node_limit, stop_event)
+        forced = len(self.get_moves()) <= 1
+
+        best = None
+        for depth in range(1, max_depth + 1):
+            result = self._search_root(depth)
+            if not result.is_complete:
+                best = best or result
+                break
+            best = result
+            # a single move needs no search and a found win or loss will not change deeper
+            if (forced or result.is_tablebase_move or abs(result.score) >= self.win_score // 2
+                    or self._is_budget_spent()):
+                break
+
+        best.nodes = self.nodes
+        return best
+
+    def search_window(
+            self, depth: int, alpha: int = -INFINITY, beta: int = INFINITY, ply: int = 0,
+            time_limit: Optional[float] = None
+    ) -> tuple[int, list[MoveSequence]]:
+        """
+        Score the current position for the player to move inside the (alpha, beta) window.
+
+        Searches one subtree of a search driven from elsewhere, ply is the distance from that search's root.
+        Raises SearchTimeout when the time limit runs out.
+        """
+        self._start_budget(time_limit, None)
+        return self._negamax(depth, alpha, beta, ply)
+
+    def _start_budget(
+            self, time_limit: Optional[float], node_limit: Optional[int],
+            stop_event: Optional[threading.Event] = None
+    ) -> None:
+        self.nodes = 0
+        self._deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self._node_limit = node_limit
+        self._stop_event = stop_event
+        self.move_orderer.new_search()
+        # pieces may have been placed directly since the last move
+        self.board.refresh_hash_key()
+        self.board.refresh_material()
+
+    def _is_budget_spent(self) -> bool:
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            return True
+        if self._stop_event is not None and self._stop_event.is_set():
+            return True
+        return self._deadline is not None and time.perf_counter() >= self._deadline
+
+    def _search_root(self, max_depth: int) -> SearchResult:
+        moves = self.get_moves()
+        if not moves:
+            return SearchResult(None, self._evaluate_loss(0), depth=max_depth, nodes=self.nodes)
+
+        if self.tablebase is not None:
+            found = self.tablebase.best_move(self.board)
+            if found is not None:
+                move, tablebase_entry = found
+                return SearchResult(
+                    move, self._tablebase_score(tablebase_entry, 0), [move], max_depth, self.nodes,
+                    is_tablebase_move=True
+                )
+
+        key = self.board.game.hash_key
+        entry = self.transposition_table.probe(key)
+        moves = self._order_moves(moves, 0, entry.best_move if entry else None)
+
+        best = SearchResult(moves[0], -INFINITY, [moves[0]], max_depth)
+        alpha = -INFINITY
+        try:
+            for move in moves:
+                score, line = self._search_move(move, max_depth, alpha, INFINITY, 0)
+                if score > best.score:
+                    best.best_move, best.score, best.principal_variation = move, score, [move] + line
+                alpha = max(alpha, score)
+        except SearchTimeout:
+            best.is_complete = False
+        else:
+            self.transposition_table.store(key, max_depth, Bound.EXACT, best.score, best.best_move)
+
+        best.nodes = self.nodes
+        return best
+
+    def get_moves(self) -> list[MoveSequence]:
+        """
+        All moves available to the player to move, a chain capture is a single move.
+        """
+        return self.board.get_move_sequences()
+
+    def has_moves(self) -> bool:
+        """
+        Whether the player to move has a move, the single steps and jumps are found without playing out chain captures.
+        """
+        return bool(self.board.get_available_moves())
+
+    def evaluate(self) -> int:
+        """
+        Score the position for the player to move.
+        """
+        game = self.board.game
+        player = game.current_player.name
+        return self.heuristic(game.material[player], game.material[get_opponent_name(player)])
+
+    def _negamax(
+            self, depth: int, alpha: int, beta: int, ply: int
+    ) -> tuple[int, list[MoveSequence]]:
+        self._count_node()
+        # a position met before on the way here can be repeated forever, which the rules make a draw
+        game = self.board.game
+        if ply > 0 and (game.is_repetition(2) or game.is_no_progress_draw()):
+            return 0, []
+        if self.tablebase is not None:
+            tablebase_entry = self.tablebase.probe(self.board)
+            if tablebase_entry is not None:
+                return self._tablebase_score(tablebase_entry, ply), []
+
+        key = self.board.game.hash_key
+        table_move = None
+        if depth > 0:
+            entry = self.transposition_table.probe(key)
+            if entry is not None:
+                table_move = entry.best_move
+                if entry.depth >= depth:
+                    score = self._score_from_table(entry.score, ply)
+                    if (entry.bound == Bound.EXACT
+                            or entry.bound == Bound.LOWER and score >= beta
+                            or entry.bound == Bound.UPPER and score <= alpha):
+                        return score, [table_move] if table_move else []
+
+        # a leaf only needs to know whether a move exists, the chain captures are built for nodes that are expanded
+        if depth <= 0:
+            if not self.has_moves():
+                return self._evaluate_loss(ply), []
+            return self.evaluate(), []
+        moves = self.get_moves()
+        if not moves:
+            return self._evaluate_loss(ply), []
+
+        original_alpha = alpha
+        best_score, best_line = -INFINITY, []
+        for move in self._order_moves(moves, ply, table_move):
+            score, line = self._search_move(move, depth, alpha, beta, ply)
+            if score > best_score:
+                best_score, best_line = score, [move] + line
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.move_orderer.record_cutoff(move, ply, depth)
+                break
+
+        if best_score <= original_alpha:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.transposition_table.store(key, depth, bound, self._score_to_table(best_score, ply), best_line[0])
+
+        return best_score, best_line
+
+    def _search_move(
+            self, move: MoveSequence, depth: int, alpha: int, beta: int, ply: int
+    ) -> tuple[int, list[MoveSequence]]:
+        """
+        Make the move, score the resulting position for the player who made it and unmake it.
+        """
+        records = self.board.make_sequence(move)
+        try:
+            score, line = self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            return -score, line
+        finally:
+            self.board.unmake_sequence(records)
+
+    def _order_moves(
+            self, moves: list[MoveSequence], ply: int, table_move: Optional[MoveSequence]
+    ) -> list[MoveSequence]:
+        """
+        Search the best move known from the transposition table first, then captures, killer and history moves.
+        """
+        return self.move_orderer.order(moves, ply, table_move, self.board.cell_manager.is_king_at)
+
+    def _score_to_table(self, score: int, ply: int) -> int:
+        """
+        Win and loss scores depend on the distance from the root,
+        they are stored relative to the position instead so they stay valid wherever it is reached again.
+        """
+        if score >= self.win_score // 2:
+            return score + ply
+        if score <= -self.win_score // 2:
+            return score - ply
+        return score
+
+    def _score_from_table(self, score: int, ply: int) -> int:
+        if score >= self.win_score // 2:
+            return score - ply
+        if score <= -self.win_score // 2:
+            return score + ply
+        return score
+
+    def _tablebase_score(self, entry: TablebaseEntry, ply: int) -> int:
+        """
+        Score of a tablebase result, a win or loss is scored like one found by the search at the ply it ends on.
+        """
+        if entry.outcome == Outcome.DRAW:
+            return 0
+        score = self.win_score - (ply + entry.distance)
+        return score if entry.outcome == Outcome.WIN else -score
+
+    def _evaluate_loss(self, ply: int) -> int:
+        """
+        Score of the player to move having no moves left, a loss.
+        Losses further away score higher, so the search prefers quick wins and slow losses.
+        """
+        game = self.board.game
+        player = game.current_player.name
+        opponent_score = self.heuristic(
+            game.material[get_opponent_name(player)], game.material[player],
+            is_win=True, win_score=self.win_score
+        )
+        return ply - opponent_score
+
+    def _count_node(self) -> None:
+        self.nodes += 1
+        if self._node_limit is not None and self.nodes > self._node_limit:
+            raise SearchTimeout()
+        if self.nodes % TIME_CHECK_INTERVAL == 0:
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchTimeout()
+            if self._stop_event is not None and self._stop_event.is_set():
+                raise SearchTimeout()
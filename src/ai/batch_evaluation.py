@@ -0,0 +1,72 @@
+from typing import Iterable, Optional
+
+import numpy as np
+
+from board import Board
+from component.game import P
+from managers.position_encoding_util import MAN_CODE, KING_CODE
+
+# Perspective of an encoded position, the score is for the player to move
+P1_SIGN = 1
+P2_SIGN = -1
+
+
+def encode_positions(boards: Iterable[Board]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encode the positions of the boards into an (N, squares) int8 array and the players to move into an (N,) array of signs.
+    """
+    positions, players = [], []
+    for board in boards:
+        positions.append(board.encode_position())
+        players.append(P1_SIGN if board.game.current_player == P.P1 else P2_SIGN)
+    return np.array(positions, dtype=np.int8), np.array(players, dtype=np.int8)
+
+
+def evaluate_batch(
+        positions: np.ndarray,
+        players: Optional[np.ndarray] = None,
+        piece_score: int = 10,
+        king_modifier: int = 2,
+        man_table: Optional[np.ndarray] = None,
+        king_table: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Score many encoded positions at once, the vectorized counterpart of eval_player_state.
+
+    Args:
+        positions: (N, squares) array of positions encoded by Board.encode_position.
+        players: (N,) array of P1_SIGN or P2_SIGN, the player each score is for. Scores are for p1 without it.
+        piece_score: The score of a man.
+        king_modifier: Score multiplier applied to the kings.
+        man_table: Optional piece-square table of the men as seen by p1, one bonus per square.
+            The table of p2 is the same one rotated with the board.
+        king_table: Optional piece-square table of the kings, used like man_table.
+    Returns:
+        np.ndarray: (N,) array of int32 scores.
+    """
+    positions = np.asarray(positions, dtype=np.int8)
+
+    # material by lookup of every code, indexed from the most negative one
+    piece_values = np.array([
+        -piece_score * king_modifier, -piece_score, 0, piece_score, piece_score * king_modifier
+    ], dtype=np.int32)
+    scores = piece_values[positions.astype(np.intp) + KING_CODE].sum(axis=1, dtype=np.int32)
+
+    for code, table in ((MAN_CODE, man_table), (KING_CODE, king_table)):
+        if table is None:
+            continue
+        table = np.asarray(table, dtype=np.int32)
+        scores += (positions == code).astype(np.int32) @ table
+        scores -= (positions == -code).astype(np.int32) @ table[::-1]
+
+    if players is not None:
+        scores *= np.asarray(players, dtype=np.int32)
+    return scores
+
+
+def evaluate_boards(boards: Iterable[Board], **kwargs) -> np.ndarray:
+    """
+    Encode and score the boards, each for its player to move.
+    """
+    positions, players = encode_positions(boards)
+    return evaluate_batch(positions, players, **kwargs)
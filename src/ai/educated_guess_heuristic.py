@@ -1,4 +1,5 @@
 from component.cell import Cell
+from state.material_count import MaterialCount
 
 
 def eval_player_state(
@@ -17,6 +18,26 @@ def eval_player_state(
     return player_score - opponent_score
 
 
+def eval_material_state(
+        player_material: MaterialCount,
+        opponent_material: MaterialCount,
+        piece_score: int = 10,
+        king_modifier: int = 2,
+        is_win: bool = False,
+        win_score: int = 100
+) -> int:
+    """
+    Same score as eval_player_state, read from the piece counts the board keeps instead of scanning the cells.
+    """
+    player_score = _generate_piece_score(player_material.men, piece_score, player_material.kings, king_modifier)
+    opponent_score = _generate_piece_score(opponent_material.men, piece_score, opponent_material.kings, king_modifier)
+
+    if is_win:
+        return win_score + player_score - opponent_score
+
+    return player_score - opponent_score
+
+
 def _get_scores(player_cells: list[Cell], opponent_cells: list[Cell], piece_score: int,
                 king_modifier: int) -> tuple[int, int]:
     player_score = _eval_player_pieces_score(player_cells, piece_score, king_modifier)
@@ -0,0 +1,283 @@
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from itertools import combinations, product
+from pathlib import Path
+from typing import Iterator, Optional
+
+from board import Board
+from component.game import P
+from managers.board_geometry import get_board_geometry
+from managers.hash_manager import ZOBRIST_SEED
+from state.move_sequence import MoveSequence
+from state.position_snapshot import PositionSnapshot
+
+# Largest tables worth building in Python, four pieces already take several minutes
+DEFAULT_MAX_PIECES = 3
+
+# File layout: header, then the sorted keys, the outcomes and the distances of every position
+TABLEBASE_MAGIC = b"CKTB"
+TABLEBASE_VERSION = 1
+# magic, version, rows, columns, max pieces, hash seed, number of positions
+HEADER_FORMAT = struct.Struct("<4sHBBBIQ")
+
+# (owner, is king) of the piece kinds placed when enumerating positions
+PIECE_KINDS = ((P.P1.name, False), (P.P1.name, True), (P.P2.name, False), (P.P2.name, True))
+
+
+class Outcome(IntEnum):
+    """
+    Result of a position with perfect play, for the player to move.
+    """
+    DRAW = 0
+    WIN = 1
+    LOSS = 2
+
+
+@dataclass(frozen=True)
+class TablebaseEntry:
+    outcome: Outcome
+    # turns until the game ends with perfect play, the winner ends it as fast as possible and the loser delays it
+    distance: int = 0
+
+
+class TablebaseError(Exception):
+    """
+    Raised when a tablebase file cannot be read or was made for another board or hash.
+    """
+
+
+class EndgameTablebase:
+    """
+    Perfect play results of every position with up to max_pieces pieces, looked up by the Zobrist key of the position.
+
+    The keys are kept sorted in a compact array and searched by bisection,
+    the outcome and distance of a position are stored at the index of its key.
+    Positions in the middle of a chain capture are not part of the table.
+    """
+
+    def __init__(
+            self, keys: array, outcomes: bytes, distances: array,
+            max_pieces: int, rows: int = 8, columns: int = 8
+    ):
+        self.keys = keys
+        self.outcomes = outcomes
+        self.distances = distances
+        self.max_pieces = max_pieces
+        self.rows = rows
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, key: int) -> Optional[TablebaseEntry]:
+        index = bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            return None
+        return TablebaseEntry(Outcome(self.outcomes[index]), self.distances[index])
+
+    def covers(self, board: Board) -> bool:
+        """
+        Whether the position of the board is small enough to be in the table.
+        """
+        game = board.game
+        return (
+                not game.is_chained_move
+                and sum(count.pieces for count in game.material.values()) <= self.max_pieces
+        )
+
+    def probe(self, board: Board) -> Optional[TablebaseEntry]:
+        """
+        Get the result of the position on the board, None when it is not covered by the table.
+
+        Expects the hash key and piece counts of the board to be up to date.
+        """
+        if not self.covers(board):
+            return None
+        return self.lookup(board.game.hash_key)
+
+    def best_move(self, board: Board) -> Optional[tuple[MoveSequence, TablebaseEntry]]:
+        """
+        Get the move keeping the best result of the position and the result it leads to, for the player to move.
+
+        A won position is won in the fewest turns, a lost one is lost in the most turns.
+        """
+        if self.probe(board) is None:
+            return None
+
+        best = None
+        for move in board.get_move_sequences():
+            records = board.make_sequence(move)
+            try:
+                reply = self.probe(board) or _terminal_entry(board)
+            finally:
+                board.unmake_sequence(records)
+            entry = _previous_entry(reply)
+            if best is None or _entry_rank(entry) > _entry_rank(best[1]):
+                best = move, entry
+        return best
+
+    def to_bytes(self) -> bytes:
+        header = HEADER_FORMAT.pack(
+            TABLEBASE_MAGIC, TABLEBASE_VERSION, self.rows, self.columns, self.max_pieces, ZOBRIST_SEED, len(self)
+        )
+        return header + self.keys.tobytes() + bytes(self.outcomes) + self.distances.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EndgameTablebase":
+        if len(data) < HEADER_FORMAT.size:
+            raise TablebaseError("Tablebase is too short to hold a header.")
+        magic, version, rows, columns, max_pieces, seed, count = HEADER_FORMAT.unpack_from(data)
+        if magic != TABLEBASE_MAGIC or version != TABLEBASE_VERSION:
+            raise TablebaseError("Not an endgame tablebase of this version.")
+        if seed != ZOBRIST_SEED:
+            raise TablebaseError(f"Tablebase keys were made with hash seed {seed}, expected {ZOBRIST_SEED}.")
+
+        keys, distances = array("Q"), array("H")
+        keys_end = HEADER_FORMAT.size + count * keys.itemsize
+        outcomes_end = keys_end + count
+        if len(data) != outcomes_end + count * distances.itemsize:
+            raise TablebaseError("Tablebase size does not match its number of positions.")
+        keys.frombytes(data[HEADER_FORMAT.size:keys_end])
+        distances.frombytes(data[outcomes_end:])
+        return cls(keys, data[keys_end:outcomes_end], distances, max_pieces, rows, columns)
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "EndgameTablebase":
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+def _terminal_entry(board: Board) -> TablebaseEntry:
+    """
+    Result of a position outside the table reached by a move, only positions where the player to move has lost are.
+    """
+    if board.game.material[board.game.current_player.name].pieces == 0 or not board.get_move_sequences():
+        return TablebaseEntry(Outcome.LOSS, 0)
+    raise TablebaseError("Move leads to a position missing from the tablebase.")
+
+
+def _previous_entry(entry: TablebaseEntry) -> TablebaseEntry:
+    """
+    Result for the player who made the move leading to a position of the given result.
+    """
+    if entry.outcome == Outcome.LOSS:
+        return TablebaseEntry(Outcome.WIN, entry.distance + 1)
+    if entry.outcome == Outcome.WIN:
+        return TablebaseEntry(Outcome.LOSS, entry.distance + 1)
+    return entry
+
+
+def _entry_rank(entry: TablebaseEntry) -> int:
+    if entry.outcome == Outcome.WIN:
+        return 1_000_000 - entry.distance
+    if entry.outcome == Outcome.LOSS:
+        return -1_000_000 + entry.distance
+    return 0
+
+
+def enumerate_positions(max_pieces: int, rows: int = 8, columns: int = 8) -> Iterator[PositionSnapshot]:
+    """
+    Yield every position with 2 to max_pieces pieces where both players have a piece,
+    with either player to move. Men are never placed on the row where they would have been crowned.
+    """
+    geometry = get_board_geometry(rows, columns)
+    last_rows = {P.P1.name: rows, P.P2.name: 1}
+    for count in range(2, max_pieces + 1):
+        for squares in combinations(range(len(geometry.names)), count):
+            for kinds in product(PIECE_KINDS, repeat=count):
+                owners = {owner for owner, _ in kinds}
+                if len(owners) < 2:
+                    continue
+                if any(
+                        not is_king and geometry.coordinates[square][0] == last_rows[owner]
+                        for square, (owner, is_king) in zip(squares, kinds)
+                ):
+                    continue
+                pieces = tuple(
+                    (geometry.names[square], owner, is_king)
+                    for square, (owner, is_king) in zip(squares, kinds)
+                )
+                for player in (P.P1.name, P.P2.name):
+                    yield PositionSnapshot(rows, columns, pieces, player, use_bitboard=True)
+
+
+def generate_tablebase(max_pieces: int = DEFAULT_MAX_PIECES, rows: int = 8, columns: int = 8) -> EndgameTablebase:
+    """
+    Solve every position with up to max_pieces pieces by retrograde analysis.
+
+    The moves of every position are generated once to link each position to the positions leading to it.
+    Results then spread backwards from the lost positions, turn by turn:
+    a position with a move into a lost position is won, a position whose every move leads into a won position is lost.
+    Positions never reached this way can be played forever without losing and are draws.
+    """
+    board = Board(rows, columns, use_bitboard=True)
+    keys: list[int] = []
+    index_of: dict[int, int] = {}
+    successors: list[list[int]] = []
+    # moves leading out of the table are captures of the last piece, which the mover wins at once
+    wins_at_once: list[bool] = []
+
+    for snapshot in enumerate_positions(max_pieces, rows, columns):
+        board.load_position_snapshot(snapshot)
+        index_of[board.game.hash_key] = len(keys)
+        keys.append(board.game.hash_key)
+        children, is_won = [], False
+        for move in board.get_move_sequences():
+            records = board.make_sequence(move)
+            if board.game.material[board.game.current_player.name].pieces == 0:
+                is_won = True
+            else:
+                children.append(board.game.hash_key)
+            board.unmake_sequence(records)
+        successors.append(children)
+        wins_at_once.append(is_won)
+
+    predecessors: list[list[int]] = [[] for _ in keys]
+    for index, children in enumerate(successors):
+        for child in children:
+            predecessors[index_of[child]].append(index)
+
+    outcomes = bytearray(len(keys))
+    distances = array("H", bytes(2 * len(keys)))
+    remaining = [len(children) for children in successors]
+    queue = deque()
+
+    def resolve(index: int, outcome: Outcome, distance: int) -> None:
+        outcomes[index] = outcome
+        distances[index] = distance
+        queue.append(index)
+
+    for index, children in enumerate(successors):
+        if not children and not wins_at_once[index]:
+            resolve(index, Outcome.LOSS, 0)
+    for index, is_won in enumerate(wins_at_once):
+        if is_won:
+            resolve(index, Outcome.WIN, 1)
+
+    # the queue holds resolved positions in order of distance, so every result is the shortest win or longest loss
+    while queue:
+        index = queue.popleft()
+        outcome, distance = outcomes[index], distances[index]
+        for parent in predecessors[index]:
+            if outcomes[parent] != Outcome.DRAW:
+                continue
+            if outcome == Outcome.LOSS:
+                resolve(parent, Outcome.WIN, distance + 1)
+            else:
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    resolve(parent, Outcome.LOSS, distance + 1)
+
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return EndgameTablebase(
+        array("Q", (keys[index] for index in order)),
+        bytes(outcomes[index] for index in order),
+        array("H", (distances[index] for index in order)),
+        max_pieces, rows, columns
+    )
@@ -0,0 +1,330 @@
+import mmap
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from board import Board
+from component.game import P
+from managers.board_geometry import BoardGeometry, get_board_geometry
+from managers.position_encoding_util import EMPTY_CODE, KING_CODE, encode_piece_util
+from state.move_sequence import MoveSequence
+from state.position_snapshot import PositionSnapshot
+
+# File layout: header, the games one after the other, then an index entry per game
+STORE_MAGIC = b"CKGS"
+STORE_VERSION = 1
+# magic, version, rows, columns, number of games, number of positions, offset of the index
+HEADER_FORMAT = struct.Struct("<4sHBBQQQ")
+# offset of the game, id of its first position
+INDEX_FORMAT = struct.Struct("<QQ")
+# result, flags, number of moves
+GAME_FORMAT = struct.Struct("<BBI")
+
+# Results of a stored game
+UNFINISHED = 0
+P1_WINS = 1
+P2_WINS = 2
+DRAW = 3
+RESULT_CODES = {P.P1.name: P1_WINS, P.P2.name: P2_WINS, None: DRAW}
+WINNERS = {code: winner for winner, code in RESULT_CODES.items()}
+
+# Game flag: a position follows the game header, the game does not start from the initial setup
+HAS_START_POSITION = 1
+# A move is its landing count with these flags, its source square id, then the square ids it lands on
+CAPTURE_FLAG = 0x40
+PROMOTES_FLAG = 0x80
+LANDINGS_MASK = 0x3F
+
+
+class GameStoreError(Exception):
+    """
+    Raised when a game store file cannot be read or a game does not fit its format.
+    """
+
+
+@dataclass(frozen=True)
+class StoredGame:
+    """
+    A game of a store: its moves, who won and the position it started from, None for the initial setup.
+    """
+    moves: tuple[MoveSequence, ...]
+    # the player who won, None for a draw or a game that is not over
+    winner: Optional[str] = None
+    is_over: bool = True
+    start: Optional[PositionSnapshot] = None
+
+
+@lru_cache(maxsize=None)
+def _jumped_squares(rows: int, columns: int) -> dict[tuple[int, int], int]:
+    """
+    (source id, landing id) -> id of the square a capture between them jumps over.
+    """
+    geometry = get_board_geometry(rows, columns)
+    return {
+        (square, landing): geometry.neighbours[square][direction]
+        for square, landings in enumerate(geometry.landings)
+        for direction, landing in enumerate(landings)
+        if landing is not None
+    }
+
+
+def encode_move(move: MoveSequence, geometry: BoardGeometry) -> bytes:
+    ids = geometry.square_ids
+    flags = len(move.landing_names)
+    if flags > LANDINGS_MASK:
+        raise GameStoreError(f"Move {move} lands on more squares than a store can hold.")
+    if move.is_capture:
+        flags |= CAPTURE_FLAG
+    if move.promotes:
+        flags |= PROMOTES_FLAG
+    return bytes((flags, ids[move.src_name], *(ids[name] for name in move.landing_names)))
+
+
+def decode_move(code: bytes, geometry: BoardGeometry) -> MoveSequence:
+    """
+    Rebuild a move from its code, the captured squares are the ones its hops jump over.
+    """
+    names = geometry.names
+    path = code[1:]
+    captured = ()
+    if code[0] & CAPTURE_FLAG:
+        jumped = _jumped_squares(geometry.rows, geometry.columns)
+        captured = tuple(names[jumped[hop]] for hop in zip(path, path[1:]))
+    landings = tuple(names[square] for square in path[1:])
+    return MoveSequence(names[path[0]], landings, captured, bool(code[0] & PROMOTES_FLAG))
+
+
+def _encode_position(snapshot: PositionSnapshot, geometry: BoardGeometry) -> bytes:
+    codes = array("b", bytes(len(geometry.names)))
+    for name, owner, is_king in snapshot.pieces:
+        codes[geometry.square_ids[name]] = encode_piece_util(owner, is_king)
+    return bytes((0 if snapshot.current_player == P.P1.name else 1,)) + codes.tobytes()
+
+
+def _decode_position(data: bytes, geometry: BoardGeometry) -> PositionSnapshot:
+    codes = array("b", data[1:])
+    pieces = tuple(
+        (name, P.P1.name if code > 0 else P.P2.name, abs(code) == KING_CODE)
+        for name, code in zip(geometry.names, codes)
+        if code != EMPTY_CODE
+    )
+    return PositionSnapshot(geometry.rows, geometry.columns, pieces, P.P2.name if data[0] else P.P1.name)
+
+
+class GameStoreWriter:
+    """
+    Writes games to a store file one at a time, only the index of the games written so far is kept in memory.
+
+    The header and the index are written on close, so use it as a context manager or call close.
+    """
+
+    def __init__(self, path: str | Path, rows: int = 8, columns: int = 8):
+        self.geometry = get_board_geometry(rows, columns)
+        self.file: BinaryIO = open(path, "wb")
+        self.file.write(bytes(HEADER_FORMAT.size))
+        # offset and first position id of every game written, flat so a large store keeps a small index
+        self.index = array("Q")
+        self.positions = 0
+
+    def __enter__(self) -> "GameStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index) // 2
+
+    def add(
+            self, moves: Iterable[MoveSequence], winner: Optional[str] = None, is_over: bool = True,
+            start: Optional[PositionSnapshot] = None
+    ) -> int:
+        """
+        Write a game played from the start position, the initial setup when None, and return its id.
+        """
+        geometry = self.geometry
+        moves = list(moves)
+        codes = b"".join(encode_move(move, geometry) for move in moves)
+        count = len(moves)
+        result = RESULT_CODES[winner] if is_over else UNFINISHED
+        flags = HAS_START_POSITION if start is not None else 0
+        position = _encode_position(start, geometry) if start is not None else b""
+
+        self.index.extend((self.file.tell(), self.positions))
+        self.file.write(GAME_FORMAT.pack(result, flags, count) + position + codes)
+        # every position before a move and the one after the last move
+        self.positions += count + 1
+        return len(self) - 1
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        if sys.byteorder == "big":
+            self.index.byteswap()
+        self.file.write(self.index.tobytes())
+        self.file.seek(0)
+        self.file.write(HEADER_FORMAT.pack(
+            STORE_MAGIC, STORE_VERSION, self.geometry.rows, self.geometry.columns, len(self), self.positions,
+            index_offset
+        ))
+        self.file.close()
+
+
+def _iter_move_codes(data: bytes | mmap.mmap, offset: int, count: int) -> Iterator[bytes]:
+    for _ in range(count):
+        size = 2 + (data[offset] & LANDINGS_MASK)
+        yield data[offset:offset + size]
+        offset += size
+
+
+class GameStore:
+    """
+    Games of a store file read through a memory map, fetched by id without reading the games before them.
+
+    A game is found through the fixed size entry of the index, a position through the ids of the first positions
+    of the games, so only the game holding it is decoded. Positions are numbered over all games,
+    each game has one before every move and one after its last move.
+
+    Use it as a context manager or call close, so the file is unmapped.
+    """
+
+    def __init__(self, path: str | Path):
+        self._file = open(path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise GameStoreError("Game store is too short to hold a header.")
+        try:
+            self._read_header()
+        except GameStoreError:
+            self.close()
+            raise
+        self._board = None
+        # self-play repeats the same moves over and over, so each code is decoded once and its frozen move shared
+        self._moves: dict[bytes, MoveSequence] = {}
+
+    def _read_header(self) -> None:
+        data = self._data
+        if len(data) < HEADER_FORMAT.size:
+            raise GameStoreError("Game store is too short to hold a header.")
+        magic, version, rows, columns, games, positions, index_offset = HEADER_FORMAT.unpack_from(data)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            raise GameStoreError("Not a game store of this version.")
+        if len(data) != index_offset + games * INDEX_FORMAT.size:
+            raise GameStoreError("Game store size does not match its number of games.")
+        self.geometry = get_board_geometry(rows, columns)
+        self.games = games
+        self.positions = positions
+        self._index_offset = index_offset
+
+    def __enter__(self) -> "GameStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.games
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._data.close()
+            self._file.close()
+
+    def _index_entry(self, game_id: int) -> tuple[int, int]:
+        if not 0 <= game_id < self.games:
+            raise IndexError(f"Game {game_id} is not in the store of {self.games} games.")
+        return INDEX_FORMAT.unpack_from(self._data, self._index_offset + game_id * INDEX_FORMAT.size)
+
+    def game(self, game_id: int) -> StoredGame:
+        offset, _ = self._index_entry(game_id)
+        return self._read_game(offset)
+
+    def _read_game(self, offset: int, move_count: Optional[int] = None) -> StoredGame:
+        data, geometry = self._data, self.geometry
+        result, flags, count = GAME_FORMAT.unpack_from(data, offset)
+        offset += GAME_FORMAT.size
+        start = None
+        if flags & HAS_START_POSITION:
+            size = 1 + len(geometry.names)
+            start = _decode_position(data[offset:offset + size], geometry)
+            offset += size
+        count = count if move_count is None else min(count, move_count)
+        known = self._moves
+        moves = []
+        for code in _iter_move_codes(data, offset, count):
+            move = known.get(code)
+            if move is None:
+                move = known[code] = decode_move(code, geometry)
+            moves.append(move)
+        return StoredGame(tuple(moves), WINNERS.get(result), result != UNFINISHED, start)
+
+    def __iter__(self) -> Iterator[StoredGame]:
+        for game_id in range(self.games):
+            yield self.game(game_id)
+
+    def locate_position(self, position_id: int) -> tuple[int, int]:
+        """
+        Find the game of a position and the number of moves played in it before the position.
+        """
+        if not 0 <= position_id < self.positions:
+            raise IndexError(f"Position {position_id} is not in the store of {self.positions} positions.")
+        low, high = 0, self.games - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._index_entry(middle)[1] <= position_id:
+                low = middle
+            else:
+                high = middle - 1
+        return low, position_id - self._index_entry(low)[1]
+
+    def position(self, position_id: int) -> PositionSnapshot:
+        """
+        Get a position by id, played from the start of its game.
+        """
+        game_id, ply = self.locate_position(position_id)
+        offset, _ = self._index_entry(game_id)
+        board = self._replay_board(self._read_game(offset, ply))
+        return board.get_position_snapshot()
+
+    def game_positions(self, game_id: int) -> Iterator[tuple[PositionSnapshot, Optional[MoveSequence]]]:
+        """
+        Yield every position of a game with the move played from it, None after the last move.
+
+        The game is played once, so scanning all positions of a game this way is faster than one by one.
+        """
+        game = self.game(game_id)
+        # a board of its own, so reading other positions while iterating does not move it
+        board = self._replay_board(game, 0, Board(self.geometry.rows, self.geometry.columns, use_bitboard=True))
+        for move in game.moves:
+            yield board.get_position_snapshot(), move
+            board.make_sequence(move)
+        yield board.get_position_snapshot(), None
+
+    def _replay_board(self, game: StoredGame, moves: Optional[int] = None, board: Optional[Board] = None) -> Board:
+        """
+        Set the board, the one kept by the store by default, to the start of the game and play the given number
+        of its moves, all by default.
+        """
+        rows, columns = self.geometry.rows, self.geometry.columns
+        if board is None:
+            if self._board is None:
+                self._board = Board(rows, columns, use_bitboard=True)
+            board = self._board
+        board.load_position_snapshot(game.start if game.start is not None else _initial_position(rows, columns))
+        for move in game.moves[:moves]:
+            board.make_sequence(move)
+        return board
+
+
+@lru_cache(maxsize=None)
+def _initial_position(rows: int, columns: int) -> PositionSnapshot:
+    board = Board(rows, columns, use_bitboard=True)
+    board.initial_setup()
+    return board.get_position_snapshot()
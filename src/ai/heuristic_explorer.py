@@ -1,17 +1,33 @@
 from copy import deepcopy
 
 from ai.ai_context_manager import AIContextManager
+from ai.alpha_beta_search import AlphaBetaSearch, SearchResult
+from ai.endgame_tablebase import EndgameTablebase
+from ai.transposition_table import TranspositionTable
 from ai.node_generator import NodeGenerator, Node
+from ai.opening_book import OpeningBook
 from board import Board
 from component.cell import Cell
 from component.game import Game
+from state.move_record import MoveRecord
+from state.move_sequence import MoveSequence
 from state.move_state import MoveState
 
 
 class HeuristicExplorer:
-    def __init__(self, board: Board):
+    def __init__(
+            self, board: Board, opening_book: OpeningBook | None = None, tablebase: EndgameTablebase | None = None
+    ):
         self.board = board
+        # consulted before every search, the search takes over once the game leaves the book
+        self.opening_book = opening_book
+        # probed by the search, once few pieces are left it plays perfectly
+        self.tablebase = tablebase
         self.node_gen = NodeGenerator()
+        # moves currently applied on the AI state, undone in reverse order before exploring a sibling
+        self.applied_moves: list[MoveRecord] = []
+        # kept between searches, positions searched for an earlier move are often reached again
+        self.transposition_table = TranspositionTable()
         # todo
         with AIContextManager(board) as ai_context:
             self.ai_cell_manager = ai_context.cell_manager
@@ -28,13 +44,41 @@ class HeuristicExplorer:
                 # todo, test?
                 if ai_context.game.is_game_over:
                     return
-            self._recursive_setup(copy_game, copy_map)
+            # the state is copied once at the root, deeper levels make and unmake moves in place
+            if depth_counter == 0:
+                self._recursive_setup(copy_game, copy_map)
             self._execute_recursive_exploration(depth_counter, max_depth)
 
+    def find_best_move(
+            self, max_depth: int, time_limit: float | None = None, node_limit: int | None = None
+    ) -> SearchResult:
+        """
+        Search a copy of the main game with alpha-beta pruning and return the best move for the current player.
+
+        The main game is copied once into the AI state, the search makes and unmakes moves on that copy.
+        Iterative deepening goes up to max_depth, the time and node budgets may stop it earlier.
+        A position found in the opening book is answered with a book move without searching.
+        """
+        self._setup_ai_base_level_copy_state()
+        with AIContextManager(self.board) as ai_context:
+            book_move = self._choose_book_move(ai_context)
+            if book_move is not None:
+                return SearchResult(book_move, 0, [book_move], is_book_move=True)
+            return AlphaBetaSearch(
+                ai_context, transposition_table=self.transposition_table, tablebase=self.tablebase
+            ).iterative_deepening(max_depth, time_limit, node_limit)
+
+    def _choose_book_move(self, board: Board) -> MoveSequence | None:
+        if self.opening_book is None:
+            return None
+        board.refresh_hash_key()
+        return self.opening_book.choose_move(board)
+
     def _execute_ai_base_case(self) -> None:
         self._setup_ai_base_level_copy_state()
-        pairs, states = self._get_move_pairs_and_states_to_execute()
-        self._execute_ai_moves_on_copied_states(pairs, states)
+        for src, tar in self._generate_move_pairs(self._get_available_player_moves()):
+            self._undo_ai_moves_to(0)
+            self.applied_moves.append(self._execute_ai_move(src, tar))
 
     def _recursive_setup(
             self, copy_game: Game, copy_map: dict[str, Cell]
@@ -49,26 +93,35 @@ class HeuristicExplorer:
     def _execute_recursive_exploration(
             self, depth_counter: int, max_depth: int) -> None:
         """
-        Execute the exploration on state copies.
+        Execute the exploration in place on the AI state.
+
+        Before each sibling move the moves applied by the previous one are undone,
+        the last explored line is left on the AI state.
         """
-        pairs, states = self._get_move_pairs_and_states_to_execute()
-        # todo consider changing to pair state and deconstruct in calling function
-        for (src, tar), (game, cell_map) in zip(pairs, states, strict=True):
-            self._explore_move((src, tar), (game, cell_map), depth_counter, max_depth)
+        pairs = self._generate_move_pairs(self._get_available_player_moves())
+        applied = len(self.applied_moves)
+        for src, tar in pairs:
+            self._undo_ai_moves_to(applied)
+            self._explore_move((src, tar), depth_counter, max_depth)
 
     def _explore_move(
-            self, pair: tuple[str, str], state: tuple[Game, dict[str, Cell]], depth_counter: int, max_depth: int
+            self, pair: tuple[str, str], depth_counter: int, max_depth: int
     ) -> None:
         """
-        Explore given move, sending modified game for further exploration.
+        Explore given move, continuing the exploration on the modified AI state.
         """
         src, tar = pair
-        game, cell_map = state
-        # set AI state for each move to execute one
-        self._setup_board_copy_state(game, cell_map)
-        self._execute_ai_move(src, tar)
+        self.applied_moves.append(self._execute_ai_move(src, tar))
         # recursive call
-        self.ai_execute_available_moves(depth_counter + 1, max_depth, game, cell_map)
+        self.ai_execute_available_moves(depth_counter + 1, max_depth)
+
+    def _undo_ai_moves_to(self, number_of_moves: int) -> None:
+        """
+        Unmake applied moves until only the given number of moves remain applied.
+        """
+        with AIContextManager(self.board) as ai_context:
+            while len(self.applied_moves) > number_of_moves:
+                ai_context.unmake_move(self.applied_moves.pop())
 
     def _setup_ai_base_level_copy_state(self) -> None:
         """
@@ -78,31 +131,6 @@ class HeuristicExplorer:
         map_copy = self.board.cell_manager.get_cell_map_copy()
         self._setup_board_copy_state(game_copy, map_copy)
 
-    # todo, possibly remove.
-    def _execute_ai_moves_on_copied_states(
-            self, pairs: list[tuple[str, str]],
-            states: list[tuple[Game, dict[str, Cell]]]
-    ) -> None:
-        for (src, tar), (game, cell_map) in zip(pairs, states):
-            self._setup_board_copy_state(game, cell_map)
-            self._execute_ai_move(src, tar)
-
-    def _get_move_pairs_and_states_to_execute(
-            self
-    ) -> tuple[list[tuple[str, str]], list[tuple[Game, dict[str, Cell]]]]:
-        """
-        Generate move pairs and their corresponding game states for AI exploration.
-
-        This generator yields one tuple at a time to reduce memory usage
-        and allow for efficient handling of large numbers of moves.
-        """
-        pairs = self._generate_move_pairs(
-            self._get_available_player_moves()
-        )
-        states = self._generate_state_copies(len(pairs))
-
-        return pairs, states
-
     def _get_available_player_moves(self) -> list[MoveState]:
         """
         Generate all moves available to current player.
@@ -120,13 +148,15 @@ class HeuristicExplorer:
         # todo can't seem to find a way to implicitly passing them through HS fields or other methods.
         # Notice: avoids mixing the reference to game and AI game
         self.board.set_ai_state_parameters(game, cell_map)
+        # records of moves applied on the previous state cannot be undone on the new one
+        self.applied_moves = []
 
-    def _execute_ai_move(self, src: str, tar: str) -> None:
+    def _execute_ai_move(self, src: str, tar: str) -> MoveRecord:
         """
         Execute the move using AI specific board functionality.
         """
         with AIContextManager(self.board) as ai_context:
-            ai_context.move_piece(src, tar)
+            return ai_context.make_move(src, tar)
 
     # todo ? move to move util?
     @staticmethod
@@ -162,6 +192,8 @@ class HeuristicExplorer:
         return copies
 
     def generate_root_node(self) -> Node:
+        # pieces may have been placed directly since the last move
+        self.board.refresh_material()
         map_copy, game_copy = self._get_cell_map_and_game_copies()
 
         return self.node_gen.generate_root_node(map_copy, game_copy)
@@ -1,6 +1,6 @@
 from itertools import chain
 
-from ai.educated_guess_heuristic import eval_player_state
+from ai.educated_guess_heuristic import eval_material_state
 from component.cell import Cell
 from managers.cell_manager import CellManager
 from state.move_state import MoveState
@@ -8,12 +8,16 @@ from state.move_state import MoveState
 
 def calculate_copy_state_score(
         map_copy: dict[str, Cell], player_name: str, opponent_name: str,
-        heuristic=eval_player_state
+        heuristic=eval_material_state
 ) -> int:
-    player_cells = CellManager.get_player_cells_from_copy(map_copy, player_name)
-    opponent_cells = CellManager.get_player_cells_from_copy(map_copy, opponent_name)
+    """
+    Score a copy of the cell map for the player.
+
+    A bare map copy has no game keeping its piece counts, so its pieces are counted.
+    """
+    material = CellManager.count_material_from_copy(map_copy)
 
-    return heuristic(player_cells, opponent_cells)
+    return heuristic(material[player_name], material[opponent_name])
 
 
 def get_number_of_moves(
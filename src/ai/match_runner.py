@@ -0,0 +1,335 @@
+import os
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, Optional
+
+from ai.alpha_beta_search import AlphaBetaSearch, get_opponent_name
+from ai.educated_guess_heuristic import eval_material_state
+from ai.endgame_tablebase import EndgameTablebase
+from ai.monte_carlo_tree_search import MonteCarloTreeSearch
+from ai.opening_book import OpeningBook
+from ai.transposition_table import TranspositionTable
+from board import Board
+from component.game import P
+from managers.pdn_util import to_pdn_game, pdn_result
+from state.move_sequence import MoveSequence
+from state.pdn_game import PDNGame
+
+# Search algorithms a player of a match can use, random plays any legal move and serves as a baseline
+ALPHA_BETA_ENGINE = "alphabeta"
+MCTS_ENGINE = "mcts"
+RANDOM_ENGINE = "random"
+ENGINES = (ALPHA_BETA_ENGINE, MCTS_ENGINE, RANDOM_ENGINE)
+
+# Turns after which a game still going is called a draw, the draw rules normally end it long before
+MAX_GAME_TURNS = 400
+
+# Why a game ended
+NO_MOVES = "no moves"
+REPETITION = "repetition"
+NO_PROGRESS = "no progress"
+TURN_LIMIT = "turn limit"
+
+
+@dataclass(frozen=True)
+class EngineConfig:
+    """
+    A player of a match: the engine it plays with and its budget per move.
+
+    Configs are sent to the worker processes, so the heuristic has to be a module level function or a partial of one.
+    The opening book and the tablebase are given as file paths and loaded by every process that plays.
+    """
+    name: str = ALPHA_BETA_ENGINE
+    engine: str = ALPHA_BETA_ENGINE
+    # turns the alpha-beta engine looks ahead
+    depth: int = 4
+    # seconds per move, None to play by depth or iterations only
+    move_time: Optional[float] = None
+    node_limit: Optional[int] = None
+    # playouts of the Monte Carlo engine per move
+    iterations: Optional[int] = None
+    heuristic: Callable = eval_material_state
+    opening_book: Optional[str] = None
+    tablebase: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class GameTask:
+    """
+    One game of a match as handed to a worker.
+    """
+    index: int
+    p1: EngineConfig
+    p2: EngineConfig
+    seed: int
+    # random turns played before the engines take over, so games of deterministic engines differ
+    opening_turns: int = 0
+    max_turns: int = MAX_GAME_TURNS
+    # moves played from the initial setup before the random turns
+    opening: tuple[MoveSequence, ...] = ()
+
+
+@dataclass
+class GameRecord:
+    """
+    Outcome of a played game: who played which side, who won and why, every move and the time it took.
+    """
+    index: int
+    p1: str
+    p2: str
+    # the player who won, None for a draw
+    winner: Optional[str]
+    reason: str
+    moves: list[MoveSequence]
+    duration: float
+    # seconds each player spent choosing moves
+    think_time: dict[str, float]
+
+    @property
+    def turns(self) -> int:
+        return len(self.moves)
+
+    @property
+    def winner_name(self) -> Optional[str]:
+        """
+        Name of the engine that won, None for a draw.
+        """
+        if self.winner is None:
+            return None
+        return self.p1 if self.winner == P.P1.name else self.p2
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            P.P1.name: self.p1,
+            P.P2.name: self.p2,
+            "winner": self.winner,
+            "reason": self.reason,
+            "turns": self.turns,
+            "moves": [str(move) for move in self.moves],
+            "duration": round(self.duration, 4),
+            "think_time": {player: round(seconds, 4) for player, seconds in self.think_time.items()},
+        }
+
+    def to_pdn(self) -> PDNGame:
+        """
+        Record the game as PDN, the first player is black. A game stopped at the turn limit is a draw.
+        """
+        tags = {"Round": str(self.index + 1), "Black": self.p1, "White": self.p2, "Termination": self.reason}
+        return to_pdn_game(self.moves, pdn_result(self.winner), tags)
+
+
+@dataclass
+class MatchScore:
+    """
+    Wins, losses and draws of one engine over the games of a match.
+    """
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses + self.draws
+
+    @property
+    def points(self) -> float:
+        return self.wins + self.draws / 2
+
+    def add(self, record: GameRecord, name: str) -> None:
+        """
+        Count the result of a game for the engine of the name, games it did not play are skipped.
+        """
+        if name not in (record.p1, record.p2):
+            return
+        if record.winner_name is None:
+            self.draws += 1
+        elif record.winner_name == name:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    @classmethod
+    def from_records(cls, records: Iterable[GameRecord], name: str) -> "MatchScore":
+        score = cls()
+        for record in records:
+            score.add(record, name)
+        return score
+
+
+@lru_cache(maxsize=None)
+def _load_tablebase(path: str) -> EndgameTablebase:
+    # tables are large and never change, every process reads each one once
+    return EndgameTablebase.load(path)
+
+
+class EnginePlayer:
+    """
+    Chooses the moves of one side of a game with the engine of its config.
+
+    Searches the game board in place, which is left as it was found.
+    The transposition table or Monte Carlo tree is kept from move to move like in an interactive game.
+    """
+
+    def __init__(self, config: EngineConfig, board: Board, rng: random.Random):
+        self.config = config
+        self.board = board
+        self.rng = rng
+        self.opening_book = OpeningBook.load(config.opening_book, rng) if config.opening_book else None
+        tablebase = _load_tablebase(config.tablebase) if config.tablebase else None
+        if config.engine == ALPHA_BETA_ENGINE:
+            self.search = AlphaBetaSearch(
+                board, config.heuristic, transposition_table=TranspositionTable(), tablebase=tablebase
+            )
+        elif config.engine == MCTS_ENGINE:
+            self.search = MonteCarloTreeSearch(board, rng=rng)
+        elif config.engine == RANDOM_ENGINE:
+            self.search = None
+        else:
+            raise ValueError(f"Unknown engine {config.engine}, expected one of {', '.join(ENGINES)}.")
+
+    def choose_move(self, moves: list[MoveSequence]) -> MoveSequence:
+        if len(moves) == 1:
+            return moves[0]
+        if self.opening_book is not None:
+            book_move = self.opening_book.choose_move(self.board)
+            if book_move is not None:
+                return book_move
+
+        config = self.config
+        if config.engine == ALPHA_BETA_ENGINE:
+            return self.search.iterative_deepening(config.depth, config.move_time, config.node_limit).best_move
+        if config.engine == MCTS_ENGINE:
+            return self.search.search(config.iterations, config.move_time).best_move
+        return self.rng.choice(moves)
+
+
+def play_game(task: GameTask) -> GameRecord:
+    """
+    Worker task: play a game between the engines of the task from the initial setup, without any output.
+
+    The opening moves of the task and its random turns are played first, they count as moves of the game.
+    The game ends when the player to move has no moves left, by the draw rules or at the turn limit.
+    """
+    rng = random.Random(task.seed)
+    board = Board(use_bitboard=True)
+    board.initial_setup()
+    players = {
+        P.P1.name: EnginePlayer(task.p1, board, random.Random(rng.getrandbits(32))),
+        P.P2.name: EnginePlayer(task.p2, board, random.Random(rng.getrandbits(32))),
+    }
+    think_time = {P.P1.name: 0.0, P.P2.name: 0.0}
+    moves: list[MoveSequence] = []
+    winner, reason = None, TURN_LIMIT
+    for move in task.opening:
+        board.make_sequence(move)
+        moves.append(move)
+    random_turns_end = len(task.opening) + task.opening_turns
+
+    start = time.perf_counter()
+    while len(moves) < task.max_turns:
+        game = board.game
+        if game.is_repetition():
+            reason = REPETITION
+            break
+        if game.is_no_progress_draw():
+            reason = NO_PROGRESS
+            break
+        player = game.current_player.name
+        available = board.get_move_sequences()
+        if not available:
+            winner, reason = get_opponent_name(player), NO_MOVES
+            break
+
+        if len(moves) < random_turns_end:
+            move = rng.choice(available)
+        else:
+            thinking = time.perf_counter()
+            move = players[player].choose_move(available)
+            think_time[player] += time.perf_counter() - thinking
+        board.make_sequence(move)
+        moves.append(move)
+
+    return GameRecord(
+        task.index, task.p1.name, task.p2.name, winner, reason, moves, time.perf_counter() - start, think_time
+    )
+
+
+class MatchRunner:
+    """
+    Plays games between two engines without any output, every game a task of a pool of processes.
+
+    The engines swap sides from one game to the next, and both games of a pair start from the same opening,
+    so neither engine profits from the side or the opening it was given.
+    Pairs cycle through the given opening lines, the random turns are played after the line.
+
+    Use it as a context manager or call close, so the process pool is shut down.
+    With a single worker and no executor the games are played in this process.
+    """
+
+    def __init__(
+            self, first: EngineConfig, second: EngineConfig, workers: Optional[int] = None,
+            executor: Optional[Executor] = None, opening_turns: int = 0, max_turns: int = MAX_GAME_TURNS,
+            seed: Optional[int] = None, openings: Optional[list[tuple[MoveSequence, ...]]] = None
+    ):
+        self.first = first
+        self.second = second
+        self.workers = workers or os.cpu_count() or 1
+        self.opening_turns = opening_turns
+        self.max_turns = max_turns
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.openings = openings or [()]
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def __enter__(self) -> "MatchRunner":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def tasks(self, games: int) -> list[GameTask]:
+        tasks = []
+        for index in range(games):
+            p1, p2 = (self.first, self.second) if index % 2 == 0 else (self.second, self.first)
+            # both games of a pair share the seed and with it the opening
+            pair = index // 2
+            tasks.append(GameTask(
+                index, p1, p2, self.seed + pair, self.opening_turns, self.max_turns,
+                self.openings[pair % len(self.openings)]
+            ))
+        return tasks
+
+    def play(self, games: int) -> Iterator[GameRecord]:
+        """
+        Play the games and yield every record as soon as its game is over, in the order they finish.
+        """
+        tasks = self.tasks(games)
+        if self.workers == 1 and self._executor is None:
+            for task in tasks:
+                yield play_game(task)
+            return
+
+        futures = [self.executor.submit(play_game, task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def run(self, games: int) -> list[GameRecord]:
+        """
+        Play the games and return their records in the order of the games.
+        """
+        return sorted(self.play(games), key=lambda record: record.index)
@@ -0,0 +1,252 @@
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ai.alpha_beta_search import get_opponent_name
+from ai.educated_guess_heuristic import eval_material_state
+from ai.move_ordering import MoveOrderer
+from board import Board
+from state.move_sequence import MoveSequence
+
+# UCT exploration weight, sqrt(2) balances trying new moves and playing the best ones for results in [0, 1]
+EXPLORATION_CONSTANT = math.sqrt(2)
+# Turns a playout may last before it is judged by material, endgames of kings can otherwise shuffle forever
+PLAYOUT_TURN_LIMIT = 150
+# Iterations of a search without any budget
+DEFAULT_ITERATIONS = 1000
+# Iterations between two clock checks
+TIME_CHECK_INTERVAL = 16
+# Result of a playout for the player credited with it, a loss adds nothing
+WIN, DRAW = 1.0, 0.5
+
+
+@dataclass(eq=False)
+class MCTSNode:
+    """
+    Position of the search tree, reached by playing move from the parent position.
+
+    Wins are counted for the player who made the move, which is the player the parent chooses for.
+    """
+    key: int
+    # the player who made the move into this node, None at the root
+    player: Optional[str]
+    move: Optional[MoveSequence] = None
+    parent: Optional["MCTSNode"] = None
+    children: list["MCTSNode"] = field(default_factory=list)
+    untried_moves: Optional[list[MoveSequence]] = None
+    visits: int = 0
+    wins: float = 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.visits if self.visits else 0.0
+
+    def is_fully_expanded(self) -> bool:
+        return self.untried_moves is not None and not self.untried_moves
+
+    def uct_child(self, exploration: float) -> "MCTSNode":
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+        )
+
+    def most_visited_child(self) -> Optional["MCTSNode"]:
+        return max(self.children, key=lambda child: child.visits, default=None)
+
+
+@dataclass
+class MCTSResult:
+    """
+    Outcome of a Monte Carlo search: the most visited move, how often it was visited and how often it won.
+    """
+    best_move: Optional[MoveSequence]
+    visits: int = 0
+    win_rate: float = 0.0
+    principal_variation: list[MoveSequence] = field(default_factory=list)
+    iterations: int = 0
+    # playouts of the reused tree that were already done by earlier searches
+    reused_visits: int = 0
+
+
+class MonteCarloTreeSearch:
+    """
+    Monte Carlo tree search with UCT selection over the position of a Board.
+
+    Every iteration walks the tree down by the UCT rule, adds one new position,
+    plays it out with random moves and credits the result to the positions on the way.
+    Playouts pick among the captures and promotions that gain the most material, other moves are random.
+    The moves are made and unmade in place, so the board is left as it was found.
+
+    The tree is kept between searches, a later search of a position in it continues from what was played there.
+    """
+
+    def __init__(
+            self, board: Board, exploration: float = EXPLORATION_CONSTANT,
+            playout_turn_limit: int = PLAYOUT_TURN_LIMIT, rng: Optional[random.Random] = None
+    ):
+        self.board = board
+        self.exploration = exploration
+        self.playout_turn_limit = playout_turn_limit
+        self.rng = rng or random.Random()
+        self.root: Optional[MCTSNode] = None
+
+    def search(
+            self, iterations: Optional[int] = None, time_limit: Optional[float] = None,
+            stop_event: Optional[threading.Event] = None
+    ) -> MCTSResult:
+        """
+        Run iterations until the iteration or time budget runs out and return the most visited move.
+
+        Without any budget DEFAULT_ITERATIONS iterations are run.
+        Setting the optional stop event from another thread ends the search after the running iteration.
+        """
+        self.board.refresh_hash_key()
+        self.board.refresh_material()
+        root = self.find_root()
+        reused_visits = root.visits
+
+        if iterations is None and time_limit is None:
+            iterations = DEFAULT_ITERATIONS
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+        done = 0
+        while iterations is None or done < iterations:
+            if stop_event is not None and stop_event.is_set():
+                break
+            if deadline is not None and done % TIME_CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                break
+            self.run_iteration()
+            done += 1
+
+        return self._result(done, reused_visits)
+
+    def run_iteration(self) -> None:
+        """
+        One selection, expansion, playout and backpropagation from the root.
+        """
+        board = self.board
+        node = self.root
+        played = []
+        try:
+            # selection
+            while node.is_fully_expanded() and node.children:
+                node = node.uct_child(self.exploration)
+                played.append(board.make_sequence(node.move))
+
+            # expansion
+            untried = self._moves_of(node)
+            if untried:
+                move = untried.pop(self.rng.randrange(len(untried)))
+                player = board.game.current_player.name
+                played.append(board.make_sequence(move))
+                child = MCTSNode(board.game.hash_key, player, move, node)
+                node.children.append(child)
+                node = child
+
+            winner = self._playout()
+        finally:
+            for records in reversed(played):
+                board.unmake_sequence(records)
+
+        # backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += DRAW
+            elif winner == node.player:
+                node.wins += WIN
+            node = node.parent
+
+    def advance(self, move: MoveSequence) -> None:
+        """
+        Keep only the subtree of a played move, the rest of the tree can no longer be reached.
+        """
+        if self.root is None:
+            return
+        for child in self.root.children:
+            if child.move == move:
+                child.parent = None
+                self.root = child
+                return
+        self.root = None
+
+    def find_root(self) -> MCTSNode:
+        """
+        Reuse the node of the current position when it is the root or two turns below it, else start a new tree.
+
+        The search of the position continues from the returned node, so calling it first shows what the search reuses.
+        """
+        key = self.board.game.hash_key
+        root = self.root
+        if root is not None:
+            candidates = [root] + root.children + [grandchild for child in root.children for grandchild in child.children]
+            for node in candidates:
+                if node.key == key:
+                    node.parent = None
+                    self.root = node
+                    return node
+        self.root = MCTSNode(key, None)
+        return self.root
+
+    def _moves_of(self, node: MCTSNode) -> list[MoveSequence]:
+        """
+        Moves of the node not expanded yet, generated on its first visit while the board is at its position.
+        """
+        if node.untried_moves is None:
+            node.untried_moves = self.board.get_move_sequences()
+        return node.untried_moves
+
+    def _playout(self) -> Optional[str]:
+        """
+        Play random moves from the current position to the end of the game, then undo them.
+
+        Returns:
+            str: The winner, None for a draw by the rules. A playout that reaches the turn limit is won by the player with more material.
+        """
+        board = self.board
+        played = []
+        try:
+            for _ in range(self.playout_turn_limit):
+                if board.game.is_draw_by_rule():
+                    return None
+                moves = board.get_move_sequences()
+                if not moves:
+                    return get_opponent_name(board.game.current_player.name)
+                played.append(board.make_sequence(self._choose_playout_move(moves)))
+            return self._material_winner()
+        finally:
+            for records in reversed(played):
+                board.unmake_sequence(records)
+
+    def _choose_playout_move(self, moves: list[MoveSequence]) -> MoveSequence:
+        if moves[0].is_capture or any(move.promotes for move in moves):
+            is_king_at = self.board.cell_manager.is_king_at
+            gains = [MoveOrderer.material_gain(move, is_king_at) for move in moves]
+            best = max(gains)
+            moves = [move for move, gain in zip(moves, gains) if gain == best]
+        return moves[self.rng.randrange(len(moves))]
+
+    def _material_winner(self) -> Optional[str]:
+        material = self.board.game.material
+        player = self.board.game.current_player.name
+        opponent = get_opponent_name(player)
+        balance = eval_material_state(material[player], material[opponent])
+        if balance == 0:
+            return None
+        return player if balance > 0 else opponent
+
+    def _result(self, iterations: int, reused_visits: int) -> MCTSResult:
+        root = self.root
+        best = root.most_visited_child()
+        if best is None:
+            return MCTSResult(None, iterations=iterations, reused_visits=reused_visits)
+
+        line, node = [], best
+        while node is not None and node.visits > 0:
+            line.append(node.move)
+            node = node.most_visited_child()
+        return MCTSResult(best.move, best.visits, best.win_rate, line, iterations, reused_visits)
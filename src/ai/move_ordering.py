@@ -0,0 +1,102 @@
+from typing import Callable, Optional
+
+from state.move_sequence import MoveSequence
+
+# Material values used to rank captures, a king is worth two men as in the heuristic
+MAN_VALUE = 1
+KING_VALUE = 2
+PROMOTION_VALUE = 1
+# Killer moves kept per ply
+KILLER_SLOTS = 2
+
+# Sort keys of the move classes, each class is searched before the next one
+TABLE_MOVE_RANK = 3
+CAPTURE_RANK = 2
+KILLER_RANK = 1
+QUIET_RANK = 0
+
+
+class MoveOrderer:
+    """
+    Orders the moves of a position so the search finds its cutoffs early.
+
+    Moves are searched in the order: the best move stored in the transposition table, captures and promotions
+    by the material they gain, the killer moves of the ply and then the remaining moves by their history score.
+
+    Killer moves are quiet moves that caused a cutoff at the same ply in another part of the tree,
+    the history score of a move grows with every cutoff it causes, weighted by the depth left below it.
+    Both are kept between the iterations of one search and aged between searches.
+    """
+
+    def __init__(self, killer_slots: int = KILLER_SLOTS):
+        self.killer_slots = killer_slots
+        self.killers: list[list[MoveSequence]] = []
+        self.history: dict[tuple[str, str], int] = {}
+
+    def order(
+            self, moves: list[MoveSequence], ply: int, table_move: Optional[MoveSequence] = None,
+            is_king_at: Optional[Callable[[str], bool]] = None
+    ) -> list[MoveSequence]:
+        """
+        Return the moves sorted from the most to the least promising, the order of equal moves is kept.
+
+        Args:
+            moves: Moves of the position.
+            ply: Distance of the position from the root of the search.
+            table_move: Best move of the position stored in the transposition table, if any.
+            is_king_at: Tells whether the piece on a cell is a king, to value captured kings. Every piece counts as a man without it.
+        """
+        killers = self.killers[ply] if ply < len(self.killers) else []
+        history = self.history
+
+        def sort_key(move: MoveSequence) -> tuple[int, int]:
+            if move == table_move:
+                return TABLE_MOVE_RANK, 0
+            if move.is_capture or move.promotes:
+                return CAPTURE_RANK, self.material_gain(move, is_king_at)
+            if move in killers:
+                return KILLER_RANK, -killers.index(move)
+            return QUIET_RANK, history.get((move.src_name, move.dest_name), 0)
+
+        return sorted(moves, key=sort_key, reverse=True)
+
+    @staticmethod
+    def material_gain(move: MoveSequence, is_king_at: Optional[Callable[[str], bool]] = None) -> int:
+        """
+        Value of the pieces the move captures, plus the promotion when the piece is crowned.
+        """
+        gain = sum(
+            KING_VALUE if is_king_at is not None and is_king_at(name) else MAN_VALUE
+            for name in move.captured_names
+        )
+        return gain + PROMOTION_VALUE if move.promotes else gain
+
+    def record_cutoff(self, move: MoveSequence, ply: int, depth: int) -> None:
+        """
+        Remember a quiet move that caused a beta cutoff, captures are already searched early.
+        """
+        if move.is_capture:
+            return
+
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self.killer_slots:]
+
+        key = move.src_name, move.dest_name
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+    def new_search(self) -> None:
+        """
+        Drop the killer moves of the previous position and halve the history scores,
+        so moves that were good many turns ago lose their weight.
+        """
+        self.killers.clear()
+        self.history = {key: score // 2 for key, score in self.history.items() if score > 1}
+
+    def clear(self) -> None:
+        self.killers.clear()
+        self.history.clear()
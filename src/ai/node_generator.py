@@ -1,8 +1,9 @@
 from dataclasses import dataclass, field
 
-from ai.educated_guess_heuristic import eval_player_state
+from ai.educated_guess_heuristic import eval_material_state
 from component.cell import Cell
-from component.game import Game
+from component.game import Game, P
+from managers.cell_manager import CellManager
 from state.move_state import MoveState
 
 
@@ -14,6 +15,10 @@ class Node:
 
 
 class NodeGenerator:
+    def __init__(self, rows: int = 8, columns: int = 8):
+        # cell manager working on the cell map copy of the node
+        self.ai_cell_manager = CellManager(rows, columns)
+
     def generate_root_node(self, map_cp, game_cp) -> Node:
         self.set_ai_cell_map(map_cp)
 
@@ -23,18 +28,19 @@ class NodeGenerator:
     #   maybe pass cell_map each time?
     def _initialize_node(self, game_copy: Game) -> Node:
         player, opponent = self._get_player_and_opponent_names(game_copy)
-        player_cells, opponent_cells = self._get_all_game_cells(player, opponent)
         moves = self._get_moves(player, game_copy)
-        score = self._get_score(opponent_cells, player_cells)
+        score = self._get_score(player, opponent, game_copy)
 
         return Node(score, player, moves)
 
     @staticmethod
     def _get_score(
-            opponent_cells: list[Cell], player_cells: list[Cell]
+            player: str, opponent: str, game_copy: Game
     ) -> int:
-        return eval_player_state(
-            player_cells, opponent_cells
+        # the copy carries the piece counts kept up to date by every move
+        material = game_copy.material
+        return eval_material_state(
+            material[player], material[opponent]
         )
 
     def _get_moves(
@@ -52,13 +58,5 @@ class NodeGenerator:
             game_copy: Game
     ) -> tuple[str, str]:
         player = game_copy.current_player.name
-        opponent = P.P2.name if player else P.P1.name
+        opponent = P.P2.name if player == P.P1.name else P.P1.name
         return player, opponent
-
-    def _get_all_game_cells(
-            self, player: str, opponent: str
-    ) -> tuple[list[Cell], list[Cell]]:
-        player_cells = self.ai_cell_manager.get_player_cells(player)
-        opponent_cells = self.ai_cell_manager.get_player_cells(opponent)
-
-        return player_cells, opponent_cells
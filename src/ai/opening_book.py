@@ -0,0 +1,160 @@
+import random
+import struct
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ai.alpha_beta_search import AlphaBetaSearch
+from board import Board
+from managers.board_geometry import get_board_geometry
+from managers.hash_manager import ZOBRIST_SEED
+from state.move_sequence import MoveSequence
+
+# File layout: header, then one fixed size record per book move, sorted by position key
+BOOK_MAGIC = b"CKBK"
+BOOK_VERSION = 1
+# magic, version, rows, columns, hash seed, number of records
+HEADER_FORMAT = struct.Struct("<4sHBBIQ")
+# position key, source square id, destination square id, weight
+RECORD_FORMAT = struct.Struct("<QBBH")
+MAX_WEIGHT = 0xFFFF
+
+
+class OpeningBookError(Exception):
+    """
+    Raised when a book file cannot be read or was made for another board or hash.
+    """
+
+
+class OpeningBook:
+    """
+    Moves to play in known positions instead of searching them, looked up by the Zobrist key of the position.
+
+    A move is stored by its source and destination cells and matched against the moves of the position
+    when probed, so a key collision never returns an illegal move.
+    When a position has several book moves one is picked at random by weight, which varies the openings played.
+    """
+
+    def __init__(self, rows: int = 8, columns: int = 8, rng: Optional[random.Random] = None):
+        self.rows = rows
+        self.columns = columns
+        self.rng = rng or random.Random()
+        # key -> {(source name, destination name): weight}
+        self.entries: dict[int, dict[tuple[str, str], int]] = defaultdict(dict)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.entries
+
+    def add(self, key: int, move: MoveSequence, weight: int = 1) -> None:
+        """
+        Add a move to the position of the key, adding the weights of a move added more than once.
+        """
+        moves = self.entries[key]
+        pair = move.src_name, move.dest_name
+        moves[pair] = min(MAX_WEIGHT, moves.get(pair, 0) + weight)
+
+    def add_line(self, board: Board, line: Iterable[MoveSequence], weight: int = 1) -> None:
+        """
+        Add every move of a line of play starting from the position of the board, which is left as it was found.
+        """
+        board.refresh_hash_key()
+        played = []
+        try:
+            for move in line:
+                self.add(board.game.hash_key, move, weight)
+                played.append(board.make_sequence(move))
+        finally:
+            for records in reversed(played):
+                board.unmake_sequence(records)
+
+    def probe(self, board: Board) -> list[tuple[MoveSequence, int]]:
+        """
+        Get the book moves of the position on the board with their weights, empty when it is out of book.
+        """
+        moves = self.entries.get(board.game.hash_key)
+        if not moves:
+            return []
+        return [
+            (move, moves[move.src_name, move.dest_name])
+            for move in board.get_move_sequences()
+            if (move.src_name, move.dest_name) in moves
+        ]
+
+    def choose_move(self, board: Board) -> Optional[MoveSequence]:
+        """
+        Pick one of the book moves of the position by weight, None when it is out of book.
+        """
+        book_moves = self.probe(board)
+        if not book_moves:
+            return None
+        moves, weights = zip(*book_moves)
+        return self.rng.choices(moves, weights)[0]
+
+    def to_bytes(self) -> bytes:
+        square_ids = get_board_geometry(self.rows, self.columns).square_ids
+        records = sorted(
+            (key, square_ids[src], square_ids[dest], weight)
+            for key, moves in self.entries.items()
+            for (src, dest), weight in moves.items()
+        )
+        header = HEADER_FORMAT.pack(BOOK_MAGIC, BOOK_VERSION, self.rows, self.columns, ZOBRIST_SEED, len(records))
+        return header + b"".join(RECORD_FORMAT.pack(*record) for record in records)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, rng: Optional[random.Random] = None) -> "OpeningBook":
+        if len(data) < HEADER_FORMAT.size:
+            raise OpeningBookError("Book is too short to hold a header.")
+        magic, version, rows, columns, seed, count = HEADER_FORMAT.unpack_from(data)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            raise OpeningBookError("Not an opening book of this version.")
+        if seed != ZOBRIST_SEED:
+            raise OpeningBookError(f"Book keys were made with hash seed {seed}, expected {ZOBRIST_SEED}.")
+        if len(data) != HEADER_FORMAT.size + count * RECORD_FORMAT.size:
+            raise OpeningBookError("Book size does not match its number of records.")
+
+        book = cls(rows, columns, rng)
+        names = get_board_geometry(rows, columns).names
+        for key, src, dest, weight in RECORD_FORMAT.iter_unpack(data[HEADER_FORMAT.size:]):
+            book.entries[key][names[src], names[dest]] = weight
+        return book
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str | Path, rng: Optional[random.Random] = None) -> "OpeningBook":
+        return cls.from_bytes(Path(path).read_bytes(), rng)
+
+
+def generate_book(board: Board, plies: int, search_depth: int, node_limit: Optional[int] = None) -> OpeningBook:
+    """
+    Build a book from the position of the board by searching every position reached within the given number of turns.
+
+    Each position gets its best move found by a search of search_depth turns.
+    Every reply is followed, so the book answers whatever the opponent plays.
+    """
+    book = OpeningBook(board.rows, board.columns)
+    search = AlphaBetaSearch(board)
+    board.refresh_hash_key()
+    seen = set()
+
+    def visit(remaining: int) -> None:
+        key = board.game.hash_key
+        if remaining <= 0 or key in seen:
+            return
+        seen.add(key)
+        moves = search.get_moves()
+        if not moves:
+            return
+        result = search.iterative_deepening(search_depth, node_limit=node_limit)
+        book.add(key, result.best_move)
+        for move in moves:
+            records = board.make_sequence(move)
+            visit(remaining - 1)
+            board.unmake_sequence(records)
+
+    visit(plies)
+    return book
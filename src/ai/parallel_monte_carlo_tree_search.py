@@ -0,0 +1,134 @@
+import os
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+from ai.monte_carlo_tree_search import MonteCarloTreeSearch, MCTSResult, DEFAULT_ITERATIONS
+from board import Board
+from state.move_sequence import MoveSequence
+from state.position_snapshot import PositionSnapshot
+
+# each worker process keeps its tree between tasks, its next task continues from it
+_worker_search: Optional[MonteCarloTreeSearch] = None
+
+
+def _get_worker_search(
+        snapshot: PositionSnapshot, position_counts: Optional[dict[int, int]], no_progress_turns: int
+) -> MonteCarloTreeSearch:
+    global _worker_search
+    board = None if _worker_search is None else _worker_search.board
+    if board is None or (board.rows, board.columns, board.use_bitboard) != (
+            snapshot.rows, snapshot.columns, snapshot.use_bitboard):
+        _worker_search = MonteCarloTreeSearch(Board(snapshot.rows, snapshot.columns, snapshot.use_bitboard))
+    board = _worker_search.board
+    board.load_position_snapshot(snapshot)
+    if position_counts is not None:
+        board.game.position_counts = dict(position_counts)
+        board.game.no_progress_turns = no_progress_turns
+    return _worker_search
+
+
+def run_playouts(
+        snapshot: PositionSnapshot, iterations: Optional[int], time_limit: Optional[float], seed: int,
+        position_counts: Optional[dict[int, int]] = None, no_progress_turns: int = 0
+) -> tuple[list[tuple[MoveSequence, int, float]], int, int]:
+    """
+    Worker task: search the position of the snapshot with the tree of this process.
+
+    The snapshot starts the draw rule history over, so the positions and turns without progress counted
+    by the game that is searched are given along and restored, the playouts end in the draws the game would declare.
+
+    A process may run several tasks of one search and its tree keeps the visits of all of them,
+    so only the visits and wins this task added are returned and the merged counts add up to the iterations run.
+
+    Returns:
+        tuple: (move, visits, wins) added to every root move, the number of iterations run and the visits reused from earlier tasks.
+    """
+    search = _get_worker_search(snapshot, position_counts, no_progress_turns)
+    search.rng.seed(seed)
+    before = {child.move: (child.visits, child.wins) for child in search.find_root().children}
+    result = search.search(iterations, time_limit)
+    children = []
+    for child in search.root.children:
+        visits, wins = before.get(child.move, (0, 0.0))
+        children.append((child.move, child.visits - visits, child.wins - wins))
+    return children, result.iterations, result.reused_visits
+
+
+class ParallelMonteCarloTreeSearch:
+    """
+    Monte Carlo tree search over a pool of processes with root parallelisation.
+
+    Every worker grows its own tree of the position from a differently seeded playout generator,
+    the visits and wins the tasks added to the root moves are then added up and the most visited move is played.
+    Every process keeps the tree of the last task it ran, not one per task, so a later search of a following position
+    reuses the tree of whichever task the process ran last.
+
+    Use it as a context manager or call close, so the process pool is shut down.
+    """
+
+    def __init__(
+            self, board: Board, workers: Optional[int] = None, executor: Optional[Executor] = None,
+            rng: Optional[random.Random] = None
+    ):
+        self.board = board
+        self.workers = workers or os.cpu_count() or 1
+        self.rng = rng or random.Random()
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def __enter__(self) -> "ParallelMonteCarloTreeSearch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def search(self, iterations: Optional[int] = None, time_limit: Optional[float] = None) -> MCTSResult:
+        """
+        Run the iterations split over the workers, or let every worker run until the time limit,
+        and return the move with the most visits over all workers.
+        """
+        if iterations is None and time_limit is None:
+            iterations = DEFAULT_ITERATIONS
+        snapshot = self.board.get_position_snapshot()
+        game = self.board.game
+
+        futures = [
+            self.executor.submit(
+                run_playouts, snapshot, self._worker_iterations(iterations, worker), time_limit,
+                self.rng.getrandbits(32), game.position_counts, game.no_progress_turns
+            )
+            for worker in range(self.workers)
+        ]
+
+        merged: dict[MoveSequence, list] = {}
+        total_iterations = reused_visits = 0
+        for future in futures:
+            children, worker_iterations, worker_reused = future.result()
+            total_iterations += worker_iterations
+            reused_visits += worker_reused
+            for move, visits, wins in children:
+                stats = merged.setdefault(move, [0, 0.0])
+                stats[0] += visits
+                stats[1] += wins
+
+        if not merged:
+            return MCTSResult(None, iterations=total_iterations, reused_visits=reused_visits)
+        best_move, (visits, wins) = max(merged.items(), key=lambda item: item[1][0])
+        return MCTSResult(best_move, visits, wins / visits, [best_move], total_iterations, reused_visits)
+
+    def _worker_iterations(self, iterations: Optional[int], worker: int) -> Optional[int]:
+        if iterations is None:
+            return None
+        return iterations // self.workers + (1 if worker < iterations % self.workers else 0)
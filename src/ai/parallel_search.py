@@ -0,0 +1,247 @@
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from ai.alpha_beta_search import AlphaBetaSearch, SearchResult, SearchTimeout, INFINITY, WIN_SCORE
+from ai.educated_guess_heuristic import eval_material_state
+from ai.transposition_table import TranspositionTable
+from board import Board
+from state.move_sequence import MoveSequence
+from state.position_snapshot import PositionSnapshot
+
+# each worker process keeps its table between tasks, positions of one search are often reached by several tasks
+_worker_table: Optional[TranspositionTable] = None
+
+
+def _get_worker_table() -> TranspositionTable:
+    global _worker_table
+    if _worker_table is None:
+        _worker_table = TranspositionTable()
+    return _worker_table
+
+
+def search_line(
+        snapshot: PositionSnapshot, line: list[MoveSequence], depth: int, alpha: int, beta: int,
+        time_limit: Optional[float] = None, heuristic: Callable = eval_material_state,
+        position_counts: Optional[dict[int, int]] = None, no_progress_turns: int = 0
+) -> Optional[tuple[int, list[MoveSequence], int]]:
+    """
+    Worker task: play the line on a board built from the snapshot and search the position it leads to.
+
+    The snapshot starts the draw rule history over, so the positions and turns without progress counted
+    by the game that was searched are given along and restored.
+
+    Returns:
+        tuple: Score for the player to move after the line, the expected continuation and the number of searched nodes.
+        None when the time limit ran out.
+    """
+    board = Board.from_position_snapshot(snapshot)
+    if position_counts is not None:
+        board.game.position_counts = dict(position_counts)
+        board.game.no_progress_turns = no_progress_turns
+    for move in line:
+        board.make_sequence(move)
+
+    search = AlphaBetaSearch(board, heuristic, transposition_table=_get_worker_table())
+    try:
+        score, continuation = search.search_window(depth, alpha, beta, len(line), time_limit)
+    except SearchTimeout:
+        return None
+    return score, continuation, search.nodes
+
+
+@dataclass
+class SplitNode:
+    """
+    Position of the tree above the split ply, its leaves are searched by the workers.
+    """
+    line: list[MoveSequence]
+    depth: int
+    children: list[tuple[MoveSequence, "SplitNode"]] = field(default_factory=list)
+    result: Optional[tuple[int, list[MoveSequence]]] = None
+
+
+class ParallelSearch:
+    """
+    Alpha-beta search split across a pool of processes.
+
+    The tree is expanded in this process up to split_ply turns, the positions it reaches are searched
+    by the workers and their scores are backed up into the best move and principal variation.
+    With the split at the root the best score found so far is handed to every newly started task as its window,
+    the first root move is searched alone so the others start with a useful bound.
+
+    Use it as a context manager or call close, so the process pool is shut down.
+    """
+
+    def __init__(
+            self, board: Board, workers: Optional[int] = None, split_ply: int = 1,
+            heuristic: Callable = eval_material_state, executor: Optional[Executor] = None
+    ):
+        self.board = board
+        self.workers = workers or os.cpu_count() or 1
+        self.split_ply = max(1, split_ply)
+        self.heuristic = heuristic
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def __enter__(self) -> "ParallelSearch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def search(self, max_depth: int, time_limit: Optional[float] = None) -> SearchResult:
+        """
+        Search the current position to the given depth and return the best move found.
+
+        Args:
+            max_depth: Number of turns to look ahead.
+            time_limit: Optional budget in seconds, tasks still running when it runs out are left out of the result.
+        """
+        local = AlphaBetaSearch(self.board, self.heuristic)
+        if max_depth <= 0 or not local.get_moves():
+            return local.search(max_depth)
+
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        root = SplitNode([], max_depth)
+        self._expand(root, min(self.split_ply, max_depth), local)
+        is_complete, nodes = self._search_leaves(root, deadline)
+
+        backed_up = self._back_up(root)
+        if backed_up is None:
+            first = local.get_moves()[0]
+            return SearchResult(first, -INFINITY, [first], max_depth, nodes, is_complete=False)
+        score, line = backed_up
+        return SearchResult(line[0], score, line, max_depth, nodes, is_complete)
+
+    def iterative_deepening(self, max_depth: int, time_limit: Optional[float] = None) -> SearchResult:
+        """
+        Search to depth 1, 2, ... max_depth until the time budget runs out and return the deepest complete search.
+
+        Like the serial search, only a cut short first iteration is used as is, so there is always a move to play.
+        """
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        best, nodes = None, 0
+        for depth in range(1, max(1, max_depth) + 1):
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            result = self.search(depth, remaining)
+            nodes += result.nodes
+            if not result.is_complete:
+                best = best or result
+                break
+            best = result
+            # a found win or loss will not change deeper
+            if abs(result.score) >= WIN_SCORE // 2 or deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        best.nodes = nodes
+        return best
+
+    def _expand(self, node: SplitNode, plies: int, local: AlphaBetaSearch) -> None:
+        """
+        Add the children of a position until the split ply.
+        """
+        if plies <= 0 or node.depth <= 0:
+            return
+        for move in local.get_moves():
+            records = self.board.make_sequence(move)
+            try:
+                child = SplitNode(node.line + [move], node.depth - 1)
+                self._expand(child, plies - 1, local)
+                node.children.append((move, child))
+            finally:
+                self.board.unmake_sequence(records)
+
+    def _search_leaves(self, root: SplitNode, deadline: Optional[float]) -> tuple[bool, int]:
+        """
+        Search the leaves in the workers, at most one task per worker runs at a time.
+
+        Returns:
+            tuple: Whether every leaf was searched in time and the total number of searched nodes.
+        """
+        snapshot = self.board.get_position_snapshot()
+        game = self.board.game
+        position_counts, no_progress_turns = game.position_counts, game.no_progress_turns
+        leaves = self._leaves(root)
+        # below a root split every leaf is a position of the opponent, so its window follows the root alpha
+        share_alpha = self.split_ply == 1
+        alpha = -INFINITY
+        # the window each task was started with, to tell exact scores from bounds
+        pending: dict[Future, tuple[SplitNode, int]] = {}
+        is_complete, nodes = True, 0
+
+        def submit_next() -> bool:
+            leaf = next(leaves, None)
+            if leaf is None:
+                return False
+            beta = -alpha if share_alpha else INFINITY
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            future = self.executor.submit(
+                search_line, snapshot, leaf.line, leaf.depth, -INFINITY, beta, remaining, self.heuristic,
+                position_counts, no_progress_turns
+            )
+            pending[future] = leaf, beta
+            return True
+
+        submit_next()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                leaf, beta = pending.pop(future)
+                outcome = future.result()
+                if outcome is None:
+                    is_complete = False
+                    continue
+                score, continuation, leaf_nodes = outcome
+                nodes += leaf_nodes
+                # a score at or above beta only bounds a move that cannot beat the best root move
+                if score < beta:
+                    leaf.result = score, continuation
+                    if share_alpha:
+                        alpha = max(alpha, -score)
+            while len(pending) < self.workers and submit_next():
+                pass
+
+        return is_complete, nodes
+
+    def _leaves(self, node: SplitNode) -> Iterator[SplitNode]:
+        if not node.children:
+            yield node
+        for _, child in node.children:
+            yield from self._leaves(child)
+
+    def _back_up(self, node: SplitNode) -> Optional[tuple[int, list[MoveSequence]]]:
+        """
+        Negamax over the split tree, root moves that were not searched in time are skipped.
+
+        Below the root a move left unsearched may be the best reply, so a position with one has no score
+        and the root move leading to it is skipped as well.
+        """
+        if not node.children:
+            return node.result
+
+        is_root = not node.line
+        best = None
+        for move, child in node.children:
+            result = self._back_up(child)
+            if result is None:
+                if not is_root:
+                    return None
+                continue
+            score, line = result
+            if best is None or -score > best[0]:
+                best = -score, [move] + line
+        return best
@@ -0,0 +1,70 @@
+import threading
+from typing import Any, Callable, Optional
+
+
+class Ponderer:
+    """
+    Thinks on the opponent's time: runs a search in a background thread while the opponent chooses a move.
+
+    The search is given the hash key of the position it ponders and a stop event it has to watch.
+    Once the opponent has moved, take_result stops it and hands over its result when the position reached
+    is the pondered one and the search ran to its end, otherwise the caller searches as usual.
+    Searches keeping state between moves, like a transposition table or a Monte Carlo tree, profit from pondering either way.
+    """
+
+    def __init__(self):
+        # hash key of the pondered position, None when nothing was pondered
+        self.key: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._result: Optional[Any] = None
+
+    @property
+    def is_pondering(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, key: int, think: Callable[[threading.Event], Any]) -> None:
+        """
+        Stop any earlier pondering and start thinking about the position of the key in the background.
+        """
+        self.stop()
+        self.key = key
+        self._result = None
+        self._stop_event = threading.Event()
+        # a daemon thread never keeps the program alive once the game is left
+        self._thread = threading.Thread(target=self._run, args=(think, self._stop_event), daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the search to end on its own, returns whether it did within the timeout.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_pondering
+
+    def stop(self) -> None:
+        """
+        Tell the search to stop and wait until it has, the board it searches is free to use afterwards.
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def take_result(self, key: int) -> Optional[Any]:
+        """
+        Stop pondering and get the result of a search that ran to its end on the position of the key, else None.
+        """
+        self.stop()
+        result = self._result if key == self.key else None
+        self.key = None
+        self._result = None
+        return result
+
+    def _run(self, think: Callable[[threading.Event], Any], stop_event: threading.Event) -> None:
+        result = think(stop_event)
+        # a stopped search was cut short, its result is not the one a full search would find
+        if not stop_event.is_set():
+            self._result = result
@@ -0,0 +1,119 @@
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional
+
+from ai.match_runner import MatchScore
+
+# Elo difference reported for a perfect or a zero score, which have no finite estimate
+MAX_ELO = 1000.0
+
+# Decisions of a sequential probability ratio test
+ACCEPT_H0 = "H0"
+ACCEPT_H1 = "H1"
+
+
+def elo_to_score(elo: float) -> float:
+    """
+    Expected score of a player rated elo points above the opponent.
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score: float) -> float:
+    if score <= 0:
+        return -MAX_ELO
+    if score >= 1:
+        return MAX_ELO
+    return max(-MAX_ELO, min(MAX_ELO, -400 * math.log10(1 / score - 1)))
+
+
+def _score_and_variance(score: MatchScore) -> tuple[int, float, float]:
+    """
+    Number of games, mean score of a game and its variance over the wins, draws and losses.
+    """
+    # when every game had the same result a game of another result is added, so the variance is not zero
+    if score.games in (score.wins, score.losses):
+        score = MatchScore(score.wins, score.losses, score.draws + 1)
+    elif score.games == score.draws:
+        score = MatchScore(score.wins + 1, score.losses + 1, score.draws)
+    games = score.games
+    mean = score.points / games
+    variance = (
+            score.wins * (1 - mean) ** 2 + score.draws * (0.5 - mean) ** 2 + score.losses * mean ** 2
+    ) / games
+    return games, mean, variance
+
+
+@dataclass(frozen=True)
+class EloEstimate:
+    """
+    Elo difference to the opponents measured by a score, with the bounds of its confidence interval.
+    """
+    elo: float
+    lower: float
+    upper: float
+    games: int
+
+    @property
+    def error(self) -> float:
+        return (self.upper - self.lower) / 2
+
+    def __str__(self) -> str:
+        return f"{self.elo:+.1f} ± {self.error:.1f}"
+
+
+def elo_estimate(score: MatchScore, confidence: float = 0.95) -> EloEstimate:
+    """
+    Estimate the Elo difference from the wins, draws and losses, the interval is the normal one of the mean score.
+    """
+    if score.games == 0:
+        return EloEstimate(0.0, -MAX_ELO, MAX_ELO, 0)
+    games, mean, variance = _score_and_variance(score)
+    margin = NormalDist().inv_cdf((1 + confidence) / 2) * math.sqrt(variance / games)
+    return EloEstimate(
+        score_to_elo(mean), score_to_elo(mean - margin), score_to_elo(mean + margin), score.games
+    )
+
+
+@dataclass(frozen=True)
+class SPRT:
+    """
+    Sequential probability ratio test of whether an engine is elo1 rather than elo0 points stronger than its opponent.
+
+    The log likelihood ratio of the games so far is compared after every game with the bounds set by the error rates:
+    below the lower bound the engine is taken to be elo0 stronger, above the upper one elo1 stronger.
+    Most tests reach a bound long before a fixed number of games would have been played.
+    The ratio uses the normal approximation of the score over wins, draws and losses.
+    """
+    elo0: float = 0.0
+    elo1: float = 10.0
+    # chance of accepting H1 when H0 holds, and of accepting H0 when H1 holds
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    @property
+    def lower_bound(self) -> float:
+        return math.log(self.beta / (1 - self.alpha))
+
+    @property
+    def upper_bound(self) -> float:
+        return math.log((1 - self.beta) / self.alpha)
+
+    def llr(self, score: MatchScore) -> float:
+        if score.games == 0:
+            return 0.0
+        games, mean, variance = _score_and_variance(score)
+        score0, score1 = elo_to_score(self.elo0), elo_to_score(self.elo1)
+        return games * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+
+    def decide(self, score: MatchScore) -> Optional[str]:
+        """
+        ACCEPT_H1 or ACCEPT_H0 once the ratio crosses one of the bounds, None while more games are needed.
+        """
+        llr = self.llr(score)
+        if llr >= self.upper_bound:
+            return ACCEPT_H1
+        if llr <= self.lower_bound:
+            return ACCEPT_H0
+        return None
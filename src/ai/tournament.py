@@ -0,0 +1,224 @@
+import os
+import random
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field, replace
+from itertools import combinations
+from typing import Iterator, Optional
+
+from ai.alpha_beta_search import AlphaBetaSearch
+from ai.match_runner import MatchRunner, EngineConfig, GameRecord, GameTask, MatchScore, play_game, MAX_GAME_TURNS
+from ai.rating import SPRT, EloEstimate, elo_estimate
+from board import Board
+from state.move_sequence import MoveSequence
+
+# How the engines of a tournament are paired
+ROUND_ROBIN = "round-robin"
+GAUNTLET = "gauntlet"
+SCHEDULES = (ROUND_ROBIN, GAUNTLET)
+
+# Largest search score of an opening still taken as balanced, half a man
+BALANCED_SCORE = 5
+
+
+def generate_openings(
+        count: int, turns: int, depth: int = 4, max_score: int = BALANCED_SCORE, seed: Optional[int] = None,
+        max_attempts: Optional[int] = None
+) -> list[tuple[MoveSequence, ...]]:
+    """
+    Play random lines of the given number of turns from the initial setup and keep the balanced ones.
+
+    A line is balanced when a search of the position it leads to scores it within max_score for either player,
+    so no game of a tournament is decided by its opening. Lines leading to the same position are kept once.
+    Fewer lines are returned when max_attempts lines were tried without finding enough.
+    """
+    rng = random.Random(seed)
+    board = Board(use_bitboard=True)
+    board.initial_setup()
+    initial = board.get_position_snapshot()
+    search = AlphaBetaSearch(board)
+    openings, seen = [], set()
+    max_attempts = max_attempts if max_attempts is not None else 50 * count
+
+    for _ in range(max_attempts):
+        if len(openings) == count:
+            break
+        board.load_position_snapshot(initial)
+        line = []
+        for _ in range(turns):
+            moves = board.get_move_sequences()
+            if not moves:
+                break
+            line.append(rng.choice(moves))
+            board.make_sequence(line[-1])
+        if len(line) < turns or board.game.hash_key in seen:
+            continue
+        seen.add(board.game.hash_key)
+        if abs(search.iterative_deepening(depth).score) <= max_score:
+            openings.append(tuple(line))
+    return openings
+
+
+@dataclass
+class Pairing:
+    """
+    The games of two engines in a tournament, scored for the first one.
+    """
+    first: EngineConfig
+    second: EngineConfig
+    score: MatchScore = field(default_factory=MatchScore)
+    # ACCEPT_H0 or ACCEPT_H1 once the SPRT of the pairing has decided, it is not played any further then
+    decision: Optional[str] = None
+
+    @property
+    def names(self) -> tuple[str, str]:
+        return self.first.name, self.second.name
+
+    @property
+    def elo(self) -> EloEstimate:
+        return elo_estimate(self.score)
+
+
+@dataclass
+class TournamentResult:
+    pairings: list[Pairing]
+    records: list[GameRecord]
+
+    def standings(self) -> list[tuple[str, MatchScore, EloEstimate]]:
+        """
+        Score of every engine over all its games and the Elo difference to its opponents it shows, best first.
+        """
+        names = list(dict.fromkeys(name for pairing in self.pairings for name in pairing.names))
+        table = []
+        for name in names:
+            score = MatchScore.from_records(self.records, name)
+            table.append((name, score, elo_estimate(score)))
+        return sorted(table, key=lambda row: row[2].elo, reverse=True)
+
+
+class Tournament:
+    """
+    Plays the games of several engine pairings over one pool of processes.
+
+    A round-robin pairs every engine with every other one, a gauntlet pairs the first engine with each of the others.
+    Games of the pairings are interleaved and at most one game per worker is running,
+    so with an SPRT a pairing stops as soon as its test decides and the workers move on to the undecided ones.
+    Each pairing plays like a match: the sides alternate and both games of a pair start from the same opening.
+
+    Use it as a context manager or call close, so the process pool is shut down.
+    With a single worker and no executor the games are played in this process.
+    """
+
+    def __init__(
+            self, configs: list[EngineConfig], schedule: str = ROUND_ROBIN, games: int = 100,
+            openings: Optional[list[tuple[MoveSequence, ...]]] = None, sprt: Optional[SPRT] = None,
+            workers: Optional[int] = None, executor: Optional[Executor] = None, opening_turns: int = 0,
+            max_turns: int = MAX_GAME_TURNS, seed: Optional[int] = None
+    ):
+        names = [config.name for config in configs]
+        if len(set(names)) != len(names):
+            raise ValueError("Every engine of a tournament needs its own name.")
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Unknown schedule {schedule}, expected one of {', '.join(SCHEDULES)}.")
+        self.configs = configs
+        self.schedule = schedule
+        # the most games every pairing plays, an SPRT may stop it earlier
+        self.games = games
+        self.openings = openings
+        self.sprt = sprt
+        self.workers = workers or os.cpu_count() or 1
+        self.opening_turns = opening_turns
+        self.max_turns = max_turns
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self._executor = executor
+        self._owns_executor = executor is None
+        # scores and test decisions of the pairings, updated as their games finish
+        self.pairings = self._pair_engines()
+
+    def __enter__(self) -> "Tournament":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pair_engines(self) -> list[Pairing]:
+        if self.schedule == GAUNTLET:
+            challenger, *opponents = self.configs
+            return [Pairing(challenger, opponent) for opponent in opponents]
+        return [Pairing(first, second) for first, second in combinations(self.configs, 2)]
+
+    def run(self) -> TournamentResult:
+        records = [record for _, record in self.play()]
+        return TournamentResult(self.pairings, sorted(records, key=lambda record: record.index))
+
+    def play(self) -> Iterator[tuple[Pairing, GameRecord]]:
+        """
+        Play the games and yield every record with its updated pairing as soon as the game is over.
+        """
+        pairings = self.pairings
+        # every pairing gets its own openings seed, its game numbers follow the ones of the pairings before
+        queues = [
+            iter(MatchRunner(
+                pairing.first, pairing.second, workers=1, opening_turns=self.opening_turns,
+                max_turns=self.max_turns, seed=self.seed + number * self.games, openings=self.openings
+            ).tasks(self.games))
+            for number, pairing in enumerate(pairings)
+        ]
+        turn = 0
+
+        def next_task() -> Optional[tuple[Pairing, GameTask]]:
+            """
+            Take the next game of the undecided pairings in turn, None when every pairing is done.
+            """
+            nonlocal turn
+            for _ in range(len(pairings)):
+                number = turn % len(pairings)
+                turn += 1
+                if pairings[number].decision is not None:
+                    continue
+                task = next(queues[number], None)
+                if task is not None:
+                    return pairings[number], replace(task, index=number * self.games + task.index)
+            return None
+
+        if self.workers == 1 and self._executor is None:
+            while (scheduled := next_task()) is not None:
+                pairing, task = scheduled
+                yield self._score(pairing, play_game(task))
+            return
+
+        pending: dict[Future, Pairing] = {}
+
+        def submit_next() -> bool:
+            scheduled = next_task()
+            if scheduled is None:
+                return False
+            pairing, task = scheduled
+            pending[self.executor.submit(play_game, task)] = pairing
+            return True
+
+        while len(pending) < self.workers and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield self._score(pending.pop(future), future.result())
+            while len(pending) < self.workers and submit_next():
+                pass
+
+    def _score(self, pairing: Pairing, record: GameRecord) -> tuple[Pairing, GameRecord]:
+        pairing.score.add(record, pairing.first.name)
+        # games still running when the test decided are counted, but do not change the decision
+        if self.sprt is not None and pairing.decision is None:
+            pairing.decision = self.sprt.decide(pairing.score)
+        return pairing, record
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Optional
+
+from state.move_sequence import MoveSequence
+
+# 2 slots per bucket, 2**16 buckets keep around 130k positions
+DEFAULT_BUCKETS = 2 ** 16
+BUCKET_SIZE = 2
+
+
+class Bound(IntEnum):
+    """
+    How a stored score relates to the true score of the position.
+    """
+    EXACT = 0
+    # the search failed high, the true score is at least the stored score
+    LOWER = 1
+    # the search failed low, the true score is at most the stored score
+    UPPER = 2
+
+
+@dataclass(frozen=True)
+class TableEntry:
+    key: int
+    depth: int
+    bound: Bound
+    score: int
+    best_move: Optional[MoveSequence]
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of searched positions, keyed by their Zobrist hash.
+
+    The memory is allocated up front and never grows. Each bucket has two slots:
+    the first keeps the deepest search of the positions mapped to it,
+    the second always takes the newest entry, so recent positions are not lost to old deep ones.
+    """
+
+    def __init__(self, buckets: int = DEFAULT_BUCKETS):
+        if buckets < 1:
+            raise ValueError("Transposition table needs at least one bucket.")
+        self.buckets = buckets
+        slots = buckets * BUCKET_SIZE
+        # parallel lists instead of entry objects, a slot is empty while its depth is -1
+        self._keys = [0] * slots
+        self._depths = [-1] * slots
+        self._bounds = [Bound.EXACT] * slots
+        self._scores = [0] * slots
+        self._moves: list[Optional[MoveSequence]] = [None] * slots
+
+    def __len__(self) -> int:
+        return sum(depth >= 0 for depth in self._depths)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._keys)
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        """
+        Get the stored entry of a position, None if it is not in the table.
+        """
+        slot = self._bucket(key)
+        for index in (slot, slot + 1):
+            if self._depths[index] >= 0 and self._keys[index] == key:
+                return TableEntry(
+                    key, self._depths[index], self._bounds[index], self._scores[index], self._moves[index]
+                )
+        return None
+
+    def store(
+            self, key: int, depth: int, bound: Bound, score: int, best_move: Optional[MoveSequence] = None
+    ) -> None:
+        """
+        Store the result of searching a position to the given depth.
+
+        The depth preferred slot is replaced by an entry of the same position or of at least the same depth,
+        otherwise the entry goes to the always replace slot.
+        """
+        slot = self._bucket(key)
+        if self._depths[slot] < 0 or self._keys[slot] == key or depth >= self._depths[slot]:
+            index = slot
+        else:
+            index = slot + 1
+
+        # keep the known best move when a shallower result of the same position has none
+        if best_move is None and self._depths[index] >= 0 and self._keys[index] == key:
+            best_move = self._moves[index]
+
+        self._keys[index] = key
+        self._depths[index] = depth
+        self._bounds[index] = bound
+        self._scores[index] = score
+        self._moves[index] = best_move
+
+    def clear(self) -> None:
+        slots = self.capacity
+        self._depths[:] = [-1] * slots
+        self._moves[:] = [None] * slots
+
+    def _bucket(self, key: int) -> int:
+        return (key % self.buckets) * BUCKET_SIZE
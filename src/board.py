@@ -1,34 +1,52 @@
-from copy import deepcopy
-
 from component.cell import Cell
 from component.game import Game, P
 from component.piece import Piece
 from display.board_display import BoardDisplay
+from exceptions.illegal_move_error import IllegalMoveError
+from managers.bitboard_manager import BitboardManager
 from managers.cell_manager import CellManager
+from managers.hash_manager import get_hash_manager
 from managers.move_handle_util import get_destination_cell_name_after_capture
 from managers.move_manager import \
-    mange_chained_move, format_available_moves
+    mange_chained_move, format_available_moves, format_available_move_sequences
 from managers.move_validator_util import can_capture_piece
 from managers.piece_manager import PieceManager
 from state.board_initial_configuration_dto import BoardInitialConfigurationDTO
 from state.board_state import BoardState
+from state.material_count import MaterialCount
+from state.move_record import MoveRecord
+from state.move_sequence import MoveSequence
 from state.move_state import MoveState
+from state.position_snapshot import PositionSnapshot
 
 
 class Board:
 
-    def __init__(self, rows=8, columns=8):
+    def __init__(self, rows=8, columns=8, use_bitboard=False):
         self.rows = rows
         self.columns = columns
-        self._cell_manager = CellManager(rows, columns)
+        # bitboard backend keeps the position as integers instead of Cell and Piece objects
+        self.use_bitboard = use_bitboard
+        self._cell_manager = self._create_cell_manager()
         self.piece_manager = PieceManager()
+        self.hash_manager = get_hash_manager(rows, columns)
         self._game = Game()
+        # turns played with play_sequence and the records undoing them, and the moves undone since, newest last.
+        # a record holds only what its move changed, so a long game keeps a history of constant size per turn
+        self._undo_stack: list[tuple[MoveSequence, list[MoveRecord]]] = []
+        self._redo_stack: list[MoveSequence] = []
 
         # ai specific
         self.is_ai = False
         # Notice: copying in heuristic explorer causes pointing to same memory space.
-        self._ai_cell_manager = deepcopy(self._cell_manager)
-        self._ai_game = deepcopy(self._game)
+        #   Both states start empty, so fresh instances are created instead of copies.
+        self._ai_cell_manager = self._create_cell_manager()
+        self._ai_game = Game()
+
+    def _create_cell_manager(self) -> CellManager | BitboardManager:
+        if self.use_bitboard:
+            return BitboardManager(self.rows, self.columns)
+        return CellManager(self.rows, self.columns)
 
     def __str__(self) -> str:
         """
@@ -38,14 +56,14 @@ class Board:
 
     # todo DOCO!
     @property
-    def cell_manager(self) -> CellManager:
+    def cell_manager(self) -> CellManager | BitboardManager:
         if self.is_ai:
             return self._ai_cell_manager
         return self._cell_manager
 
     # todo DOCO!
     @cell_manager.setter
-    def cell_manager(self, cell_manager: CellManager) -> None:
+    def cell_manager(self, cell_manager: CellManager | BitboardManager) -> None:
         if self.is_ai:
             self._ai_cell_manager = cell_manager
         self._cell_manager = cell_manager
@@ -82,8 +100,7 @@ class Board:
         """
         Place piece on the cell provided by its indexes.
         """
-        cell = self.cell_manager.get_cell_by_index(row, column)
-        cell.set_piece(piece)
+        self.cell_manager.set_piece_by_index(row, column, piece)
 
     def get_board_state(self) -> BoardState:
         return BoardState(cells=self.get_board())
@@ -99,7 +116,17 @@ class Board:
             game=self.game
         )
 
-        self.piece_manager.initial_piece_setup(initial_board_state)
+        if self.use_bitboard:
+            for cell_name, piece_owner in self.piece_manager.generate_initial_setup_cells_and_piece_owners(
+                    initial_board_state):
+                self.cell_manager.set_piece_by_name(cell_name, Piece(piece_owner))
+        else:
+            self.piece_manager.initial_piece_setup(initial_board_state)
+
+        self.refresh_hash_key()
+        self.refresh_material()
+        self.game.reset_position_history()
+        self.clear_history()
 
     def move_piece(
             self, source_name: str, target_name: str
@@ -107,21 +134,344 @@ class Board:
         """
         Move piece from source cell to target cell.
         Handles normal, capture, and chain captures moves.
+        The move is not kept in the history, so the turns played before it can no longer be undone.
         """
+        self.clear_history()
         has_chain_capture = False
         # validate that the move does not violate chain rules
         mange_chained_move(
             self.game.is_chained_move, source_name, self.game.chaining_cell_name
         )
+        previous_chaining_cell_name = self.game.chaining_cell_name
+        owner = self.game.current_player.name
+
+        if self.use_bitboard:
+            # the bitboard backend validates, captures and promotes in place
+            # an unknown source raises CellNotFoundError before it is read
+            self.cell_manager.get_square_id(source_name)
+            was_king = self.cell_manager.is_king_at(source_name)
+            target_piece = self.cell_manager.get_cell_by_name(target_name).piece
+            has_chain_capture, final_name = self.cell_manager.move_piece(source_name, target_name)
+        else:
+            source_cell, target_cell = self.cell_manager.validate_cell_move_logic(source_name, target_name)
+            was_king = source_cell.is_king()
+            target_piece = target_cell.piece
+
+            has_chain_capture, final_name = self.handle_move(has_chain_capture, source_cell, target_cell)
 
-        source_cell, target_cell = self.cell_manager.validate_cell_move_logic(source_name, target_name)
+            # update if turned to king
+            self.check_king_promotion(final_name)
 
-        has_chain_capture, final_name = self.handle_move(has_chain_capture, source_cell, target_cell)
+        # the target of a capture is the captured cell, the piece lands behind it
+        is_capture = final_name != target_name
+        self._update_game_after_move(
+            owner, source_name, final_name, was_king, not was_king and self.cell_manager.is_king_at(final_name),
+            target_name if is_capture else None, target_piece if is_capture else None, has_chain_capture,
+            previous_chaining_cell_name
+        )
 
-        # update if turned to king
-        self.check_king_promotion(final_name)
-        # update chain capture
+    def make_move(
+            self, source_name: str, target_name: str
+    ) -> MoveRecord:
+        """
+        Execute a move in place and return the record needed to undo it.
+
+        Unlike move_piece the move is not validated, it is expected to come from get_available_moves.
+        Used by the AI to explore moves without copying the board.
+        """
+        game = self.game
+        previous_chaining_cell_name = game.chaining_cell_name
+        previous_is_chained_move = game.is_chained_move
+        previous_hash_key = game.hash_key
+        previous_no_progress_turns = game.no_progress_turns
+        owner = game.current_player.name
+        was_king = self.cell_manager.is_king_at(source_name)
+
+        final_name, captured_name, captured_piece, promoted, has_chain_capture = (
+            self.cell_manager.execute_move(source_name, target_name)
+        )
+        self._update_game_after_move(
+            owner, source_name, final_name, was_king, promoted, captured_name, captured_piece, has_chain_capture,
+            previous_chaining_cell_name
+        )
+
+        return MoveRecord(
+            src_name=source_name,
+            dest_name=final_name,
+            captured_name=captured_name,
+            captured_piece=captured_piece,
+            promoted=promoted,
+            previous_chaining_cell_name=previous_chaining_cell_name,
+            previous_is_chained_move=previous_is_chained_move,
+            is_chain_capture=has_chain_capture,
+            previous_hash_key=previous_hash_key,
+            previous_no_progress_turns=previous_no_progress_turns
+        )
+
+    def _update_game_after_move(
+            self, owner: str, source_name: str, final_name: str, was_king: bool, promoted: bool,
+            captured_name: str | None, captured_piece: Piece | None, has_chain_capture: bool,
+            previous_chaining_cell_name: str | None
+    ) -> None:
+        """
+        Update the turn, material, hash key and draw state with only what an executed move changed.
+        """
+        game = self.game
         self.update_game_state(has_chain_capture, final_name)
+        self._update_material(owner, promoted, captured_piece, 1)
+
+        hash_manager = self.hash_manager
+        game.hash_key ^= (
+                hash_manager.move_key(
+                    owner, source_name, final_name, was_king, was_king or promoted,
+                    captured_name, captured_piece is not None and captured_piece.is_king()
+                )
+                ^ hash_manager.chain_key(previous_chaining_cell_name)
+                ^ hash_manager.chain_key(game.chaining_cell_name)
+                ^ (0 if has_chain_capture else hash_manager.player_two_key)
+        )
+        self._update_draw_state(not was_king or captured_piece is not None, has_chain_capture)
+
+    def unmake_move(self, record: MoveRecord) -> None:
+        """
+        Undo a move executed by make_move, restoring the position and the game state exactly.
+        """
+        game = self.game
+        if not record.is_chain_capture:
+            game.forget_position()
+            game.revert_player_turn()
+        game.is_chained_move = record.previous_is_chained_move
+        game.chaining_cell_name = record.previous_chaining_cell_name
+        game.hash_key = record.previous_hash_key
+        game.no_progress_turns = record.previous_no_progress_turns
+        # the reverted turn is the one of the player who made the move
+        self._update_material(game.current_player.name, record.promoted, record.captured_piece, -1)
+
+        self.cell_manager.revert_move(record)
+
+    def _update_draw_state(self, is_progress: bool, has_chain_capture: bool) -> None:
+        """
+        Count the turns without progress and the position reached once the turn is over.
+        """
+        game = self.game
+        game.no_progress_turns = 0 if is_progress else game.no_progress_turns + 1
+        if not has_chain_capture:
+            game.record_position()
+
+    def _update_material(
+            self, owner: str, promoted: bool, captured_piece: Piece | None, step: int
+    ) -> None:
+        """
+        Apply the material change of a move to the piece counts, a step of -1 takes it back.
+        """
+        material = self.game.material
+        if promoted:
+            material[owner].men -= step
+            material[owner].kings += step
+        if captured_piece is not None:
+            captured = material[captured_piece.player]
+            if captured_piece.is_king():
+                captured.kings -= step
+            else:
+                captured.men -= step
+
+    def get_move_sequences(self) -> list[MoveSequence]:
+        """
+        Get every complete move of the player to move, a chain capture is a single move with all its hops.
+
+        The hops are found by making and unmaking them on the board, which is left as it was found.
+        """
+        sequences = []
+        self._extend_move_sequences(None, (), (), sequences)
+        return sequences
+
+    def _extend_move_sequences(
+            self, src_name: str | None, landing_names: tuple[str, ...], captured_names: tuple[str, ...],
+            sequences: list[MoveSequence]
+    ) -> None:
+        for move in self.get_available_moves():
+            if not move.is_capture_move:
+                sequences.extend(self._normal_move_sequences(move))
+                continue
+            for target in move.target_names:
+                record = self.make_move(move.src_name, target)
+                source = src_name or move.src_name
+                landings = landing_names + (record.dest_name,)
+                captured = (captured_names + (record.captured_name,)) if record.captured_name else captured_names
+                if record.is_chain_capture:
+                    self._extend_move_sequences(source, landings, captured, sequences)
+                else:
+                    sequences.append(MoveSequence(source, landings, captured, record.promoted))
+                self.unmake_move(record)
+
+    def _normal_move_sequences(self, move: MoveState) -> list[MoveSequence]:
+        """
+        Normal moves end the turn, so they need not be played to be listed.
+        """
+        if self.cell_manager.is_king_at(move.src_name):
+            return [MoveSequence(move.src_name, (target,)) for target in move.target_names]
+
+        geometry = self.cell_manager.geometry
+        last_row = self.rows if self.game.current_player == P.P1 else 1
+        return [
+            MoveSequence(
+                move.src_name, (target,), promotes=geometry.coordinates[geometry.square_ids[target]][0] == last_row
+            )
+            for target in move.target_names
+        ]
+
+    def make_sequence(self, sequence: MoveSequence) -> list[MoveRecord]:
+        """
+        Execute every hop of a generated move in place and return the records needed to undo it.
+        """
+        return [self.make_move(source, target) for source, target in sequence.hops]
+
+    def unmake_sequence(self, records: list[MoveRecord]) -> None:
+        """
+        Undo a move executed by make_sequence.
+        """
+        for record in reversed(records):
+            self.unmake_move(record)
+
+    def move_sequence(self, sequence: MoveSequence) -> None:
+        """
+        Play every hop of a move with move_piece, validating each of them.
+        """
+        for source, target in sequence.hops:
+            self.move_piece(source, target)
+
+    def play_sequence(self, sequence: MoveSequence) -> None:
+        """
+        Play a move of the player to move and keep it in the history, so it can be undone.
+
+        Playing a move drops the moves undone before it, they can no longer be redone.
+        """
+        if sequence not in self.get_move_sequences():
+            raise IllegalMoveError(f"Illegal move {sequence}")
+        self._undo_stack.append((sequence, self.make_sequence(sequence)))
+        self._redo_stack.clear()
+
+    def can_undo(self) -> bool:
+        return bool(self._undo_stack)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo_stack)
+
+    def undo(self) -> MoveSequence | None:
+        """
+        Take back the last move played with play_sequence, None when there is none.
+
+        The game is no longer over once a move is taken back, the end is checked again.
+        """
+        if not self._undo_stack:
+            return None
+        sequence, records = self._undo_stack.pop()
+        self.unmake_sequence(records)
+        self._redo_stack.append(sequence)
+        self.game.winner = None
+        self.game.is_game_over = False
+        return sequence
+
+    def redo(self) -> MoveSequence | None:
+        """
+        Play again the last move taken back with undo, None when there is none.
+        """
+        if not self._redo_stack:
+            return None
+        sequence = self._redo_stack.pop()
+        self._undo_stack.append((sequence, self.make_sequence(sequence)))
+        return sequence
+
+    def clear_history(self) -> None:
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+
+    def get_played_moves(self) -> list[MoveSequence]:
+        """
+        Get the moves played with play_sequence that can be undone, the first one first.
+        """
+        return [sequence for sequence, _ in self._undo_stack]
+
+    def compute_hash_key(self) -> int:
+        """
+        Compute the Zobrist hash of the current position and game state from scratch.
+        """
+        game = self.game
+        # read from the pieces, so the bitboard backend builds no cells
+        return self.hash_manager.compute_hash_from_pieces(
+            self.cell_manager.get_pieces(), game.current_player.name, game.chaining_cell_name
+        )
+
+    def refresh_hash_key(self) -> None:
+        """
+        Recompute the stored hash key, needed after pieces were placed directly instead of moved.
+        """
+        self.game.hash_key = self.compute_hash_key()
+
+    def compute_material(self) -> dict[str, MaterialCount]:
+        """
+        Count the men and kings of both players from scratch.
+        """
+        return self.cell_manager.count_material()
+
+    def refresh_material(self) -> None:
+        """
+        Recount the stored piece counts, needed after pieces were placed directly instead of moved.
+        """
+        self.game.material = self.compute_material()
+
+    def encode_position(self) -> list[int]:
+        """
+        Encode the position as one small integer per playable cell, for batch evaluation.
+        """
+        return self.cell_manager.encode_position()
+
+    def get_position_snapshot(self) -> PositionSnapshot:
+        """
+        Copy the position and game state into a picklable snapshot.
+        """
+        game = self.game
+        return PositionSnapshot(
+            rows=self.rows,
+            columns=self.columns,
+            pieces=self.cell_manager.get_pieces(),
+            current_player=game.current_player.name,
+            chaining_cell_name=game.chaining_cell_name,
+            turn_counter=game.turn_counter,
+            use_bitboard=self.use_bitboard
+        )
+
+    def load_position_snapshot(self, snapshot: PositionSnapshot) -> None:
+        """
+        Replace the position and game state with the ones of the snapshot.
+        """
+        cell_manager = self.cell_manager
+        for name in cell_manager.geometry.names:
+            cell_manager.set_piece_by_name(name, None)
+        for name, owner, is_king in snapshot.pieces:
+            piece = Piece(owner)
+            if is_king:
+                piece.set_king()
+            cell_manager.set_piece_by_name(name, piece)
+
+        game = self.game
+        game.set_player_manually(snapshot.current_player)
+        game.turn_counter = snapshot.turn_counter
+        game.chaining_cell_name = snapshot.chaining_cell_name
+        game.is_chained_move = snapshot.chaining_cell_name is not None
+        # hashed from the snapshot, the bitboard backend would otherwise build every cell to be hashed
+        game.hash_key = self.hash_manager.compute_hash_from_pieces(
+            snapshot.pieces, snapshot.current_player, snapshot.chaining_cell_name
+        )
+        self.refresh_material()
+        game.reset_position_history()
+        self.clear_history()
+
+    @classmethod
+    def from_position_snapshot(cls, snapshot: PositionSnapshot) -> "Board":
+        board = cls(snapshot.rows, snapshot.columns, snapshot.use_bitboard)
+        board.load_position_snapshot(snapshot)
+        return board
 
     def handle_move(
             self, has_chain_capture: bool, source_cell: Cell, target_cell: Cell
@@ -213,7 +563,9 @@ class Board:
         self.game.toggle_player_turn()
 
     def capture_piece(self, source_cell: Cell, target_cell: Cell) -> str:
-        cell_dest_name = get_destination_cell_name_after_capture(source_cell, target_cell)
+        cell_dest_name = get_destination_cell_name_after_capture(
+            self.cell_manager.geometry, source_cell, target_cell
+        )
 
         self.cell_manager.begin_capture_attempt(cell_dest_name, source_cell, target_cell)
 
@@ -237,6 +589,13 @@ class Board:
         """
         return format_available_moves(moves)
 
+    @staticmethod
+    def get_user_move_sequences_prompt(sequences: list[MoveSequence]) -> str:
+        """
+        Return a prompt to be displayed to the user with the complete moves available and how to access them.
+        """
+        return format_available_move_sequences(sequences)
+
     def is_game_end(
             self, moves: list[MoveState], opponent_pieces: list[Piece]
     ) -> bool:
@@ -253,6 +612,12 @@ class Board:
             self.game.winner = self.game.current_player
             return True
 
+        # handle a draw, the game ends without a winner
+        if self.game.is_draw_by_rule():
+            self.game.winner = None
+            self.set_game_over()
+            return True
+
         return False
 
     def _handle_game_end_no_more_moves(self):
@@ -0,0 +1,29 @@
+import argparse
+import time
+
+from ai.opening_book import generate_book
+from board import Board
+
+
+def parse_arguments(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build an opening book by searching every position of the first turns.")
+    parser.add_argument("output", help="file to write the book to")
+    parser.add_argument("--plies", type=int, default=4, help="number of turns from the initial setup the book covers")
+    parser.add_argument("--depth", type=int, default=8, help="search depth of every book position")
+    parser.add_argument("--nodes", type=int, default=None, help="optional node budget of every book search")
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> None:
+    arguments = parse_arguments(args)
+    board = Board()
+    board.initial_setup()
+
+    start = time.perf_counter()
+    book = generate_book(board, arguments.plies, arguments.depth, arguments.nodes)
+    book.save(arguments.output)
+    print(f"{len(book)} positions written to {arguments.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+import argparse
+import time
+from collections import Counter
+
+from ai.endgame_tablebase import generate_tablebase, DEFAULT_MAX_PIECES, Outcome
+
+
+def parse_arguments(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Solve every position with few pieces left by retrograde analysis.")
+    parser.add_argument("output", help="file to write the tablebase to")
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_MAX_PIECES, help="largest number of pieces on the board to solve"
+    )
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> None:
+    arguments = parse_arguments(args)
+
+    start = time.perf_counter()
+    tablebase = generate_tablebase(arguments.pieces)
+    tablebase.save(arguments.output)
+
+    outcomes = Counter(Outcome(outcome).name.lower() for outcome in tablebase.outcomes)
+    print(f"{len(tablebase)} positions written to {arguments.output} in {time.perf_counter() - start:.1f}s "
+          f"({', '.join(f'{count} {name}' for name, count in sorted(outcomes.items()))})")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,7 @@ from .game import Player as P
 from .piece import Piece
 
 
-@dataclass
+@dataclass(slots=True)
 class Cell:
     _name: str = field(init=False)
     row: int
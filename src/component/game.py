@@ -3,6 +3,8 @@ from email.policy import default
 from enum import Enum
 from typing import Optional
 
+from state.material_count import MaterialCount
+
 
 class Player(Enum):
     P1 = ("p1", "X")
@@ -24,8 +26,13 @@ class Player(Enum):
 # alias Player as P
 P = Player
 
+# Times the same position may be reached before the game is drawn by repetition
+REPETITION_LIMIT = 3
+# Turns without a capture or a move of a man before the game is drawn, forty moves of each player
+NO_PROGRESS_TURN_LIMIT = 80
+
 
-@dataclass
+@dataclass(slots=True)
 class Game:
     _chaining_cell_name: Optional[str] = None
     _current_player: P = field(default=P.P1)
@@ -33,6 +40,18 @@ class Game:
     _is_chained_move: bool = field(default=False)
     _is_game_over: bool = field(default=False)
     _winner: Optional[P] = None
+    # Zobrist hash of the position, the player to move and the chaining cell
+    hash_key: int = field(default=0)
+    # men and kings of each player, kept up to date by the board as moves are made and unmade
+    material: dict[str, MaterialCount] = field(
+        default_factory=lambda: {P.P1.name: MaterialCount(), P.P2.name: MaterialCount()}
+    )
+    # times each position was reached at the start of a turn, keyed by its hash key.
+    # a capture or a move of a man can never be taken back, so no earlier position is reached again after one
+    # and the counts of the whole game give the repetitions without scanning any history
+    position_counts: dict[int, int] = field(default_factory=dict)
+    # turns played since the last capture or move of a man
+    no_progress_turns: int = field(default=0)
 
     @property
     def chaining_cell_name(self):
@@ -83,6 +102,51 @@ class Game:
             self.current_player = P.P2 if self.current_player == P.P1 else P.P1
             self.turn_counter += 1
 
+    def revert_player_turn(self) -> None:
+        """
+        Undo the last toggle of the player turn.
+        """
+        self.current_player = P.P2 if self.current_player == P.P1 else P.P1
+        self.turn_counter -= 1
+
+    def record_position(self) -> None:
+        """
+        Count the current position as reached once more, called when a turn ends.
+        """
+        self.position_counts[self.hash_key] = self.position_counts.get(self.hash_key, 0) + 1
+
+    def forget_position(self) -> None:
+        """
+        Undo record_position of the current position, called before its turn is taken back.
+        """
+        count = self.position_counts.get(self.hash_key, 0) - 1
+        if count > 0:
+            self.position_counts[self.hash_key] = count
+        else:
+            self.position_counts.pop(self.hash_key, None)
+
+    def reset_position_history(self) -> None:
+        """
+        Start the history over from the current position, after it was set up instead of played.
+        """
+        self.position_counts = {self.hash_key: 1}
+        self.no_progress_turns = 0
+
+    def is_repetition(self, occurrences: int = REPETITION_LIMIT) -> bool:
+        """
+        Whether the current position has been reached the given number of times, counting this one.
+        """
+        return self.position_counts.get(self.hash_key, 0) >= occurrences
+
+    def is_no_progress_draw(self) -> bool:
+        return self.no_progress_turns >= NO_PROGRESS_TURN_LIMIT
+
+    def is_draw_by_rule(self) -> bool:
+        """
+        Whether the game is drawn by repetition of the position or by too many turns without progress.
+        """
+        return self.is_repetition() or self.is_no_progress_draw()
+
     # todo move to player?
     def set_player_manually(self, player: P) -> None:
         """
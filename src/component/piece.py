@@ -1,12 +1,14 @@
-from attr import dataclass
+from attr import dataclass, field
 
 
-@dataclass
+# slotted, so the many pieces copied during search carry no per-instance __dict__
+@dataclass(slots=True)
 class Piece:
     player: str
     in_game: bool = True
-    playable = True
-    king = False
+    # state flags, left out of the constructor, comparison and representation
+    playable: bool = field(default=True, init=False, eq=False, repr=False)
+    king: bool = field(default=False, init=False, eq=False, repr=False)
 
     def remove_from_game(self) -> None:
         self.in_game = False
@@ -17,3 +19,9 @@ class Piece:
 
     def set_king(self) -> None:
         self.king = True
+
+    def remove_king(self) -> None:
+        """
+        Demote the piece back to a normal piece, used when undoing a promotion.
+        """
+        self.king = False
@@ -1,7 +1,14 @@
 import re
 
+from state.move_sequence import MoveSequence
 from state.move_state import MoveState
 
+# Commands the user can give instead of choosing a move
+QUIT = "q"
+UNDO = "u"
+REDO = "r"
+HISTORY_COMMANDS = {UNDO: "undo", REDO: "redo"}
+
 
 def extract_move_chosen_by_user(
         moves_to_dict: dict[int, str]
@@ -24,16 +31,17 @@ def extract_move_chosen_by_user(
     return src_actual, tar_actual
 
 
-def get_choice(options: dict) -> tuple[str, str] | tuple[int, str]:
+def get_choice(options: dict, commands: dict[str, str] | None = None) -> tuple[str, str] | tuple[int, str]:
     """
     Prompt the user for input and validate it against available options.
 
      Returns:
-        tuple[str, str]: If the user chooses to quit.
+        tuple[str, str]: If the user chooses to quit or gives one of the commands, with the name of the command.
         tuple[int, str]: A tuple with the move index and the corresponding move description
                          if a valid move is selected.
     """
     # todo
+    commands = commands or {}
     while True:
         user_input = _get_user_input()
 
@@ -41,12 +49,15 @@ def get_choice(options: dict) -> tuple[str, str] | tuple[int, str]:
         if _is_quit(user_input):
             return _handle_quit()
 
+        if user_input.lower() in commands:
+            return user_input.lower(), commands[user_input.lower()]
+
         # handle valid selection
         selection_result = _validate_selection(user_input, options)
         if selection_result:
             return selection_result
 
-        _prompt_user_choice(options)
+        _prompt_user_choice(options, commands)
 
 
 def _is_quit(user_input: str) -> bool:
@@ -102,12 +113,14 @@ def _get_user_input(prompt: str = '') -> str:
     return input(prompt).strip()
 
 
-def _prompt_user_choice(options: dict):
+def _prompt_user_choice(options: dict, commands: dict[str, str] | None = None):
     """
     Display available options to the user for selection.
     """
     formatted_options = [f"{key}: {value}" for key, value in options.items()]
     print(f"\nPlease choose a move from:\n{"\n".join(formatted_options)}")
+    for key, name in (commands or {}).items():
+        print(f"press '{key}' to {name}")
     print("press 'q' to quit")
 
 
@@ -126,6 +139,29 @@ def moves_dto_to_dict(
     return moves_to_dict
 
 
+def move_sequences_to_dict(
+        sequences: list[MoveSequence]
+) -> dict[int, str]:
+    """
+    Number the complete moves, starting from 1 as shown to the user.
+    """
+    return {idx + 1: str(sequence) for idx, sequence in enumerate(sequences)}
+
+
+def extract_sequence_chosen_by_user(
+        sequences: list[MoveSequence], commands: dict[str, str] | None = None
+) -> MoveSequence | str | None:
+    """
+    Prompt the user to choose one of the moves, None when the user quits and the key of a command the user gives.
+    """
+    selection, _ = get_choice(move_sequences_to_dict(sequences), commands)
+    if selection == QUIT:
+        return None
+    if isinstance(selection, str):
+        return selection
+    return sequences[selection - 1]
+
+
 def parse_prompt(prompt: str) -> dict[int, str]:
     """Transforms prompt text into a dictionary similar to moves_to_dict."""
     parsed_result = {}
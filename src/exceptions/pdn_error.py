@@ -0,0 +1,3 @@
+class PDNError(Exception):
+    def __init__(self, message="Invalid PDN"):
+        super().__init__(message)
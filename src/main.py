@@ -1,12 +1,61 @@
+import argparse
+
+from ai.alpha_beta_search import AlphaBetaSearch, SearchResult
+from ai.endgame_tablebase import EndgameTablebase
+from ai.heuristic_explorer import HeuristicExplorer
+from ai.match_runner import ALPHA_BETA_ENGINE, MCTS_ENGINE
+from ai.monte_carlo_tree_search import MonteCarloTreeSearch
+from ai.parallel_monte_carlo_tree_search import ParallelMonteCarloTreeSearch
+from ai.parallel_search import ParallelSearch
+from ai.opening_book import OpeningBook
+from ai.ponderer import Ponderer
 from board import Board
 from component.game import P
-from display.cli import moves_dto_to_dict, extract_move_chosen_by_user
+from display.cli import extract_sequence_chosen_by_user, HISTORY_COMMANDS, UNDO, REDO
 from managers.cell_manager import logger
+from managers.pdn_util import to_pdn_game, pdn_result, format_pdn_game, write_pdn
+from state.move_sequence import MoveSequence
+from state.pdn_game import PDNGame
+from state.position_snapshot import PositionSnapshot
+
+# Deeper searches play stronger, the time limit keeps every AI move within a fixed latency
+DEFAULT_AI_DEPTH = 6
+DEFAULT_AI_MOVE_TIME = 1.0
+# Playouts the Monte Carlo engine may add while pondering, bounds the tree of a long think by the human
+PONDER_ITERATIONS = 100_000
 
 
 class GamePlay:
-    def __init__(self):
+    def __init__(
+            self, ai_player: str | None = None, ai_depth: int = DEFAULT_AI_DEPTH,
+            ai_move_time: float | None = DEFAULT_AI_MOVE_TIME, opening_book: OpeningBook | None = None,
+            tablebase: EndgameTablebase | None = None, engine: str = ALPHA_BETA_ENGINE, workers: int = 1,
+            ponder: bool = True, pdn_path: str | None = None
+    ):
         self._board = Board()
+        # the player the AI moves for, None when both players are human
+        self.ai_player = ai_player
+        self.ai_depth = ai_depth
+        self.ai_move_time = ai_move_time
+        self.opening_book = opening_book
+        self.tablebase = tablebase
+        self.engine = engine
+        # processes the AI searches in, more than one spreads the search of either engine over the cores
+        self.workers = workers
+        # think on the human's time, the AI searches while the human chooses a move
+        self.ponder = ponder
+        self.ponderer = Ponderer()
+        # reply of the human the last AI search expects, the position after it is pondered
+        self.expected_reply: MoveSequence | None = None
+        self.ponder_hits = 0
+        # position the moves of the game were played from, written as PDN when the game ends
+        self.start_position: PositionSnapshot | None = None
+        # file the game is added to when it ends, None to only print its moves
+        self.pdn_path = pdn_path
+        self._explorer = None
+        self._mcts = None
+        self._parallel_search = None
+        self._ponder_board = None
 
     @property
     def board(self):
@@ -16,10 +65,180 @@ class GamePlay:
     def board(self, board):
         self._board = board
 
+    @property
+    def explorer(self) -> HeuristicExplorer:
+        # the board can be replaced, so the explorer follows it
+        if self._explorer is None or self._explorer.board is not self.board:
+            self._explorer = HeuristicExplorer(self.board, self.opening_book, self.tablebase)
+        return self._explorer
+
+    @property
+    def mcts(self) -> MonteCarloTreeSearch | ParallelMonteCarloTreeSearch:
+        # searches its own board, so its tree survives while the game board is replaced or played on
+        if self._mcts is None:
+            board = Board(self.board.rows, self.board.columns)
+            if self.workers > 1:
+                self._mcts = ParallelMonteCarloTreeSearch(board, self.workers)
+            else:
+                self._mcts = MonteCarloTreeSearch(board)
+        return self._mcts
+
+    @property
+    def parallel_search(self) -> ParallelSearch:
+        # the board can be replaced, the process pool is kept
+        if self._parallel_search is None:
+            self._parallel_search = ParallelSearch(self.board, self.workers)
+        self._parallel_search.board = self.board
+        return self._parallel_search
+
+    @property
+    def ponder_board(self) -> Board:
+        # the game board changes while the human moves, so the search pondering the expected reply gets its own
+        if self._ponder_board is None:
+            self._ponder_board = Board(self.board.rows, self.board.columns)
+        return self._ponder_board
+
+    @property
+    def moves(self) -> list[MoveSequence]:
+        # the board keeps the history of the moves, without the ones taken back
+        return self.board.get_played_moves()
+
     def init_game(self):
         self.board.initial_setup()
 
+    def is_ai_turn(self) -> bool:
+        return self.ai_player == self.board.game.current_player.name
+
+    def choose_ai_move(self) -> MoveSequence:
+        """
+        Play a book move in a known opening, otherwise search the best move of the AI within its depth and time budget.
+
+        The Monte Carlo engine does not use the depth or the opening book, it plays out as many games as its time allows.
+        With more than one worker the alpha-beta search is split over the worker processes.
+        When the human played the reply the AI pondered and the pondering search finished, its move is played at once.
+        """
+        if self.engine == MCTS_ENGINE:
+            # the pondered tree is reused by the search, whichever move the human played
+            self.ponderer.stop()
+            self._load_game_position(self.mcts.board)
+            return self.mcts.search(time_limit=self.ai_move_time).best_move
+
+        result = self.ponderer.take_result(self.board.compute_hash_key())
+        if result is not None:
+            self.ponder_hits += 1
+        elif self.workers > 1:
+            result = self._search_in_parallel()
+        else:
+            result = self.explorer.find_best_move(self.ai_depth, self.ai_move_time)
+        line = result.principal_variation
+        self.expected_reply = line[1] if len(line) > 1 else None
+        return result.best_move
+
+    def _search_in_parallel(self) -> SearchResult:
+        """
+        Search the move of the alpha-beta engine over the worker processes, a book move is played without searching.
+        """
+        if self.opening_book is not None:
+            book_move = self.opening_book.choose_move(self.board)
+            if book_move is not None:
+                return SearchResult(book_move, 0, [book_move], is_book_move=True)
+        return self.parallel_search.iterative_deepening(self.ai_depth, self.ai_move_time)
+
+    def start_pondering(self) -> None:
+        """
+        Search in the background while the human chooses a move.
+
+        The alpha-beta engine searches the position after the reply it expects, into the transposition table it shares
+        with the explorer, so even another reply is searched faster afterwards.
+        The Monte Carlo engine grows its tree from the current position, so every reply of the human has playouts.
+        Worker processes of the parallel Monte Carlo engine cannot be stopped midway, so it does not ponder.
+        """
+        if not self.ponder or self.ai_player is None:
+            return
+
+        if self.engine == MCTS_ENGINE:
+            if self.workers > 1:
+                return
+            mcts = self.mcts
+            self._load_game_position(mcts.board)
+            self.ponderer.start(
+                mcts.board.game.hash_key,
+                lambda stop_event: mcts.search(PONDER_ITERATIONS, stop_event=stop_event)
+            )
+            return
+
+        board = self.ponder_board
+        self._load_game_position(board)
+        if self.expected_reply not in board.get_move_sequences():
+            return
+        board.make_sequence(self.expected_reply)
+        search = AlphaBetaSearch(
+            board, transposition_table=self.explorer.transposition_table, tablebase=self.tablebase
+        )
+        self.ponderer.start(
+            board.game.hash_key,
+            lambda stop_event: search.iterative_deepening(self.ai_depth, stop_event=stop_event)
+        )
+
+    def _load_game_position(self, board: Board) -> None:
+        """
+        Set a search board to the position of the game, with the positions and turns its draw rules have counted.
+        """
+        board.load_position_snapshot(self.board.get_position_snapshot())
+        game = self.board.game
+        board.game.position_counts = dict(game.position_counts)
+        board.game.no_progress_turns = game.no_progress_turns
+
+    def undo_turn(self) -> None:
+        """
+        Take back the last move, and the moves of the AI before it, so the human can choose again.
+        """
+        self.ponderer.stop()
+        self.expected_reply = None
+        undone = self.board.undo()
+        if undone is None:
+            print("\nNothing to undo.")
+            return
+        while undone is not None and self.is_ai_turn():
+            undone = self.board.undo()
+        print("\nMove taken back.")
+
+    def redo_turn(self) -> None:
+        """
+        Play again the last move taken back, and the moves of the AI after it.
+        """
+        self.ponderer.stop()
+        self.expected_reply = None
+        if self.board.redo() is None:
+            print("\nNothing to redo.")
+            return
+        while self.is_ai_turn() and self.board.redo() is not None:
+            pass
+        print("\nMove played again.")
+
+    def to_pdn(self) -> PDNGame:
+        """
+        Record the moves played so far as a PDN game, unfinished while nobody has won and no draw rule ended it.
+        """
+        game = self.board.game
+        winner = game.winner.name if game.winner is not None else None
+        result = pdn_result(winner, game.is_game_over or winner is not None)
+        return to_pdn_game(self.moves, result, start=self.start_position)
+
     def game_loop(self):
+        if not self.moves:
+            self.start_position = self.board.get_position_snapshot()
+        try:
+            self._play()
+        finally:
+            self.ponderer.stop()
+        if self.moves:
+            pdn = self.to_pdn()
+            print(f"\nMoves:\n{format_pdn_game(pdn)}")
+            if self.pdn_path is not None:
+                write_pdn(self.pdn_path, [pdn], append=True)
+
+    def _play(self):
         while True:
             print(self.board)
             player_moves = self.board.get_available_moves()
@@ -28,20 +247,81 @@ class GamePlay:
 
             if self.board.is_game_end(player_moves, opponent_pieces):
                 winner = self.board.game.winner
-                player_symbol = winner.symbol
-                print(f"\nPlayer {player_symbol} wins!")
+                if winner is None:
+                    print("\nThe game is a draw.")
+                else:
+                    print(f"\nPlayer {winner.symbol} wins!")
                 break
 
-            moves_dict = moves_dto_to_dict(player_moves)
-            print(self.board.get_user_moves_prompt(player_moves))
+            if self.is_ai_turn():
+                sequence = self.choose_ai_move()
+                print(f"\nAI plays {sequence}")
+            else:
+                # a chain capture is chosen as a single move with all its hops
+                sequences = self.board.get_move_sequences()
+                self.start_pondering()
+                print(self.board.get_user_move_sequences_prompt(sequences))
 
-            src, tar = extract_move_chosen_by_user(moves_dict)
-            if src == "q":
-                break
-            self.board.move_piece(src, tar)
+                sequence = extract_sequence_chosen_by_user(sequences, HISTORY_COMMANDS)
+                if sequence is None:
+                    break
+                if sequence == UNDO:
+                    self.undo_turn()
+                    continue
+                if sequence == REDO:
+                    self.redo_turn()
+                    continue
+            self.board.play_sequence(sequence)
+
+
+def parse_arguments(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Play checkers in the terminal.")
+    parser.add_argument(
+        "--ai", choices=[P.P1.name, P.P2.name], default=None,
+        help="let the AI play for this player"
+    )
+    parser.add_argument(
+        "--depth", type=int, default=DEFAULT_AI_DEPTH,
+        help="how many turns the AI looks ahead, deeper plays stronger but may take longer"
+    )
+    parser.add_argument(
+        "--time", type=float, default=DEFAULT_AI_MOVE_TIME,
+        help="seconds the AI may think per move"
+    )
+    parser.add_argument(
+        "--engine", choices=[ALPHA_BETA_ENGINE, MCTS_ENGINE], default=ALPHA_BETA_ENGINE,
+        help="search algorithm of the AI, alpha-beta search or Monte Carlo tree search"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="processes the AI searches in, use the number of cores to search with all of them"
+    )
+    parser.add_argument(
+        "--no-ponder", dest="ponder", action="store_false",
+        help="do not let the AI think while it is your turn"
+    )
+    parser.add_argument(
+        "--book", default=None,
+        help="opening book file the AI plays from before it starts searching"
+    )
+    parser.add_argument(
+        "--tablebase", default=None,
+        help="endgame tablebase file the AI plays perfectly from once few pieces are left"
+    )
+    parser.add_argument(
+        "--pdn", default=None,
+        help="PDN file every finished or quit game is added to"
+    )
+    return parser.parse_args(args)
 
 
 if __name__ == '__main__':
-    game = GamePlay()
+    arguments = parse_arguments()
+    book = OpeningBook.load(arguments.book) if arguments.book else None
+    tablebase = EndgameTablebase.load(arguments.tablebase) if arguments.tablebase else None
+    game = GamePlay(
+        arguments.ai, arguments.depth, arguments.time, book, tablebase, arguments.engine, arguments.workers,
+        arguments.ponder, arguments.pdn
+    )
     game.init_game()
     game.game_loop()
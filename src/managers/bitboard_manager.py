@@ -0,0 +1,410 @@
+from component.cell import Cell
+from component.game import P
+from component.piece import Piece
+from exceptions.cell_not_found_error import CellNotFoundError
+from exceptions.illegal_move_error import IllegalMoveError
+from managers.board_geometry import get_board_geometry, FORWARD_DIRECTIONS
+from managers.position_encoding_util import encode_piece_util
+from state.material_count import MaterialCount
+from state.move_record import MoveRecord
+from state.move_state import MoveState, CaptureMove
+from utils import index_offset
+
+
+def _shift(bits: int, shift: int) -> int:
+    return bits << shift if shift > 0 else bits >> -shift
+
+
+def _iterate_bits(bits: int):
+    """
+    Yield the index of every set bit, lowest first.
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class BitboardManager:
+    """
+    Position backend storing the playable cells as integer bitboards.
+
+    Each player's pieces and the kings are kept as one integer each, so a position costs three machine words
+    instead of a grid of Cell and Piece objects.
+    The manager exposes the parts of the CellManager interface used by the Board;
+    cells returned by it are detached views built from the bitboards.
+    """
+
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        self.geometry = get_board_geometry(rows, columns)
+        self._names = self.geometry.names
+        self._ids = self.geometry.square_ids
+        self.playable = (1 << len(self._names)) - 1
+        self.p1 = 0
+        self.p2 = 0
+        self.kings = 0
+
+    @property
+    def empty(self) -> int:
+        return self.playable & ~(self.p1 | self.p2)
+
+    @property
+    def board(self) -> list[list[Cell]]:
+        """
+        Materialize the bitboards into the CellManager board layout, e.g. for display.
+        """
+        board = [
+            [Cell(index_offset(y), index_offset(x)) for x in range(self.columns)]
+            for y in range(self.rows)
+        ]
+        for square, name in enumerate(self._names):
+            board[int(name[1]) - 1][int(name[2]) - 1].set_piece(self._piece_at(square))
+        return board
+
+    @property
+    def cell_map(self) -> dict[str, Cell]:
+        return {
+            cell.name: cell
+            for row in self.board
+            for cell in row
+            if cell.playable
+        }
+
+    @cell_map.setter
+    def cell_map(self, cell_map: dict[str, Cell]) -> None:
+        self.load_cell_map(cell_map)
+
+    def get_board(self) -> list[list[Cell]]:
+        return self.board
+
+    def get_cell_map(self) -> dict[str, Cell]:
+        return self.cell_map
+
+    def get_cell_map_copy(self) -> dict[str, Cell]:
+        return self.cell_map
+
+    def load_cell_map(self, cell_map: dict[str, Cell]) -> None:
+        """
+        Replace the bitboards with the pieces found in the given cell map.
+        """
+        self.p1 = self.p2 = self.kings = 0
+        for name, cell in cell_map.items():
+            if cell.has_piece() and name in self._ids:
+                self._put(self._ids[name], cell.get_piece_owner(), cell.is_king())
+
+    def get_square_id(self, name: str) -> int:
+        """
+        Get the bit index of a cell by its a_ij name.
+        """
+        square = self._ids.get(name) if isinstance(name, str) else None
+        if square is None:
+            raise CellNotFoundError(f"Cell {name} not found.")
+        return square
+
+    def get_square_name(self, square: int) -> str:
+        return self._names[square]
+
+    def get_cell_by_name(self, name: str) -> Cell:
+        """
+        Get a detached cell view by its a_ij name.
+
+        Changing the returned cell does not change the position, use set_piece_by_name instead.
+        """
+        square = self.get_square_id(name)
+        cell = Cell(int(name[1]), int(name[2]))
+        cell.set_piece(self._piece_at(square))
+        return cell
+
+    def get_cell_by_index(self, row: int, column: int) -> Cell:
+        name = f"a{index_offset(row)}{index_offset(column)}"
+        if name in self._ids:
+            return self.get_cell_by_name(name)
+        return Cell(index_offset(row), index_offset(column))
+
+    def is_king_at(self, name: str) -> bool:
+        return bool(self.kings >> self._ids[name] & 1)
+
+    def set_piece_by_index(self, row: int, column: int, piece: Piece | None) -> None:
+        """
+        Place piece on the cell provided by its indexes, non-playable cells are ignored.
+        """
+        name = f"a{index_offset(row)}{index_offset(column)}"
+        if name in self._ids:
+            self.set_piece_by_name(name, piece)
+
+    def set_piece_by_name(self, name: str, piece: Piece | None) -> None:
+        square = self.get_square_id(name)
+        self._clear(square)
+        if piece is not None:
+            self._put(square, piece.player, piece.is_king())
+
+    def get_player_cells(self, player: str) -> list[Cell]:
+        """
+        Get all cells owned by the given player
+        """
+        return [
+            self.get_cell_by_name(self._names[square])
+            for square in _iterate_bits(self._player_bits(player))
+        ]
+
+    def get_pieces(self) -> tuple[tuple[str, str, bool], ...]:
+        """
+        Get the (cell name, owner, is king) of every piece in square id order, read from the bitboards directly.
+        """
+        names, p1, kings = self._names, self.p1, self.kings
+        return tuple(
+            (names[square], P.P1.name if p1 >> square & 1 else P.P2.name, bool(kings >> square & 1))
+            for square in _iterate_bits(p1 | self.p2)
+        )
+
+    def encode_position(self) -> list[int]:
+        """
+        Encode the pieces of the playable cells in square id order, see encode_piece_util for the codes.
+        """
+        return [
+            encode_piece_util(self._owner(square), bool(self.kings >> square & 1))
+            for square in range(len(self._names))
+        ]
+
+    def count_material(self) -> dict[str, MaterialCount]:
+        """
+        Count the men and kings of both players.
+        """
+        material = {}
+        for player in (P.P1.name, P.P2.name):
+            pieces = self._player_bits(player)
+            kings = (pieces & self.kings).bit_count()
+            material[player] = MaterialCount(pieces.bit_count() - kings, kings)
+        return material
+
+    def generate_available_moves_for_player(
+            self, player: str, chained_name: str | None
+    ) -> list[MoveState]:
+        """
+        Generate moves for the player whose turn is to play.
+
+        Produces the same move states as CellManager, capture moves are mandatory.
+        """
+        movers = self._player_bits(player)
+        if chained_name:
+            movers &= 1 << self.get_square_id(chained_name)
+
+        found = self._generate_captures(player, movers) or self._generate_normal_moves(player, movers)
+
+        return [found[square] for square in sorted(found)]
+
+    def move_piece(
+            self, source_name: str, target_name: str
+    ) -> tuple[bool, str]:
+        """
+        Validate and execute a move, promoting the piece when it reaches the last row.
+
+        Returns:
+            tuple[bool, str]: Chain capture status and the name of the final destination cell.
+        """
+        source, target = self.get_square_id(source_name), self.get_square_id(target_name)
+        direction = self._validate_move(source, target)
+
+        player = self._owner(source)
+        captures = self._generate_captures(player, 1 << source)
+        if not self._player_bits(self._opponent(player)) >> target & 1:
+            if captures:
+                raise IllegalMoveError("Cannot make a normal move when capture is available")
+            self._relocate(source, target)
+            self._promote_if_last_row(target)
+            return False, target_name
+
+        dest_name = self._validate_capture(source, target, direction, captures)
+        dest = self._ids[dest_name]
+        self._clear(target)
+        self._relocate(source, dest)
+        has_chain_capture = bool(self._generate_captures(player, 1 << dest))
+        self._promote_if_last_row(dest)
+
+        return has_chain_capture, dest_name
+
+    def execute_move(
+            self, source_name: str, target_name: str
+    ) -> tuple[str, str | None, Piece | None, bool, bool]:
+        """
+        Execute a generated move in place without validating it.
+
+        Returns:
+            tuple: Final destination name, captured cell name and piece, promotion flag and chain capture flag.
+        """
+        ids = self._ids
+        source, target = ids[source_name], ids[target_name]
+        if not (self.p1 | self.p2) >> target & 1:
+            was_king = self.kings >> source & 1
+            self._relocate(source, target)
+            self._promote_if_last_row(target)
+            return target_name, None, None, not was_king and bool(self.kings >> target & 1), False
+
+        player = self._owner(source)
+        dest = self.geometry.neighbours[target][self.geometry.get_direction(source_name, target_name)]
+        captured_piece = self._piece_at(target)
+        was_king = self.kings >> source & 1
+        self._clear(target)
+        self._relocate(source, dest)
+        has_chain_capture = bool(self._generate_captures(player, 1 << dest))
+        self._promote_if_last_row(dest)
+        promoted = not was_king and bool(self.kings >> dest & 1)
+
+        return self._names[dest], target_name, captured_piece, promoted, has_chain_capture
+
+    def revert_move(self, record: MoveRecord) -> None:
+        """
+        Restore the position before the recorded move.
+        """
+        ids = self._ids
+        dest = ids[record.dest_name]
+        if record.promoted:
+            self.kings &= ~(1 << dest)
+        self._relocate(dest, ids[record.src_name])
+        if record.captured_name is not None:
+            captured = record.captured_piece
+            self._put(ids[record.captured_name], captured.player, captured.is_king())
+
+    def _generate_captures(self, player: str, movers: int) -> dict[int, MoveState]:
+        opponent = self._player_bits(self._opponent(player))
+        empty = self.empty
+        found = {}
+        neighbours = self.geometry.neighbours
+        for direction, masks in enumerate(self.geometry.jump_masks):
+            for mask, shift in masks:
+                landings = _shift(movers & self._movers_for(player, direction) & mask, shift) & empty
+                for land in _iterate_bits(landings):
+                    src = land - shift
+                    over = neighbours[src][direction]
+                    if opponent >> over & 1:
+                        self._add_move(found, src, over, land)
+        return found
+
+    def _generate_normal_moves(self, player: str, movers: int) -> dict[int, MoveState]:
+        empty = self.empty
+        found = {}
+        for direction, masks in enumerate(self.geometry.step_masks):
+            for mask, shift in masks:
+                targets = _shift(movers & self._movers_for(player, direction) & mask, shift) & empty
+                for target in _iterate_bits(targets):
+                    self._add_move(found, target - shift, target)
+        return found
+
+    def _add_move(
+            self, found: dict[int, MoveState], src: int, target: int, land: int | None = None
+    ) -> None:
+        """
+        Add a target to the move state of the source square, creating it on first use.
+        """
+        move = found.get(src)
+        if move is None:
+            move = found[src] = MoveState(self._names[src], [], land is not None, [] if land is not None else None)
+        move.target_names.append(self._names[target])
+        if land is not None:
+            move.capture_moves.append(CaptureMove(self._names[target], self._names[land]))
+
+    def _movers_for(self, player: str, direction: int) -> int:
+        """
+        Pieces of the player allowed to go in the given direction, normal pieces only go forward.
+        """
+        own = self._player_bits(player)
+        if direction in FORWARD_DIRECTIONS[player]:
+            return own
+        return own & self.kings
+
+    def _validate_move(self, source: int, target: int) -> int:
+        """
+        Validates the legality and in-game boundaries of a move, mirroring the cell based validators.
+
+        Returns:
+            int: The direction index of the move.
+        """
+        if source == target:
+            raise IllegalMoveError("Cannot move to the same cell")
+
+        direction = self.geometry.get_direction(self._names[source], self._names[target])
+        if direction is None:
+            raise IllegalMoveError("Non capture move is a single cell distance.")
+
+        source_owner, target_owner = self._owner(source), self._owner(target)
+        if source_owner == target_owner:
+            raise IllegalMoveError(f"Cannot capture same owner:{source_owner}")
+
+        if source_owner is None:
+            raise IllegalMoveError(f"Cell {self._names[source]} has no piece to move")
+
+        if not self.kings >> source & 1 and direction not in FORWARD_DIRECTIONS[source_owner]:
+            raise IllegalMoveError("Normal piece cannot move in opposite direction")
+
+        return direction
+
+    def _validate_capture(
+            self, source: int, target: int, direction: int, captures: dict[int, MoveState]
+    ) -> str:
+        """
+        Validate a capture attempt and return the name of the final destination cell.
+        """
+        land = self.geometry.neighbours[target][direction]
+        dest_name = self._names[land] if land is not None else None
+
+        if captures and CaptureMove(self._names[target], dest_name) not in captures[source].capture_moves:
+            raise IllegalMoveError("Cannot make a normal move when capture is available")
+        if land is None:
+            raise CellNotFoundError("Cannot capture if after target cell out of bounds")
+        if not self.empty >> land & 1:
+            raise IllegalMoveError("Cannot capture if destination cell is blocked")
+
+        return dest_name
+
+    def _promote_if_last_row(self, square: int) -> None:
+        """
+        Promote a piece to king if it reaches the last row for its player.
+        """
+        last_row = self.rows if self._owner(square) == P.P1.name else 1
+        if int(self._names[square][1]) == last_row:
+            self.kings |= 1 << square
+
+    def _relocate(self, source: int, target: int) -> None:
+        owner, is_king = self._owner(source), bool(self.kings >> source & 1)
+        self._clear(source)
+        self._put(target, owner, is_king)
+
+    def _put(self, square: int, owner: str, is_king: bool) -> None:
+        bit = 1 << square
+        if owner == P.P1.name:
+            self.p1 |= bit
+        else:
+            self.p2 |= bit
+        if is_king:
+            self.kings |= bit
+
+    def _clear(self, square: int) -> None:
+        mask = ~(1 << square)
+        self.p1 &= mask
+        self.p2 &= mask
+        self.kings &= mask
+
+    def _owner(self, square: int) -> str | None:
+        if self.p1 >> square & 1:
+            return P.P1.name
+        if self.p2 >> square & 1:
+            return P.P2.name
+        return None
+
+    def _piece_at(self, square: int) -> Piece | None:
+        owner = self._owner(square)
+        if owner is None:
+            return None
+        piece = Piece(owner)
+        if self.kings >> square & 1:
+            piece.set_king()
+        return piece
+
+    def _player_bits(self, player: str) -> int:
+        return self.p1 if player == P.P1.name else self.p2
+
+    @staticmethod
+    def _opponent(player: str) -> str:
+        return P.P2.name if player == P.P1.name else P.P1.name
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+from component.game import P
+from utils import index_offset, is_even
+
+# Diagonal directions as (row step, column step).
+# The order matches the order in which king targets are listed.
+DIRECTIONS = ((-1, 1), (-1, -1), (1, 1), (1, -1))
+ALL_DIRECTIONS = (0, 1, 2, 3)
+# p1 goes "up" the rows, p2 goes "down"
+FORWARD_DIRECTIONS = {
+    P.P1.name: (2, 3),
+    P.P2.name: (0, 1)
+}
+
+
+@dataclass(frozen=True)
+class BoardGeometry:
+    """
+    Precomputed diagonal relations between the playable cells of a board size.
+
+    Playable cells are numbered 0,...,n-1 row by row, starting from a11.
+    Every table is indexed by that square id and then by the direction index in DIRECTIONS,
+    holding the id of the related square or None when it falls off the board.
+    """
+    rows: int
+    columns: int
+    names: tuple[str, ...]
+    square_ids: dict[str, int]
+    coordinates: tuple[tuple[int, int], ...]
+    # the adjacent square in each direction, also the jumped-over square of a capture
+    neighbours: tuple[tuple[int | None, ...], ...]
+    # the square a capture lands on after jumping over the neighbour
+    landings: tuple[tuple[int | None, ...], ...]
+    # (source name, target name) -> direction index, for adjacent squares only
+    directions_by_names: dict[tuple[str, str], int]
+    # per direction, the (mask, shift) pairs moving a bitboard one step or one jump
+    step_masks: tuple[tuple[tuple[int, int], ...], ...]
+    jump_masks: tuple[tuple[tuple[int, int], ...], ...]
+
+    def get_neighbour_name(self, name: str, direction: int) -> str | None:
+        """
+        Get the name of the adjacent cell in the given direction.
+        """
+        neighbour = self.neighbours[self.square_ids[name]][direction]
+        return None if neighbour is None else self.names[neighbour]
+
+    def get_neighbour_names(self, name: str, directions: tuple[int, ...]) -> list[str]:
+        """
+        Get the names of the adjacent cells in the given directions which are on the board.
+        """
+        row = self.neighbours[self.square_ids[name]]
+        return [self.names[row[d]] for d in directions if row[d] is not None]
+
+    def get_direction(self, source_name: str, target_name: str) -> int | None:
+        """
+        Get the direction index from the source to an adjacent target, None if they are not adjacent.
+        """
+        return self.directions_by_names.get((source_name, target_name))
+
+    def is_on_board(self, name: str) -> bool:
+        return name in self.square_ids
+
+
+def get_direction_index(row_step: int, column_step: int) -> int:
+    return DIRECTIONS.index((row_step, column_step))
+
+
+def get_board_geometry(rows: int = 8, columns: int = 8) -> BoardGeometry:
+    """
+    Get the geometry tables of a board size, they are built once per size.
+    """
+    return _build_board_geometry(rows, columns)
+
+
+@lru_cache(maxsize=None)
+def _build_board_geometry(rows: int, columns: int) -> BoardGeometry:
+    coordinates = tuple(
+        (row, column)
+        for row in range(1, index_offset(rows))
+        for column in range(1, index_offset(columns))
+        if is_even(row, column)
+    )
+    names = tuple(f"a{row}{column}" for row, column in coordinates)
+    ids_by_coordinate = {coordinate: square for square, coordinate in enumerate(coordinates)}
+
+    neighbours = tuple(
+        tuple(ids_by_coordinate.get((row + dr, column + dc)) for dr, dc in DIRECTIONS)
+        for row, column in coordinates
+    )
+    landings = tuple(
+        tuple(ids_by_coordinate.get((row + 2 * dr, column + 2 * dc)) for dr, dc in DIRECTIONS)
+        for row, column in coordinates
+    )
+    directions_by_names = {
+        (names[square], names[neighbour]): direction
+        for square, row in enumerate(neighbours)
+        for direction, neighbour in enumerate(row)
+        if neighbour is not None
+    }
+
+    return BoardGeometry(
+        rows=rows,
+        columns=columns,
+        names=names,
+        square_ids={name: square for square, name in enumerate(names)},
+        coordinates=coordinates,
+        neighbours=neighbours,
+        landings=landings,
+        directions_by_names=directions_by_names,
+        step_masks=_group_shift_masks(neighbours),
+        jump_masks=_group_shift_masks(landings)
+    )
+
+
+def _group_shift_masks(table: tuple[tuple[int | None, ...], ...]) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """
+    Group the source squares of each direction by the id offset to their related square.
+
+    A step between rows shifts the square id by an amount depending on the row parity,
+    so each direction holds one (mask, shift) pair per distinct shift.
+    """
+    grouped = []
+    for direction in ALL_DIRECTIONS:
+        masks = {}
+        for square, row in enumerate(table):
+            if row[direction] is not None:
+                shift = row[direction] - square
+                masks[shift] = masks.get(shift, 0) | 1 << square
+        grouped.append(tuple((mask, shift) for shift, mask in masks.items()))
+    return tuple(grouped)
@@ -2,15 +2,19 @@ from copy import deepcopy
 from typing import List
 
 from component.cell import Cell
+from component.game import P
+from component.piece import Piece
 from exceptions.cell_not_found_error import CellNotFoundError
-from exceptions.illegal_move_error import IllegalMoveError
+from managers.board_geometry import get_board_geometry
 from managers.move_handle_util import get_destination_cell_name_after_capture
 from managers.move_manager import validate_move, enforce_mandatory_capture, \
     validate_capture_final_destination_is_in_bounds, validate_capture_final_destination_is_available, \
-    handle_mandatory_capture, manage_adding_moves_property_to_given_cells, validate_capture_move, generate_normal_moves, \
-    generate_king_moves, filter_invalid_moves
+    generate_cell_move_states
+from managers.position_encoding_util import encode_piece_util
+from state.material_count import MaterialCount
+from state.move_record import MoveRecord
 from state.move_state import MoveState
-from utils import index_offset, is_valid_cell_name, extract_index_from_cell, get_logger
+from utils import index_offset, get_logger
 
 logger = get_logger(name='cell_manager')
 
@@ -25,6 +29,8 @@ class CellManager:
         """
         self.rows = rows
         self.columns = columns
+        # diagonal neighbour tables shared by every manager of this board size
+        self.geometry = get_board_geometry(rows, columns)
         # The Cell names follow 8*8 matrix convention display a_ij, i,j=1,...,8
         #                  the +1 to start the values from 1 and not 0
         #                  [f"a{y + 1}{x + 1}" for x in range(rows)]
@@ -54,6 +60,18 @@ class CellManager:
     def get_cell_map(self) -> dict[str, Cell]:
         return self.cell_map
 
+    def set_piece_by_index(self, row: int, column: int, piece: Piece | None) -> None:
+        """
+        Place piece on the cell provided by its indexes.
+        """
+        self.get_cell_by_index(row, column).set_piece(piece)
+
+    def set_piece_by_name(self, name: str, piece: Piece | None) -> None:
+        """
+        Place piece on the cell provided by its a_ij name.
+        """
+        self.get_cell_by_name(name).set_piece(piece)
+
     # todo
     def get_cell_map_copy(self) -> dict[str, Cell]:
         return deepcopy(self.cell_map)
@@ -66,13 +84,15 @@ class CellManager:
         self._validate_cell_name(name)
         return self.cell_map[name]
 
+    def is_king_at(self, name: str) -> bool:
+        return self.cell_map[name].is_king()
+
     def _validate_cell_name(self, name: str) -> None:
         """
         Check that cell name is of the form: a_ij, i,j=1,...,8  (using an 8*8 board)
         E.g. a13 is on board, a03 is not.
         """
-        match = is_valid_cell_name(name)
-        if (not match) or (name not in self.cell_map):
+        if not isinstance(name, str) or name not in self.cell_map:
             raise CellNotFoundError(f"Cell {name} not found.")
 
     def validate_cell_move_logic(
@@ -80,7 +100,7 @@ class CellManager:
     ) -> tuple[Cell, Cell]:
         source_cell = self.get_cell_by_name(source_name)
         target_cell = self.get_cell_by_name(target_name)
-        validate_move(source_cell, target_cell)
+        validate_move(self.geometry, source_cell, target_cell)
 
         return source_cell, target_cell
 
@@ -90,18 +110,69 @@ class CellManager:
         move_dto = move_list[0]
         has_capture_moves = move_dto.is_capture_move
         # Raise error if there are capture moves but a normal move is attempted
-        dest_cell_name = get_destination_cell_name_after_capture(source_cell, target_cell)
+        dest_cell_name = get_destination_cell_name_after_capture(self.geometry, source_cell, target_cell)
         enforce_mandatory_capture(dest_cell_name, has_capture_moves, move_dto, target_cell)
 
     def begin_capture_attempt(self, cell_dest_name: str, source_cell: Cell, target_cell: Cell):
         # Validate cell is on board
-        validate_capture_final_destination_is_in_bounds(cell_dest_name)
+        validate_capture_final_destination_is_in_bounds(self.geometry, cell_dest_name)
         dest_cell = self.get_cell_by_name(cell_dest_name)
         validate_capture_final_destination_is_available(dest_cell.get_piece())
 
         # execute capture
         self.execute_capture(source_cell, target_cell, dest_cell)
 
+    def execute_move(
+            self, source_name: str, target_name: str
+    ) -> tuple[str, str | None, Piece | None, bool, bool]:
+        """
+        Execute a generated move in place without validating it.
+
+        Moves the piece, removes a captured piece and promotes on the last row.
+
+        Returns:
+            tuple: Final destination name, captured cell name and piece, promotion flag and chain capture flag.
+        """
+        cell_map = self.cell_map
+        source_cell, target_cell = cell_map[source_name], cell_map[target_name]
+        piece = source_cell.piece
+        captured_name = captured_piece = None
+
+        if target_cell.piece is not None:
+            captured_name, captured_piece = target_name, target_cell.piece
+            dest_cell = cell_map[get_destination_cell_name_after_capture(self.geometry, source_cell, target_cell)]
+            target_cell.remove_piece_reference()
+        else:
+            dest_cell = target_cell
+
+        dest_cell.set_piece(piece)
+        source_cell.remove_piece_reference()
+
+        has_chain_capture = captured_piece is not None and self.handle_chain_capture(dest_cell.name)
+        promoted = not piece.is_king() and self._is_promotion_row(piece.player, dest_cell.row)
+        if promoted:
+            piece.set_king()
+
+        return dest_cell.name, captured_name, captured_piece, promoted, has_chain_capture
+
+    def revert_move(self, record: MoveRecord) -> None:
+        """
+        Restore the position before the recorded move.
+        """
+        cell_map = self.cell_map
+        dest_cell = cell_map[record.dest_name]
+        piece = dest_cell.piece
+        if record.promoted:
+            piece.remove_king()
+
+        dest_cell.remove_piece_reference()
+        cell_map[record.src_name].set_piece(piece)
+        if record.captured_name is not None:
+            cell_map[record.captured_name].set_piece(record.captured_piece)
+
+    def _is_promotion_row(self, player: str, row: int) -> bool:
+        return row == (self.rows if player == P.P1.name else 1)
+
     # todo, move?
     @staticmethod
     def execute_capture(source_cell: Cell, target_cell: Cell, dest_cell: Cell
@@ -118,115 +189,20 @@ class CellManager:
         target_cell.remove_piece()
 
     def _get_valid_move_directions_for_cell(self, cell: Cell) -> list[MoveState]:
-
         """
         Get valid moves for the piece on given cell under the game rules.
         """
-        owner = cell.get_piece_owner()
-        row_source, col_src = extract_index_from_cell(cell)
-        is_king = cell.is_king()
-
-        if is_king:
-            possible_moves = generate_king_moves(col_src, row_source)
-        else:
-            # p1 goes up, p2 goes "down"
-            possible_moves = generate_normal_moves(col_src, owner, row_source)
-
-        return self.handle_adding_valid_moves(cell.name, possible_moves)
-
-    def handle_adding_valid_moves(
-            self, name_src: str, possible_moves: List[tuple[int, int]]
-    ) -> list[MoveState]:
-        """
-        Filter and return valid moves.
-        """
-
-        # the filtered cell list to be added
-        cells = handle_mandatory_capture(
-            self._get_valid_cells(name_src, possible_moves),
-            self.get_cell_map()
-        )
-        filtered_moves = filter_invalid_moves(cells)
-
-        return manage_adding_moves_property_to_given_cells(filtered_moves)
-
-    def _get_valid_cells(
-            self, name_src: str, possible_moves: List[tuple[int, int]]
-    ) -> list[tuple[Cell, Cell]]:
-        """
-        Generate a list of moves which are in the board's boundaries.
-        """
-        cells = []
-        for row, col in possible_moves:
-            name_target = f"a{row}{col}"
-            try:
-                cell_pair = self.validate_cell_source_and_target_names(name_src, name_target)
-                if cell_pair[0] is not None and cell_pair[1]:
-                    cells.append(cell_pair)
-            except(IllegalMoveError, CellNotFoundError) as e:
-                # todo
-                # Optional, suppressed logging
-                #  logger.error(f"Invalid move: {e}")
-                continue
-        return cells
-
-    def validate_cell_source_and_target_names(self, name_src: str, name_target: str) -> tuple[Cell, Cell]:
-        """
-        Check the source and target cells are not out of bounds.
-        """
-        cell_src = self.get_cell_by_name(name_src)
-        cell_target = self.get_cell_by_name(name_target)
-        return cell_src, cell_target
+        return generate_cell_move_states(self.geometry, self.cell_map, cell)
 
     def handle_chain_capture(self, final_dest_name: str) -> bool:
         """
         Check whether a capture move will lead to more captures.
         """
-        cell_final_dest = self.get_cell_by_name(final_dest_name)
-        chain_moves = self._get_valid_move_directions_for_cell(cell_final_dest)
-        has_valid_chain_capture = False
-        for move in chain_moves:
-            # Check if any move is a valid chain capture
-            has_valid_chain_capture = self.check_chain_possible_moves(move) or has_valid_chain_capture
-
-        return has_valid_chain_capture
-
-    # todo clean
-    def check_chain_possible_moves(self, move: MoveState) -> bool:
-
-        has_valid_chain_capture = False
-        for target in move.target_names:
-            target_cell = self.get_cell_by_name(target)
-
-            try:
-                has_valid_chain_capture = self.validate_chain(move, target_cell)
-
-                break
-            # todo optional error message?
-            except IllegalMoveError as e:
-                # logger.error(f"Invalid move: {e}")
-                continue
-            except CellNotFoundError as e:
-                # logger.error(f"Invalid move: {e}")
-                continue
-
-        return has_valid_chain_capture
-
-    def validate_chain(self, move: MoveState, target_cell: Cell) -> bool:
-        # Get the final destination cell after capture
-        destination_cell_name = get_destination_cell_name_after_capture(
-            self.get_cell_by_name(move.src_name), target_cell
+        return any(
+            move.is_capture_move
+            for move in self._get_valid_move_directions_for_cell(self.cell_map[final_dest_name])
         )
 
-        destination_cell = self.get_cell_by_name(destination_cell_name)
-
-        # Validate the final destination (not the target) for capture
-        destination_piece = destination_cell.get_piece()
-        validate_capture_move(destination_cell, destination_piece)
-
-        # After finding a valid capture, break the loop
-        return move.is_capture()
-
     # todo
     #   check if chain, if chain remove all
     #   maybe pass if chain from game > board > cell man?
@@ -268,6 +244,52 @@ class CellManager:
 
         return player_cells
 
+    def get_pieces(self) -> tuple[tuple[str, str, bool], ...]:
+        """
+        Get the (cell name, owner, is king) of every piece in square id order.
+        """
+        cell_map = self.cell_map
+        return tuple(
+            (name, cell.get_piece_owner(), cell.is_king())
+            for name, cell in ((name, cell_map[name]) for name in self.geometry.names)
+            if cell.has_piece()
+        )
+
+    def encode_position(self) -> list[int]:
+        """
+        Encode the pieces of the playable cells in square id order, see encode_piece_util for the codes.
+        """
+        cell_map = self.cell_map
+        return [
+            encode_piece_util(cell.get_piece_owner(), cell.is_king())
+            for cell in (cell_map[name] for name in self.geometry.names)
+        ]
+
+    def count_material(self) -> dict[str, MaterialCount]:
+        """
+        Count the men and kings of both players.
+        """
+        return self.count_material_from_copy(self.get_cell_map())
+
+    @staticmethod
+    def count_material_from_copy(
+            cell_map: dict[str, Cell]
+    ) -> dict[str, MaterialCount]:
+        """
+        Count the men and kings of both players in a single pass over the cells.
+        """
+        material = {P.P1.name: MaterialCount(), P.P2.name: MaterialCount()}
+        for cell in cell_map.values():
+            piece = cell.piece
+            if piece is None:
+                continue
+            if piece.is_king():
+                material[piece.player].kings += 1
+            else:
+                material[piece.player].men += 1
+
+        return material
+
     def _generate_player_move_states(
             self, player_cells: List[Cell], chained_name: str | None
     ) -> List[MoveState]:
@@ -279,11 +301,15 @@ class CellManager:
         if chained_name:
             return self.get_chained_cell_moves(chained_name)
 
-        # First Pass:
-        has_capture_moves = self._check_cells_for_capture_moves(player_cells)
-
-        # second pass
-        return self._generate_filtered_moves(has_capture_moves, player_cells)
+        # capture moves are mandatory, normal moves only count when no piece can capture
+        moves = [
+            move
+            for cell in player_cells
+            for move in self._get_valid_move_directions_for_cell(cell)
+        ]
+        if any(move.is_capture_move for move in moves):
+            return [move for move in moves if move.is_capture_move]
+        return moves
 
     def get_chained_cell_moves(self, chained_name: str) -> list[MoveState]:
         """
@@ -292,27 +318,3 @@ class CellManager:
         return self._get_valid_move_directions_for_cell(
             self.get_cell_by_name(chained_name)
         )
-
-    def _check_cells_for_capture_moves(
-            self, cells: List[Cell]
-    ) -> bool:
-        """
-        Check if any of the available moves are capture moves.
-        """
-        # todo check for final dest in bounds
-        return any(
-            move.is_capture_move  # condition
-            for cell in cells  # outer loop
-            for move in self._get_valid_move_directions_for_cell(cell)  # inner loop
-        )
-
-    def _generate_filtered_moves(self, has_capture_moves: bool, player_cells: list[Cell]):
-        """
-        Generate a list of valid moves for the player's pieces, filtered based on capture availability.
-        """
-        return [
-            move  # Add the move to the list if conditions are met
-            for cell in player_cells  # Iterate over each player's cell
-            for move in self._get_valid_move_directions_for_cell(cell)  # Get valid moves for the cell
-            if (has_capture_moves and move.is_capture_move) or not has_capture_moves  # Conditional inclusion
-        ]
@@ -0,0 +1,87 @@
+import random
+from functools import lru_cache
+from typing import Iterable
+
+from component.game import P
+from managers.board_geometry import get_board_geometry
+
+# Fixed seed so keys, and anything stored by key, stay the same between runs
+ZOBRIST_SEED = 2024
+
+
+class HashManager:
+    """
+    Zobrist keys for hashing board states.
+
+    Every (cell, owner, king) combination, the player to move and the chaining cell get a random 64-bit key.
+    The hash of a state is the XOR of the keys of its parts, so a move updates it by XOR-ing
+    only the keys of the parts it changed.
+    """
+
+    def __init__(self, rows: int = 8, columns: int = 8, seed: int = ZOBRIST_SEED):
+        rng = random.Random(seed)
+        names = get_board_geometry(rows, columns).names
+        # per cell: p1 piece, p1 king, p2 piece, p2 king
+        self.piece_keys = {
+            name: tuple(rng.getrandbits(64) for _ in range(4))
+            for name in names
+        }
+        self.player_two_key = rng.getrandbits(64)
+        self.chain_keys = {name: rng.getrandbits(64) for name in names}
+
+    def piece_key(self, name: str, owner: str, is_king: bool) -> int:
+        return self.piece_keys[name][(2 if owner == P.P2.name else 0) + is_king]
+
+    def player_key(self, player: str) -> int:
+        """
+        Key of the player to move, player one's turn is the key 0.
+        """
+        return self.player_two_key if player == P.P2.name else 0
+
+    def chain_key(self, name: str | None) -> int:
+        return self.chain_keys[name] if name else 0
+
+    def compute_hash(self, cell_map: dict, player: str, chaining_cell_name: str | None) -> int:
+        """
+        Compute the hash of a state from scratch.
+        """
+        return self.compute_hash_from_pieces(
+            (
+                (name, cell.get_piece_owner(), cell.is_king())
+                for name, cell in cell_map.items()
+                if cell.has_piece()
+            ),
+            player, chaining_cell_name
+        )
+
+    def compute_hash_from_pieces(
+            self, pieces: Iterable[tuple[str, str, bool]], player: str, chaining_cell_name: str | None
+    ) -> int:
+        """
+        Compute the hash of a state given as the (cell name, owner, is king) of its pieces.
+        """
+        key = self.player_key(player) ^ self.chain_key(chaining_cell_name)
+        for name, owner, is_king in pieces:
+            key ^= self.piece_key(name, owner, is_king)
+        return key
+
+    def move_key(
+            self, owner: str, src_name: str, dest_name: str, was_king: bool, is_king: bool,
+            captured_name: str | None = None, captured_is_king: bool = False
+    ) -> int:
+        """
+        The XOR difference made by moving a piece, optionally capturing one.
+        """
+        key = self.piece_key(src_name, owner, was_king) ^ self.piece_key(dest_name, owner, is_king)
+        if captured_name is not None:
+            opponent = P.P1.name if owner == P.P2.name else P.P2.name
+            key ^= self.piece_key(captured_name, opponent, captured_is_king)
+        return key
+
+
+@lru_cache(maxsize=None)
+def get_hash_manager(rows: int = 8, columns: int = 8) -> HashManager:
+    """
+    Get the shared Zobrist keys of a board size.
+    """
+    return HashManager(rows, columns)
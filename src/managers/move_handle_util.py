@@ -1,24 +1,26 @@
 from component.cell import Cell
 from component.game import P
 from exceptions.illegal_move_error import IllegalMoveError
+from managers.board_geometry import BoardGeometry, get_direction_index
 from utils import extract_index_from_cell
 
 
 def get_destination_cell_name_after_capture(
-        source_cell: Cell, target_cell: Cell
-) -> str:
+        geometry: BoardGeometry, source_cell: Cell, target_cell: Cell
+) -> str | None:
     """
     Utility function for getting the final destination cell name after a capture.
 
     Handles normal and king movement.
+    The destination is looked up in the geometry of the board played on, None when it is out of bounds.
     """
     row_src, col_src = extract_index_from_cell(source_cell)
     row_trg, col_trg = extract_index_from_cell(target_cell)
 
-    row_dest = _get_row_direction_for_capture(source_cell, row_src, row_trg)
-    col_dest = col_trg + 1 if col_trg > col_src else col_trg - 1
+    row_step = _get_row_direction_for_capture(source_cell, row_src, row_trg)
+    col_step = 1 if col_trg > col_src else -1
 
-    return f"a{row_dest}{col_dest}"
+    return geometry.get_neighbour_name(target_cell.name, get_direction_index(row_step, col_step))
 
 
 def _get_row_direction_for_capture(
@@ -28,16 +30,16 @@ def _get_row_direction_for_capture(
     Get relative direction of the destination cell after capture.
     """
     if source_cell.is_king():
-        # For a king, move two steps in the direction of the target
-        return target_row + (target_row - source_row)
+        # For a king, keep going in the direction of the target
+        return 1 if target_row > source_row else -1
 
     row_direction_by_player = {
-        P.P1.name: lambda row: row + 1,  # Player 1 moves down
-        P.P2.name: lambda row: row - 1  # Player 2 moves up
+        P.P1.name: 1,  # Player 1 moves down
+        P.P2.name: -1  # Player 2 moves up
     }
 
-    # the destination row
-    return row_direction_by_player[source_cell.get_piece_owner()](target_row)
+    # the destination row direction
+    return row_direction_by_player[source_cell.get_piece_owner()]
 
 
 def mandatory_capture_util(has_capture_moves, target_cell, dest_cell_name, move_dto):
@@ -0,0 +1,332 @@
+import re
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
+
+from board import Board
+from component.game import P
+from exceptions.pdn_error import PDNError
+from managers.board_geometry import get_board_geometry
+from state.move_sequence import MoveSequence
+from state.pdn_game import PDNGame, PDNMove, BLACK_WINS, WHITE_WINS, DRAW, UNFINISHED
+from state.position_snapshot import PositionSnapshot
+
+# PDN numbers the 32 playable squares from 1 to 32 starting at the far corner of the second player,
+# black is the first player and starts on squares 1 to 12, white on 21 to 32
+SQUARE_NAMES: tuple[str, ...] = tuple(
+    sorted(get_board_geometry(8, 8).names, key=lambda name: (int(name[1]), -int(name[2:])))
+)
+SQUARE_NUMBERS: dict[str, int] = {name: number for number, name in enumerate(SQUARE_NAMES, start=1)}
+COLOURS = {P.P1.name: "B", P.P2.name: "W"}
+PLAYERS = {colour: player for player, colour in COLOURS.items()}
+INITIAL_FEN = "B:W21-32:B1-12"
+
+# Tags written first and in this order, the seven tag roster
+TAG_ORDER = ("Event", "Site", "Date", "Round", "Black", "White", "Result")
+# Results as written by PDN files of other draughts variants, read as their 8x8 counterparts
+RESULTS = {
+    BLACK_WINS: BLACK_WINS, WHITE_WINS: WHITE_WINS, DRAW: DRAW, UNFINISHED: UNFINISHED,
+    "2-0": BLACK_WINS, "0-2": WHITE_WINS, "1-1": DRAW,
+}
+# Longest line of written move text
+LINE_WIDTH = 79
+
+_TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*]')
+_END = r"(?=[\s{}();]|$)"
+# every word of move text by its kind: a comment, possibly running on over the next lines, a rest of line comment,
+# a variation bracket, a result, a move with its number and glyphs, a move number, glyph or ellipsis, anything else
+_TOKEN = re.compile(rf"""
+    (?P<comment>{{[^}}]*}}?) | (?P<rest>;.*) | (?P<open>\() | (?P<close>\)) |
+    (?P<result>(?:1/2-1/2|[12]-0|0-[12]|1-1|\*){_END}) |
+    (?:\d+\.+)?(?P<move>\d+(?:[-x:]\d+)+)[!?]*{_END} |
+    (?P<skipped>(?:\d+\.+|\.+|\$\d+|[!?]+){_END}) |
+    (?P<other>[^\s{{}}();]+)
+""", re.VERBOSE)
+# lines without comments or variations are split into words, which are read once each
+_BRACKETS = re.compile(r"[{}();]")
+_MOVE = re.compile(r"(?:\d+\.+)?(\d+(?:[-x:]\d+)+)[!?]*")
+
+
+def square_name(number: int) -> str:
+    """
+    Get the cell name of a PDN square number, e.g. "a17" for square 1.
+    """
+    if not 1 <= number <= len(SQUARE_NAMES):
+        raise PDNError(f"Square {number} is not on the board")
+    return SQUARE_NAMES[number - 1]
+
+
+def square_number(name: str) -> int:
+    """
+    Get the PDN square number of a cell name, e.g. 1 for "a17".
+    """
+    if name not in SQUARE_NUMBERS:
+        raise PDNError(f"Cell {name} has no PDN square number")
+    return SQUARE_NUMBERS[name]
+
+
+def parse_move(text: str) -> PDNMove:
+    """
+    Read a move like "11-15", "15x24" or "15x24x31", an annotation or move number in front of it is ignored.
+    """
+    match = _MOVE.fullmatch(text)
+    if match is None:
+        raise PDNError(f"Cannot read move {text}")
+    return _parse_squares(match.group(1))
+
+
+@lru_cache(maxsize=4096)
+def _parse_squares(squares: str) -> PDNMove:
+    # collections repeat the same few thousand moves, so each is read once and its frozen move shared
+    return PDNMove(tuple(map(int, re.split("[-x:]", squares))), "-" not in squares)
+
+
+def to_pdn_move(sequence: MoveSequence) -> PDNMove:
+    """
+    Write a move with every landing square, so a chain capture is never ambiguous.
+    """
+    squares = (square_number(sequence.src_name),) + tuple(square_number(name) for name in sequence.landing_names)
+    return PDNMove(squares, sequence.is_capture)
+
+
+def resolve_move(board: Board, move: PDNMove) -> MoveSequence:
+    """
+    Find the legal move of the board the PDN move stands for.
+
+    A move giving only its first and last square matches every move between them,
+    so it is ambiguous when two chain captures of the piece end on the same square.
+    """
+    path = tuple(square_name(square) for square in move.squares)
+    candidates = [
+        sequence for sequence in board.get_move_sequences()
+        if (sequence.src_name, sequence.dest_name) == (path[0], path[-1])
+        and (len(path) == 2 or (sequence.src_name,) + sequence.landing_names == path)
+    ]
+    if not candidates:
+        raise PDNError(f"Illegal move {move}")
+    if len(candidates) > 1:
+        raise PDNError(f"Ambiguous move {move}, write every square it lands on")
+    return candidates[0]
+
+
+def _parse_fen_squares(text: str) -> Iterator[tuple[int, bool]]:
+    for item in filter(None, text.split(",")):
+        is_king = item.startswith("K")
+        first, _, last = item.removeprefix("K").partition("-")
+        try:
+            numbers = range(int(first), int(last or first) + 1)
+        except ValueError:
+            raise PDNError(f"Cannot read square {item} of FEN")
+        for number in numbers:
+            yield number, is_king
+
+
+def parse_fen(fen: str) -> PositionSnapshot:
+    """
+    Read a position like "W:W18,24,K27:B12,16,20" into a snapshot: the player to move, then the squares of both
+    colours, K marking a king. Ranges like "1-12" stand for every square between.
+    """
+    turn, *colours = fen.strip().strip('"').rstrip(".").split(":")
+    if turn.strip() not in PLAYERS:
+        raise PDNError(f"Cannot read player to move {turn} of FEN")
+    pieces = {}
+    for text in colours:
+        text = text.strip()
+        if not text or text[0] not in PLAYERS:
+            raise PDNError(f"Cannot read pieces {text} of FEN")
+        for number, is_king in _parse_fen_squares(text[1:].replace(" ", "")):
+            pieces[square_name(number)] = (PLAYERS[text[0]], is_king)
+    return PositionSnapshot(
+        8, 8, tuple((name, owner, is_king) for name, (owner, is_king) in pieces.items()), PLAYERS[turn.strip()]
+    )
+
+
+def to_fen(snapshot: PositionSnapshot) -> str:
+    """
+    Write the position of a snapshot as FEN, the squares of each colour in order.
+    """
+    if (snapshot.rows, snapshot.columns) != (8, 8):
+        raise PDNError(f"PDN has no square numbers for a {snapshot.rows}x{snapshot.columns} board")
+    fields = [COLOURS[snapshot.current_player]]
+    for owner in (P.P2.name, P.P1.name):
+        squares = sorted(
+            (square_number(name), is_king) for name, piece_owner, is_king in snapshot.pieces if piece_owner == owner
+        )
+        fields.append(COLOURS[owner] + ",".join(f"{'K' if is_king else ''}{number}" for number, is_king in squares))
+    return ":".join(fields)
+
+
+def start_position(game: PDNGame) -> PositionSnapshot:
+    return parse_fen(game.tags.get("FEN", INITIAL_FEN))
+
+
+def replay_pdn_game(board: Board, game: PDNGame) -> list[MoveSequence]:
+    """
+    Play the moves of a PDN game from its start position on the board, which is left at the last position.
+    """
+    board.load_position_snapshot(start_position(game))
+    sequences = []
+    for move in game.moves:
+        sequence = resolve_move(board, move)
+        board.make_sequence(sequence)
+        sequences.append(sequence)
+    return sequences
+
+
+def pdn_result(winner: Optional[str], is_over: bool = True) -> str:
+    """
+    Result of a game won by the player, None for a draw, or unfinished when the game is not over.
+    """
+    if not is_over:
+        return UNFINISHED
+    if winner is None:
+        return DRAW
+    return BLACK_WINS if winner == P.P1.name else WHITE_WINS
+
+
+def to_pdn_game(
+        sequences: Iterable[MoveSequence], result: str = UNFINISHED, tags: Optional[dict[str, str]] = None,
+        start: Optional[PositionSnapshot] = None
+) -> PDNGame:
+    """
+    Record the moves played from the start position, the FEN tag is added when it is not the initial setup.
+    """
+    tags = dict(tags or {})
+    if start is not None:
+        fen = to_fen(start)
+        if fen != to_fen(parse_fen(INITIAL_FEN)):
+            tags["FEN"] = fen
+    return PDNGame(tags, [to_pdn_move(sequence) for sequence in sequences], result)
+
+
+@lru_cache(maxsize=65536)
+def _read_word(word: str) -> tuple[str, str]:
+    token = _TOKEN.fullmatch(word)
+    return token.lastgroup, token.group(token.lastgroup)
+
+
+def iter_pdn_games(lines: Iterable[str]) -> Iterator[PDNGame]:
+    """
+    Read PDN games one at a time from an iterable of lines, like an open file.
+
+    Only the game being read is held in memory, so collections of any size can be read.
+    Comments, variations, move numbers and glyphs are skipped. A game ends with its result,
+    or when the tags of the next game or the end of the lines follow its moves. A game without moves ends
+    when the next tags come after a blank line or repeat one of its tags.
+    """
+    game = PDNGame()
+    in_comment = False
+    variation_depth = 0
+    # a blank line since the last tags, so tags that follow start the next game
+    after_gap = False
+    for line_number, line in enumerate(lines, start=1):
+        if in_comment:
+            end = line.find("}")
+            if end < 0:
+                continue
+            line = line[end + 1:]
+            in_comment = False
+        stripped = line.strip()
+        if not stripped:
+            after_gap = bool(game.tags)
+            continue
+        if stripped.startswith("%"):
+            continue
+
+        if stripped.startswith("[") and variation_depth == 0:
+            tags = list(_TAG.finditer(stripped))
+            if game.moves or (game.tags and (after_gap or any(tag.group(1) in game.tags for tag in tags))):
+                game.result = RESULTS.get(game.tags.get("Result"), UNFINISHED)
+                yield game
+                game = PDNGame()
+            after_gap = False
+            for tag in tags:
+                game.tags[tag.group(1)] = tag.group(2)
+            # move text may follow the tags on the same line
+            stripped = stripped[tags[-1].end():].strip() if tags else ""
+            if not stripped:
+                continue
+
+        if _BRACKETS.search(stripped) is None:
+            tokens = map(_read_word, stripped.split())
+        else:
+            tokens = ((token.lastgroup, token.group(token.lastgroup)) for token in _TOKEN.finditer(stripped))
+        for kind, text in tokens:
+            if kind == "move":
+                if not variation_depth:
+                    game.moves.append(_parse_squares(text))
+            elif kind == "comment":
+                in_comment = not text.endswith("}")
+            elif kind == "rest":
+                break
+            elif kind == "open":
+                variation_depth += 1
+            elif kind == "close":
+                variation_depth = max(0, variation_depth - 1)
+            elif variation_depth or kind == "skipped":
+                continue
+            elif kind == "result":
+                game.result = RESULTS[text]
+                yield game
+                game = PDNGame()
+            else:
+                raise PDNError(f"Cannot read {text} on line {line_number}")
+
+    if game.moves or game.tags:
+        game.result = RESULTS.get(game.tags.get("Result"), UNFINISHED)
+        yield game
+
+
+def read_pdn(path: str) -> Iterator[PDNGame]:
+    """
+    Read the games of a PDN file one at a time, the file is open until the last game is read.
+    """
+    with open(path, encoding="utf-8", errors="replace") as file:
+        yield from iter_pdn_games(file)
+
+
+def _format_tag(name: str, value: str) -> str:
+    value = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'[{name} "{value}"]'
+
+
+def format_pdn_game(game: PDNGame) -> str:
+    """
+    Write a game as PDN: its tags, the seven tag roster first, then its numbered moves and its result.
+    """
+    tags = {**game.tags, "Result": game.result}
+    names = [name for name in TAG_ORDER if name in tags] + [name for name in tags if name not in TAG_ORDER]
+    lines = [_format_tag(name, tags[name]) for name in names]
+
+    # numbers count full turns, a game where white moves first starts with an ellipsis,
+    # a number stays on the line of its move
+    offset = 1 if PLAYERS.get(tags.get("FEN", "B").strip()[:1]) == P.P2.name else 0
+    words = []
+    for index, move in enumerate(game.moves, start=offset):
+        if index % 2 == 0:
+            words.append(f"{index // 2 + 1}. {move}")
+        elif index == offset:
+            words.append(f"1... {move}")
+        else:
+            words.append(str(move))
+    words.append(game.result)
+
+    line = ""
+    for word in words:
+        if line and len(line) + 1 + len(word) > LINE_WIDTH:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def write_pdn(path: str, games: Iterable[PDNGame], append: bool = False) -> None:
+    """
+    Write the games to a PDN file one at a time, a blank line between two games.
+    """
+    with open(path, "a" if append else "w", encoding="utf-8") as file:
+        for game in games:
+            if file.tell() > 0:
+                file.write("\n")
+            file.write(format_pdn_game(game))
@@ -0,0 +1,16 @@
+from component.game import P
+
+# Codes of an encoded cell, the pieces of the second player are negative
+EMPTY_CODE = 0
+MAN_CODE = 1
+KING_CODE = 2
+
+
+def encode_piece_util(owner: str | None, is_king: bool) -> int:
+    """
+    Encode the piece of a cell as a small integer, e.g. -2 for a king of p2.
+    """
+    if owner is None:
+        return EMPTY_CODE
+    code = KING_CODE if is_king else MAN_CODE
+    return code if owner == P.P1.name else -code
@@ -0,0 +1,36 @@
+import argparse
+import time
+
+from ai.game_store import GameStoreWriter
+from board import Board
+from component.game import P
+from managers.pdn_util import read_pdn, replay_pdn_game, start_position
+from state.pdn_game import BLACK_WINS, WHITE_WINS, UNFINISHED
+
+# Winner of a game by its PDN result, a draw has none
+WINNERS = {BLACK_WINS: P.P1.name, WHITE_WINS: P.P2.name}
+
+
+def parse_arguments(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert a PDN collection into a binary game store.")
+    parser.add_argument("input", help="PDN file to read, it is read one game at a time")
+    parser.add_argument("output", help="game store file to write")
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> None:
+    arguments = parse_arguments(args)
+    board = Board(use_bitboard=True)
+
+    start = time.perf_counter()
+    with GameStoreWriter(arguments.output) as store:
+        for game in read_pdn(arguments.input):
+            moves = replay_pdn_game(board, game)
+            position = start_position(game) if "FEN" in game.tags else None
+            store.add(moves, WINNERS.get(game.result), game.result != UNFINISHED, position)
+        count = len(store)
+    print(f"{count} games written to {arguments.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import time
+from dataclasses import dataclass
+
+from board import Board
+from state.move_sequence import MoveSequence
+
+# Leaf counts of 8x8 checkers from the initial setup, for depths 1, 2, ...
+# A chain capture counts as one move, the same as in the published tables.
+REFERENCE_COUNTS = (7, 49, 302, 1469, 7361, 36768, 179740, 845931)
+
+
+@dataclass
+class PerftResult:
+    depth: int
+    nodes: int
+    seconds: float
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def expected(self) -> int | None:
+        """
+        Reference count of the depth, only valid for searches from the initial setup.
+        """
+        if 1 <= self.depth <= len(REFERENCE_COUNTS):
+            return REFERENCE_COUNTS[self.depth - 1]
+        return None
+
+
+def perft(board: Board, depth: int) -> int:
+    """
+    Count the positions reached after playing every legal move sequence of the given number of turns.
+
+    A chain capture with all its hops is a single move. The board is left as it was found.
+    """
+    if depth <= 0:
+        return 1
+
+    moves = board.get_move_sequences()
+    # the leaves do not need to be played to be counted
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        records = board.make_sequence(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_sequence(records)
+    return nodes
+
+
+def divide(board: Board, depth: int) -> dict[MoveSequence, int]:
+    """
+    Perft count below each first move, to find which move a wrong count comes from.
+    """
+    counts = {}
+    for move in board.get_move_sequences():
+        records = board.make_sequence(move)
+        counts[move] = perft(board, depth - 1)
+        board.unmake_sequence(records)
+    return counts
+
+
+def run_perft(board: Board, depth: int) -> PerftResult:
+    start = time.perf_counter()
+    nodes = perft(board, depth)
+    return PerftResult(depth, nodes, time.perf_counter() - start)
+
+
+def parse_arguments(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Count move generation leaf nodes from the initial setup.")
+    parser.add_argument("--depth", type=int, default=6, help="deepest depth to count")
+    parser.add_argument("--divide", action="store_true", help="show the count below each first move")
+    parser.add_argument("--bitboard", action="store_true", help="use the bitboard backend")
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> bool:
+    """
+    Print the counts and speed of every depth up to the given one.
+
+    Returns:
+        bool: Whether every count matched its reference count.
+    """
+    arguments = parse_arguments(args)
+    board = Board(use_bitboard=arguments.bitboard)
+    board.initial_setup()
+
+    is_correct = True
+    for depth in range(1, arguments.depth + 1):
+        result = run_perft(board, depth)
+        matches = result.expected is None or result.nodes == result.expected
+        is_correct = is_correct and matches
+        status = "" if result.expected is None else " ok" if matches else f" expected {result.expected}"
+        print(f"depth {depth}: {result.nodes} nodes in {result.seconds:.2f}s "
+              f"({result.nodes_per_second:,.0f} nodes/s){status}")
+
+    if arguments.divide:
+        for move, count in divide(board, arguments.depth).items():
+            print(f"{move}: {count}")
+
+    return is_correct
+
+
+if __name__ == '__main__':
+    raise SystemExit(0 if main() else 1)
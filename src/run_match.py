@@ -0,0 +1,111 @@
+import argparse
+import json
+import time
+from dataclasses import replace
+from functools import partial
+
+from ai.educated_guess_heuristic import eval_material_state
+from ai.game_store import GameStoreWriter
+from ai.match_runner import MatchRunner, EngineConfig, MatchScore, ENGINES, MAX_GAME_TURNS
+from managers.pdn_util import write_pdn
+
+# Options of an engine spec and the config fields they set
+ENGINE_OPTIONS = {
+    "depth": ("depth", int),
+    "time": ("move_time", float),
+    "nodes": ("node_limit", int),
+    "iterations": ("iterations", int),
+    "book": ("opening_book", str),
+    "tablebase": ("tablebase", str),
+}
+# Options of an engine spec that weight its heuristic and the heuristic arguments they set
+HEURISTIC_OPTIONS = {
+    "piece": "piece_score",
+    "king": "king_modifier",
+}
+
+
+def parse_engine_config(spec: str) -> EngineConfig:
+    """
+    Read an engine spec like "alphabeta:depth=6,time=0.1,king=3" or "mcts:iterations=500", the spec names the engine.
+    """
+    engine, _, options = spec.partition(":")
+    if engine not in ENGINES:
+        raise argparse.ArgumentTypeError(f"unknown engine {engine}, expected one of {', '.join(ENGINES)}")
+    fields, weights = {}, {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        if key in HEURISTIC_OPTIONS:
+            target, field, convert = weights, HEURISTIC_OPTIONS[key], int
+        elif key in ENGINE_OPTIONS:
+            target, (field, convert) = fields, ENGINE_OPTIONS[key]
+        else:
+            known = ", ".join([*ENGINE_OPTIONS, *HEURISTIC_OPTIONS])
+            raise argparse.ArgumentTypeError(f"unknown engine option {key}, expected one of {known}")
+        try:
+            target[field] = convert(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid value {value} of engine option {key}")
+    if weights:
+        # a partial of a module level function can still be sent to the worker processes
+        fields["heuristic"] = partial(eval_material_state, **weights)
+    return EngineConfig(spec, engine, **fields)
+
+
+def parse_arguments(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Play games between two AI engines without a board on screen.")
+    parser.add_argument("first", type=parse_engine_config, help='engine spec, e.g. "alphabeta:depth=6,time=0.1"')
+    parser.add_argument("second", type=parse_engine_config, help='engine spec, e.g. "mcts:iterations=500"')
+    parser.add_argument("--games", type=int, default=100, help="number of games, the engines swap sides every game")
+    parser.add_argument("--workers", type=int, default=None, help="processes playing games, all cores by default")
+    parser.add_argument("--opening-turns", type=int, default=4, help="random turns played before the engines take over")
+    parser.add_argument("--max-turns", type=int, default=MAX_GAME_TURNS, help="turns after which a game is a draw")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the random openings")
+    parser.add_argument("--output", default=None, help="file to write every game to, one JSON object per line")
+    parser.add_argument("--pdn", default=None, help="file to write every game to as PDN, in the order of the games")
+    parser.add_argument("--store", default=None, help="game store file to write every game to, in the order of the games")
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> None:
+    arguments = parse_arguments(args)
+    if arguments.first.name == arguments.second.name:
+        # the scores are kept by name, so a mirror match needs two
+        arguments.second = replace(arguments.second, name=f"{arguments.second.name} (2)")
+
+    start = time.perf_counter()
+    output = open(arguments.output, "w") if arguments.output else None
+    records = []
+    try:
+        with MatchRunner(
+                arguments.first, arguments.second, arguments.workers, opening_turns=arguments.opening_turns,
+                max_turns=arguments.max_turns, seed=arguments.seed
+        ) as runner:
+            for record in runner.play(arguments.games):
+                records.append(record)
+                result = "draw" if record.winner is None else f"{record.winner_name} wins"
+                print(f"game {record.index + 1}: {record.p1} vs {record.p2}, {result} by {record.reason} "
+                      f"in {record.turns} turns ({record.duration:.2f}s)")
+                if output is not None:
+                    output.write(json.dumps(record.to_dict()) + "\n")
+    finally:
+        if output is not None:
+            output.close()
+
+    if arguments.pdn:
+        write_pdn(arguments.pdn, (record.to_pdn() for record in sorted(records, key=lambda record: record.index)))
+    if arguments.store:
+        with GameStoreWriter(arguments.store) as store:
+            for record in sorted(records, key=lambda record: record.index):
+                store.add(record.moves, record.winner)
+
+    elapsed = time.perf_counter() - start
+    for config in (arguments.first, arguments.second):
+        score = MatchScore.from_records(records, config.name)
+        print(f"{config.name}: {score.wins} wins, {score.losses} losses, {score.draws} draws "
+              f"({score.points}/{score.games})")
+    print(f"{len(records)} games in {elapsed:.1f}s ({len(records) / elapsed:.2f} games/s)")
+
+
+if __name__ == '__main__':
+    main()
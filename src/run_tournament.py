@@ -0,0 +1,84 @@
+import argparse
+import json
+import time
+
+from ai.rating import SPRT
+from ai.tournament import Tournament, TournamentResult, generate_openings, SCHEDULES, ROUND_ROBIN
+from ai.match_runner import MAX_GAME_TURNS
+from run_match import parse_engine_config
+
+
+def parse_sprt(spec: str) -> SPRT:
+    """
+    Read the Elo bounds of an SPRT like "0,10".
+    """
+    try:
+        elo0, elo1 = (float(bound) for bound in spec.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected the two Elo bounds of the test as elo0,elo1, got {spec}")
+    return SPRT(elo0, elo1)
+
+
+def parse_arguments(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Play a tournament between AI engines and rate them.")
+    parser.add_argument(
+        "engines", nargs="+", type=parse_engine_config,
+        help='engine specs, e.g. "alphabeta:depth=6,king=3" "mcts:iterations=500", a gauntlet tests the first one'
+    )
+    parser.add_argument("--schedule", choices=SCHEDULES, default=ROUND_ROBIN, help="how the engines are paired")
+    parser.add_argument("--games", type=int, default=100, help="most games of every pairing")
+    parser.add_argument(
+        "--sprt", type=parse_sprt, default=None,
+        help="stop a pairing once a sequential test decides between its Elo bounds, e.g. 0,10"
+    )
+    parser.add_argument("--openings", type=int, default=20, help="balanced opening lines to start the games from")
+    parser.add_argument("--opening-length", type=int, default=4, help="turns of every opening line")
+    parser.add_argument("--workers", type=int, default=None, help="processes playing games, all cores by default")
+    parser.add_argument("--max-turns", type=int, default=MAX_GAME_TURNS, help="turns after which a game is a draw")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the openings")
+    parser.add_argument("--output", default=None, help="file to write every game to, one JSON object per line")
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> None:
+    arguments = parse_arguments(args)
+
+    start = time.perf_counter()
+    openings = generate_openings(arguments.openings, arguments.opening_length, seed=arguments.seed)
+    print(f"{len(openings)} balanced openings of {arguments.opening_length} turns")
+
+    output = open(arguments.output, "w") if arguments.output else None
+    records = []
+    try:
+        with Tournament(
+                arguments.engines, arguments.schedule, arguments.games, openings, arguments.sprt,
+                arguments.workers, max_turns=arguments.max_turns, seed=arguments.seed
+        ) as tournament:
+            for pairing, record in tournament.play():
+                records.append(record)
+                result = "draw" if record.winner is None else f"{record.winner_name} wins"
+                decided = f", SPRT accepts {pairing.decision}" if pairing.decision is not None else ""
+                print(f"game {record.index + 1}: {record.p1} vs {record.p2}, {result} by {record.reason}, "
+                      f"{pairing.first.name} {pairing.score.wins}-{pairing.score.losses}-{pairing.score.draws}"
+                      f"{decided}")
+                if output is not None:
+                    output.write(json.dumps(record.to_dict()) + "\n")
+    finally:
+        if output is not None:
+            output.close()
+
+    result = TournamentResult(tournament.pairings, records)
+    print("\npairings (wins-losses-draws of the first engine):")
+    for pairing in result.pairings:
+        decision = f", SPRT accepts {pairing.decision}" if pairing.decision is not None else ""
+        score = pairing.score
+        print(f"  {pairing.first.name} vs {pairing.second.name}: {score.wins}-{score.losses}-{score.draws}, "
+              f"Elo {pairing.elo}{decision}")
+    print("standings:")
+    for name, score, elo in result.standings():
+        print(f"  {name}: {score.points}/{score.games}, Elo {elo}")
+    print(f"{len(records)} games in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class MaterialCount:
+    """
+    Number of men and kings one player has on the board.
+    """
+    men: int = 0
+    kings: int = 0
+
+    @property
+    def pieces(self) -> int:
+        return self.men + self.kings
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from component.piece import Piece
+
+
+@dataclass(frozen=True)
+class MoveRecord:
+    """
+    Undo information of a single executed move.
+
+    Holds only what the move changed: the moved piece's source and final cell, the captured piece,
+    whether the piece was promoted, and the chain state, hash key and turns without progress of the game before the move.
+    """
+    src_name: str
+    dest_name: str
+    captured_name: Optional[str] = None
+    captured_piece: Optional[Piece] = None
+    promoted: bool = False
+    previous_chaining_cell_name: Optional[str] = None
+    previous_is_chained_move: bool = False
+    # the same player keeps playing when the move leads to a chain capture
+    is_chain_capture: bool = False
+    previous_hash_key: int = 0
+    previous_no_progress_turns: int = 0
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class MoveSequence:
+    """
+    A complete move of one turn: a normal move, a single capture or every hop of a chain capture.
+    """
+    src_name: str
+    # cells the piece lands on in order, the last one is where the move ends
+    landing_names: tuple[str, ...]
+    # cells of the captured pieces in the order they are jumped
+    captured_names: tuple[str, ...] = ()
+    promotes: bool = False
+
+    @property
+    def dest_name(self) -> str:
+        return self.landing_names[-1]
+
+    @property
+    def is_capture(self) -> bool:
+        return bool(self.captured_names)
+
+    @property
+    def hops(self) -> list[tuple[str, str]]:
+        """
+        The (source, target) pairs of the move as taken by Board.move_piece, the target of a capture is the captured cell.
+        """
+        if not self.is_capture:
+            return [(self.src_name, self.dest_name)]
+        sources = (self.src_name,) + self.landing_names[:-1]
+        return list(zip(sources, self.captured_names))
+
+    def __str__(self) -> str:
+        """
+        E.g. "a13 -> a24" or "a13 -> a24 -> a35 -> a46 -> a57", listing every captured and landing cell.
+        """
+        names = [self.src_name]
+        if self.is_capture:
+            for captured, landing in zip(self.captured_names, self.landing_names):
+                names += [captured, landing]
+        else:
+            names.append(self.dest_name)
+        return " -> ".join(names)
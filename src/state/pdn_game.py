@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+
+# Results of a PDN game, scored for black, the player moving first
+BLACK_WINS = "1-0"
+WHITE_WINS = "0-1"
+DRAW = "1/2-1/2"
+UNFINISHED = "*"
+
+
+@dataclass(frozen=True)
+class PDNMove:
+    """
+    A move as written in PDN: the numbered squares it visits, from 1 to 32, and whether it captures.
+
+    A capture may list every landing square or only the first and the last one.
+    """
+    squares: tuple[int, ...]
+    is_capture: bool = False
+
+    def __str__(self) -> str:
+        """
+        E.g. "11-15" or "15x24x31".
+        """
+        return ("x" if self.is_capture else "-").join(str(square) for square in self.squares)
+
+
+@dataclass
+class PDNGame:
+    """
+    A game of a PDN file: its tag pairs, its moves from the start position and its result.
+
+    The start position is the initial setup unless the FEN tag gives another one.
+    """
+    tags: dict[str, str] = field(default_factory=dict)
+    moves: list[PDNMove] = field(default_factory=list)
+    result: str = UNFINISHED
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class PositionSnapshot:
+    """
+    Plain copy of a position and the game state needed to continue playing it.
+
+    Holds only strings, numbers and tuples, so it can be pickled and sent to other processes.
+    """
+    rows: int
+    columns: int
+    # (cell name, owner, is king) of every piece on the board
+    pieces: tuple[tuple[str, str, bool], ...]
+    current_player: str
+    chaining_cell_name: Optional[str] = None
+    turn_counter: int = 0
+    use_bitboard: bool = False
@@ -44,9 +44,7 @@ def extract_index_from_cell(source_cell: Cell) -> tuple[int, int]:
     """
     Extract the i,j values from cell a_ij.
     """
-    source_index = re.match(r'a(\d)(\d)', source_cell.name)
-    i, j = int(source_index[1]), int(source_index[2])
-    return i, j
+    return source_cell.row, source_cell.column
 
 
 def is_valid_cell_name(name: str) -> bool:
@@ -91,18 +89,6 @@ def captures(name_target: str, name_final: str) -> CaptureMove:
     return CaptureMove(name_target, name_final)
 
 
-def get_potential_moves(row_target: int, col_src: int) -> list[tuple[int, int]]:
-    """
-    Generate moves that can be done by the piece in the cell.
-    :return: move indexes
-    """
-    possible_moves = [
-        (row_target, col_src + 1),
-        (row_target, col_src - 1)
-    ]
-    return possible_moves
-
-
 def generate_move(
         name_src: str, target_name: list[str], is_capture_move: bool = False,
         capture_moves: Optional[list[CaptureMove]] = None
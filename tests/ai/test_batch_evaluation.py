@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ai.batch_evaluation import encode_positions, evaluate_batch, evaluate_boards, P1_SIGN, P2_SIGN
+from ai.educated_guess_heuristic import eval_player_state
+from board import Board
+from component.game import P
+from conftest import setup_board, p1, p2
+
+
+def random_boards(count: int, seed: int = 5) -> list[Board]:
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board()
+        board.initial_setup()
+        for _ in range(rng.randrange(40)):
+            moves = board.get_move_sequences()
+            if not moves:
+                break
+            board.make_sequence(rng.choice(moves))
+        boards.append(board)
+    return boards
+
+
+def cell_score(board: Board) -> int:
+    player = board.game.current_player.name
+    opponent = P.P2.name if player == P.P1.name else P.P1.name
+    return eval_player_state(board.cell_manager.get_player_cells(player), board.cell_manager.get_player_cells(opponent))
+
+
+class TestBatchEvaluation:
+
+    def test_encode_positions(self):
+        boards = random_boards(5)
+
+        positions, players = encode_positions(boards)
+
+        assert positions.shape == (5, 32)
+        assert positions.dtype == np.int8
+        assert list(positions[2]) == boards[2].encode_position()
+        assert set(players) <= {P1_SIGN, P2_SIGN}
+
+    def test_matches_single_position_evaluation(self):
+        boards = random_boards(40)
+
+        assert list(evaluate_boards(boards)) == [cell_score(board) for board in boards]
+
+    def test_scores_for_p1_without_players(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a88"), (p2, "a86")])
+        board_setup.cell_manager.get_cell_by_name("a11").set_king()
+        positions = np.array([board_setup.encode_position()])
+
+        assert list(evaluate_batch(positions)) == [0]
+        assert list(evaluate_batch(positions, np.array([P2_SIGN]), piece_score=5, king_modifier=3)) == [-5]
+
+    def test_piece_square_table_is_rotated_for_p2(self, board_setup):
+        table = np.arange(32)
+        setup_board(board_setup, [(p1, "a13"), (p2, "a86")])
+        positions = np.array([board_setup.encode_position()])
+
+        # a13 is square 1 for p1 and a86 is square 1 once rotated for p2
+        assert list(evaluate_batch(positions, man_table=table)) == [0]
+
+        board_setup.cell_manager.get_cell_by_name("a86").set_king()
+        positions = np.array([board_setup.encode_position()])
+        assert list(evaluate_batch(positions, man_table=table, king_table=table * 2)) == [1 - 10 - 2]
+
+    def test_large_batch(self):
+        positions = np.tile(np.array(Board().encode_position(), dtype=np.int8), (50_000, 1))
+        positions[:, 0] = 2
+
+        scores = evaluate_batch(positions)
+
+        assert scores.shape == (50_000,)
+        assert (scores == 20).all()
@@ -1,9 +1,127 @@
+from argparse import ArgumentTypeError
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from ai.educated_guess_heuristic import eval_material_state
+from ai.match_runner import (
+    MatchRunner, EngineConfig, GameTask, MatchScore, play_game, RANDOM_ENGINE, MCTS_ENGINE, NO_MOVES, TURN_LIMIT
+)
+from board import Board
+from component.game import P
+from run_match import parse_engine_config
+
+heuristic_calls = []
+
+SHALLOW = EngineConfig("shallow", depth=3)
+RANDOM = EngineConfig("random", RANDOM_ENGINE)
+
+
+def counting_heuristic(player_material, opponent_material, **kwargs) -> int:
+    heuristic_calls.append(player_material.pieces)
+    return eval_material_state(player_material, opponent_material, **kwargs)
+
+
+def replay(moves) -> Board:
+    board = Board()
+    board.initial_setup()
+    for move in moves:
+        assert move in board.get_move_sequences()
+        board.move_sequence(move)
+    return board
+
+
+@pytest.fixture(scope="module")
+def match_pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
 class TestDriver:
 
-    # todo
     def test_can_choose_heuristic(self):
-        pass
+        heuristic_calls.clear()
+        config = EngineConfig("counting", depth=2, heuristic=counting_heuristic)
+
+        play_game(GameTask(0, config, RANDOM, seed=1, max_turns=4))
+
+        assert heuristic_calls
 
-    # todo
     def test_return_game_data(self):
-        pass
+        record = play_game(GameTask(3, SHALLOW, RANDOM, seed=5))
+
+        assert (record.index, record.p1, record.p2) == (3, "shallow", "random")
+        assert record.reason == NO_MOVES
+        assert record.winner_name == "shallow"
+        assert record.duration > 0
+        assert record.think_time[P.P1.name] > 0
+        # the moves replay into the final position, where the loser has no move left
+        assert replay(record.moves).get_move_sequences() == []
+
+    def test_record_converts_to_plain_data(self):
+        data = play_game(GameTask(0, RANDOM, SHALLOW, seed=2, max_turns=6)).to_dict()
+
+        assert data["reason"] == TURN_LIMIT
+        assert data["winner"] is None
+        assert data["turns"] == len(data["moves"]) == 6
+        assert all(isinstance(move, str) for move in data["moves"])
+
+    def test_same_seed_plays_same_game(self):
+        config = EngineConfig("mcts", MCTS_ENGINE, iterations=20)
+        task = GameTask(0, config, RANDOM, seed=9, max_turns=20)
+
+        assert play_game(task).moves == play_game(task).moves
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError, match="Unknown engine"):
+            play_game(GameTask(0, EngineConfig("bad", "bad"), RANDOM, seed=0))
+
+
+class TestMatchRunner:
+
+    def test_engines_swap_sides_and_share_openings(self):
+        tasks = MatchRunner(SHALLOW, RANDOM, workers=1, opening_turns=2, seed=4).tasks(4)
+
+        assert [(task.p1.name, task.p2.name) for task in tasks] == [
+            ("shallow", "random"), ("random", "shallow"), ("shallow", "random"), ("random", "shallow")
+        ]
+        assert [task.seed for task in tasks] == [4, 4, 5, 5]
+
+    def test_pair_starts_from_same_opening(self):
+        records = MatchRunner(SHALLOW, RANDOM, workers=1, opening_turns=3, seed=6).run(2)
+
+        assert records[0].moves[:3] == records[1].moves[:3]
+
+    def test_games_run_in_pool(self, match_pool):
+        with MatchRunner(SHALLOW, RANDOM, executor=match_pool, workers=2, seed=1) as runner:
+            records = runner.run(6)
+
+        assert [record.index for record in records] == list(range(6))
+        score = MatchScore.from_records(records, "shallow")
+        assert score.games == 6
+        assert score.wins > score.losses
+        assert MatchScore.from_records(records, "random").points == score.games - score.points
+
+    def test_pool_gives_same_games_as_one_process(self, match_pool):
+        serial = MatchRunner(SHALLOW, RANDOM, workers=1, opening_turns=2, seed=3).run(2)
+        with MatchRunner(SHALLOW, RANDOM, executor=match_pool, workers=2, opening_turns=2, seed=3) as runner:
+            pooled = runner.run(2)
+
+        assert [record.moves for record in serial] == [record.moves for record in pooled]
+
+
+class TestEngineSpec:
+
+    def test_parse_engine_config(self):
+        config = parse_engine_config("alphabeta:depth=6,time=0.5,nodes=1000")
+
+        assert (config.name, config.engine, config.depth, config.move_time, config.node_limit) == (
+            "alphabeta:depth=6,time=0.5,nodes=1000", "alphabeta", 6, 0.5, 1000
+        )
+        assert parse_engine_config("mcts:iterations=200").iterations == 200
+        assert parse_engine_config("random").engine == RANDOM_ENGINE
+
+    @pytest.mark.parametrize("spec", ["minimax", "alphabeta:width=3", "mcts:iterations=many"])
+    def test_invalid_engine_spec(self, spec):
+        with pytest.raises(ArgumentTypeError):
+            parse_engine_config(spec)
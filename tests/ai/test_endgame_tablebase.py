@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from ai.alpha_beta_search import AlphaBetaSearch, WIN_SCORE
+from ai.endgame_tablebase import (
+    EndgameTablebase, Outcome, TablebaseEntry, TablebaseError, generate_tablebase, enumerate_positions
+)
+from board import Board
+from component.game import P
+from conftest import setup_board, p1, p2
+
+
+@pytest.fixture(scope="module")
+def tablebase() -> EndgameTablebase:
+    return generate_tablebase(2)
+
+
+def set_position(board: Board, pieces: list[tuple[str, str]], player: P, kings: tuple[str, ...] = ()) -> Board:
+    setup_board(board, pieces)
+    for name in kings:
+        board.cell_manager.get_cell_by_name(name).set_king()
+    board.game.set_player_manually(player.name)
+    board.refresh_hash_key()
+    board.refresh_material()
+    return board
+
+
+class TestEndgameTablebase:
+
+    def test_enumerate_positions(self):
+        positions = list(enumerate_positions(2))
+
+        assert len(positions) == len({position.pieces + (position.current_player,) for position in positions})
+        # men never stand on the row they are crowned on
+        assert not any(
+            name[1] == "8" and owner == p1 and not is_king
+            for position in positions
+            for name, owner, is_king in position.pieces
+        )
+
+    def test_blocked_player_has_lost(self, tablebase, board_setup):
+        # the p1 man can neither move to nor jump over a82
+        set_position(board_setup, [(p1, "a71"), (p2, "a82")], P.P1)
+
+        assert tablebase.probe(board_setup) == TablebaseEntry(Outcome.LOSS, 0)
+
+    def test_capturing_the_last_piece_wins(self, tablebase, board_setup):
+        set_position(board_setup, [(p1, "a33"), (p2, "a44")], P.P1)
+
+        assert tablebase.probe(board_setup) == TablebaseEntry(Outcome.WIN, 1)
+        move, entry = tablebase.best_move(board_setup)
+        assert str(move) == "a33 -> a44 -> a55"
+        assert entry == TablebaseEntry(Outcome.WIN, 1)
+
+    def test_king_in_double_corner_draws(self, tablebase, board_setup):
+        set_position(board_setup, [(p1, "a44"), (p2, "a17")], P.P2, ("a44", "a17"))
+
+        assert tablebase.probe(board_setup).outcome == Outcome.DRAW
+
+    def test_king_caught_in_single_corner(self, tablebase, board_setup):
+        set_position(board_setup, [(p1, "a11"), (p2, "a88")], P.P1, ("a11", "a88"))
+
+        assert tablebase.probe(board_setup) == TablebaseEntry(Outcome.WIN, 11)
+        assert AlphaBetaSearch(board_setup).search(11).score >= WIN_SCORE // 2
+
+    def test_position_outside_table(self, tablebase, board_setup):
+        board_setup.initial_setup()
+
+        assert tablebase.probe(board_setup) is None
+        assert tablebase.best_move(board_setup) is None
+
+    def test_results_agree_with_search(self, tablebase):
+        rng = random.Random(2)
+        positions = [position for position in enumerate_positions(2)]
+        checked = 0
+        for position in rng.sample(positions, 300):
+            board = Board.from_position_snapshot(position)
+            entry = tablebase.probe(board)
+            if entry.outcome == Outcome.DRAW or entry.distance > 5:
+                continue
+            result = AlphaBetaSearch(board).search(entry.distance)
+            expected = 1 if entry.outcome == Outcome.WIN else -1
+            assert result.score * expected >= WIN_SCORE // 2
+            checked += 1
+
+        assert checked > 20
+
+    def test_binary_round_trip(self, tablebase, tmp_path):
+        path = tmp_path / "endgame.bin"
+        tablebase.save(path)
+
+        loaded = EndgameTablebase.load(path)
+
+        assert len(loaded) == len(tablebase)
+        assert loaded.max_pieces == 2
+        key = tablebase.keys[len(tablebase) // 2]
+        assert loaded.lookup(key) == tablebase.lookup(key)
+
+    @pytest.mark.parametrize("data", [b"", b"XXXX" + bytes(32)])
+    def test_reject_invalid_file(self, data):
+        with pytest.raises(TablebaseError):
+            EndgameTablebase.from_bytes(data)
+
+    def test_reject_truncated_file(self, tablebase):
+        with pytest.raises(TablebaseError):
+            EndgameTablebase.from_bytes(tablebase.to_bytes()[:-1])
+
+
+class TestTablebaseSearch:
+
+    def test_search_plays_tablebase_move_at_root(self, tablebase, board_setup):
+        set_position(board_setup, [(p1, "a33"), (p2, "a44")], P.P1)
+
+        result = AlphaBetaSearch(board_setup, tablebase=tablebase).iterative_deepening(10)
+
+        assert result.is_tablebase_move
+        assert str(result.best_move) == "a33 -> a44 -> a55"
+        assert result.score == WIN_SCORE - 1
+
+    def test_search_probes_after_captures(self, tablebase, board_setup):
+        # after p1 takes a44 only two pieces are left and the tablebase knows the rest
+        set_position(board_setup, [(p1, "a33"), (p2, "a44"), (p2, "a88")], P.P1, ("a33",))
+        search = AlphaBetaSearch(board_setup, tablebase=tablebase)
+
+        result = search.search(2)
+
+        assert not result.is_tablebase_move
+        assert str(result.best_move) == "a33 -> a44 -> a55"
+        assert search.nodes < AlphaBetaSearch(board_setup).search(2).nodes
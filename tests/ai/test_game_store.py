@@ -0,0 +1,127 @@
+import pytest
+
+from ai.game_store import GameStore, GameStoreWriter, GameStoreError, HEADER_FORMAT
+from ai.match_runner import EngineConfig, GameTask, play_game, RANDOM_ENGINE
+from board import Board
+from component.game import P
+from managers.pdn_util import parse_fen
+from pdn_to_store import main as pdn_to_store
+from state.move_sequence import MoveSequence
+
+RANDOM = EngineConfig("random", RANDOM_ENGINE)
+
+
+@pytest.fixture(scope="module")
+def records():
+    return [play_game(GameTask(index, RANDOM, RANDOM, seed=index, max_turns=60)) for index in range(5)]
+
+
+@pytest.fixture
+def store_path(tmp_path, records):
+    path = tmp_path / "games.bin"
+    with GameStoreWriter(path) as writer:
+        for record in records:
+            writer.add(record.moves, record.winner)
+    return path
+
+
+def replay(moves, start=None) -> Board:
+    board = Board()
+    if start is None:
+        board.initial_setup()
+    else:
+        board.load_position_snapshot(start)
+    for move in moves:
+        board.move_sequence(move)
+    return board
+
+
+class TestGameStore:
+
+    def test_games_read_back(self, store_path, records):
+        with GameStore(store_path) as store:
+            assert len(store) == len(records)
+            assert store.positions == sum(record.turns + 1 for record in records)
+            for record, game in zip(records, store):
+                assert game.moves == tuple(record.moves)
+                assert game.winner == record.winner
+
+    def test_game_by_id(self, store_path, records):
+        with GameStore(store_path) as store:
+            assert store.game(3).moves == tuple(records[3].moves)
+            with pytest.raises(IndexError):
+                store.game(5)
+
+    def test_moves_take_few_bytes(self, store_path, records):
+        moves = sum(record.turns for record in records)
+
+        assert store_path.stat().st_size < HEADER_FORMAT.size + 4 * moves + 32 * len(records)
+
+    def test_position_by_id(self, store_path, records):
+        with GameStore(store_path) as store:
+            first_of_second = records[0].turns + 1
+            assert store.locate_position(first_of_second + 4) == (1, 4)
+            assert store.locate_position(first_of_second - 1) == (0, records[0].turns)
+
+            position = store.position(first_of_second + 4)
+
+        assert set(position.pieces) == set(replay(records[1].moves[:4]).get_position_snapshot().pieces)
+
+    def test_positions_of_game(self, store_path, records):
+        with GameStore(store_path) as store:
+            positions = list(store.game_positions(2))
+
+        assert [move for _, move in positions] == records[2].moves + [None]
+        assert positions[-1][0].current_player == replay(records[2].moves).game.current_player.name
+
+    def test_positions_of_game_while_reading_others(self, store_path, records):
+        with GameStore(store_path) as store:
+            expected = [set(position.pieces) for position, _ in store.game_positions(2)]
+            pieces = []
+            for position, _ in store.game_positions(2):
+                store.position(0)
+                pieces.append(set(position.pieces))
+
+        assert pieces == expected
+
+    def test_game_from_position_and_unfinished(self, tmp_path):
+        start = parse_fen("W:WK18:B14,K1")
+        capture = MoveSequence("a55", ("a37",), ("a46",))
+        path = tmp_path / "position.bin"
+        with GameStoreWriter(path) as writer:
+            writer.add([capture], is_over=False, start=start)
+
+        with GameStore(path) as store:
+            game = store.game(0)
+            final = store.position(1)
+
+        assert (game.moves, game.winner, game.is_over) == ((capture,), None, False)
+        assert set(game.start.pieces) == set(start.pieces)
+        assert set(final.pieces) == {("a37", P.P2.name, True), ("a17", P.P1.name, True)}
+
+    @pytest.mark.parametrize("data", [b"", b"XXXX" + bytes(HEADER_FORMAT.size)])
+    def test_reject_invalid_file(self, tmp_path, data):
+        path = tmp_path / "bad.bin"
+        path.write_bytes(data)
+
+        with pytest.raises(GameStoreError):
+            GameStore(path)
+
+    def test_reject_truncated_file(self, store_path):
+        store_path.write_bytes(store_path.read_bytes()[:-1])
+
+        with pytest.raises(GameStoreError):
+            GameStore(store_path)
+
+    def test_convert_pdn(self, tmp_path, capsys):
+        pdn = tmp_path / "games.pdn"
+        pdn.write_text('[Event "one"]\n1. 11-15 23-19 2. 8-11 1-0\n[FEN "W:WK18:B14,K1"]\n1... 18x9 *\n')
+        output = tmp_path / "games.bin"
+
+        pdn_to_store([str(pdn), str(output)])
+
+        with GameStore(output) as store:
+            assert [(len(game.moves), game.winner, game.is_over) for game in store] == [
+                (3, P.P1.name, True), (1, None, False)
+            ]
+        assert "2 games written" in capsys.readouterr().out
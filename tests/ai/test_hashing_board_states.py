@@ -0,0 +1,179 @@
+import random
+
+import pytest
+
+from ai.alpha_beta_search import AlphaBetaSearch, WIN_SCORE
+from ai.transposition_table import TranspositionTable, Bound
+from board import Board
+from conftest import setup_board, p1, p2
+
+
+def play_moves(board: Board, moves: list[tuple[str, str]]) -> None:
+    for move in moves:
+        board.make_move(*move)
+
+
+class TestHashingBoardStates:
+
+    def test_get_highest_scored_move(self, board_setup):
+        board_setup.initial_setup()
+        search = AlphaBetaSearch(board_setup)
+
+        result = search.search(3)
+        entry = search.transposition_table.probe(board_setup.game.hash_key)
+
+        assert entry.best_move == result.best_move
+        assert entry.score == result.score
+        assert entry.bound == Bound.EXACT
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    def test_can_hash_game_state(self, use_bitboard):
+        rng = random.Random(3)
+        board = Board(use_bitboard=use_bitboard)
+        board.initial_setup()
+
+        records, keys = [], []
+        for _ in range(60):
+            pairs = [(move.src_name, target) for move in board.get_available_moves() for target in move.target_names]
+            if not pairs:
+                break
+            keys.append(board.game.hash_key)
+            records.append(board.make_move(*rng.choice(pairs)))
+            assert board.game.hash_key == board.compute_hash_key()
+
+        while records:
+            board.unmake_move(records.pop())
+            assert board.game.hash_key == keys.pop()
+
+    def test_move_piece_updates_hash(self, board_setup):
+        board_setup.initial_setup()
+        board_setup.move_piece("a33", "a44")
+
+        assert board_setup.game.hash_key == board_setup.compute_hash_key()
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    def test_move_piece_keeps_hash_and_material_through_a_game(self, use_bitboard):
+        board = Board(use_bitboard=use_bitboard)
+        board.initial_setup()
+        rng = random.Random(7)
+
+        for _ in range(120):
+            moves = board.get_available_moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            board.move_piece(move.src_name, rng.choice(move.target_names))
+
+            assert board.game.hash_key == board.compute_hash_key()
+            assert board.game.material == board.compute_material()
+
+    def test_correct_memory_overwrite(self):
+        table = TranspositionTable(buckets=1)
+        table.store(1, 5, Bound.EXACT, 10, ("a11", "a22"))
+        table.store(2, 2, Bound.EXACT, 20)
+        # the shallow entry only replaces the always replace slot
+        table.store(3, 1, Bound.EXACT, 30)
+
+        assert table.probe(1).depth == 5
+        assert table.probe(2) is None
+        assert table.probe(3).score == 30
+
+        # a deeper entry takes over the depth preferred slot
+        table.store(4, 6, Bound.LOWER, 40)
+        assert table.probe(1) is None
+        assert table.probe(4).bound == Bound.LOWER
+        assert len(table) == table.capacity == 2
+
+    def test_can_look_up_already_evaluated_value(self):
+        table = TranspositionTable()
+        table.store(123, 4, Bound.UPPER, -15, ("a33", "a44"))
+
+        entry = table.probe(123)
+
+        assert (entry.depth, entry.bound, entry.score, entry.best_move) == (4, Bound.UPPER, -15, ("a33", "a44"))
+        assert table.probe(124) is None
+
+    def test_same_position_keeps_best_move(self):
+        table = TranspositionTable()
+        table.store(5, 4, Bound.EXACT, 1, ("a33", "a44"))
+        table.store(5, 5, Bound.UPPER, 0)
+
+        assert table.probe(5).best_move == ("a33", "a44")
+
+    def test_hashing_consistency_across_turns(self, board_setup):
+        """
+        Same game state on a different turn has different key.
+        """
+        setup_board(board_setup, [(p1, "a33"), (p2, "a66")])
+        board_setup.game.set_player_manually(p1)
+        p1_key = board_setup.compute_hash_key()
+
+        board_setup.game.set_player_manually(p2)
+        p2_key = board_setup.compute_hash_key()
+
+        board_setup.game.chaining_cell_name = "a66"
+        chained_key = board_setup.compute_hash_key()
+
+        assert len({p1_key, p2_key, chained_key}) == 3
+
+    def test_transposition_table_functionality(self):
+        first, second = Board(), Board()
+        for board in (first, second):
+            setup_board(board, [(p1, "a11"), (p1, "a13"), (p2, "a86"), (p2, "a88")])
+            board.refresh_hash_key()
+
+        play_moves(first, [("a11", "a22"), ("a86", "a75"), ("a13", "a24"), ("a88", "a77")])
+        play_moves(second, [("a13", "a24"), ("a88", "a77"), ("a11", "a22"), ("a86", "a75")])
+
+        assert first.game.hash_key == second.game.hash_key
+
+    def test_table_reuse_saves_nodes(self, board_setup):
+        board_setup.initial_setup()
+        search = AlphaBetaSearch(board_setup)
+
+        first = search.search(4)
+        second = search.search(4)
+
+        assert second.score == first.score
+        assert second.nodes < first.nodes
+
+    def test_can_check_tree_depth(self, board_setup):
+        board_setup.initial_setup()
+        search = AlphaBetaSearch(board_setup)
+        search.search(3)
+
+        assert search.transposition_table.probe(board_setup.game.hash_key).depth == 3
+        records = board_setup.make_sequence(search.get_moves()[0])
+        assert search.transposition_table.probe(board_setup.game.hash_key).depth == 2
+        board_setup.unmake_sequence(records)
+
+    def test_terminal_state_recognition(self, board_setup):
+        # p1 takes the last p2 piece
+        setup_board(board_setup, [(p1, "a33"), (p1, "a11"), (p2, "a44")])
+        search = AlphaBetaSearch(board_setup)
+
+        result = search.search(3)
+        repeated = search.search(3)
+
+        assert str(result.best_move) == "a33 -> a44 -> a55"
+        assert result.score > WIN_SCORE / 2
+        assert repeated.score == result.score
+
+    def test_maximum_depth_look_ahead(self, board_setup):
+        board_setup.initial_setup()
+        search = AlphaBetaSearch(board_setup)
+        search.search(2)
+
+        for move in search.get_moves():
+            records = board_setup.make_sequence(move)
+            entry = search.transposition_table.probe(board_setup.game.hash_key)
+            board_setup.unmake_sequence(records)
+            assert entry is None or entry.depth <= 1
+
+    def test_transposition_table_with_high_depth(self, board_setup):
+        board_setup.initial_setup()
+        small = AlphaBetaSearch(board_setup, transposition_table=TranspositionTable(buckets=8))
+        large = AlphaBetaSearch(board_setup)
+
+        assert small.search(5).score == large.search(5).score
+        assert len(small.transposition_table) <= 16
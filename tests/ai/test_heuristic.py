@@ -1,6 +1,6 @@
 import pytest
 
-from ai.educated_guess_heuristic import _eval_player_pieces_score, eval_player_state
+from ai.educated_guess_heuristic import _eval_player_pieces_score, eval_player_state, eval_material_state
 from ai.heuristic_move_explorer import get_number_of_moves, extract_in_order_all_move_src_target, \
     calculate_copy_state_score
 from board import Board
@@ -100,6 +100,22 @@ class TestHeuristic:
 
         assert state_score == expected_score
 
+    @pytest.mark.parametrize("cells, king_cells, is_win", [
+        ([(p1, "a13"), (p2, "a46")], ["a13"], False),
+        ([(p1, "a13"), (p1, "a11"), (p1, "a33"), (p2, "a46"), (p2, "a48")], ["a13", "a48"], False),
+        ([(p1, "a13"), (p1, "a11")], ["a11"], True),
+    ])
+    def test_material_score_matches_cell_score(
+            self, board_setup: Board, cells: list[tuple[str, str]], king_cells: list[str], is_win: bool
+    ):
+        player_cells, opponent_cells = setup_and_get_both_cells(board_setup, cells)
+        set_kings_by_name(board_setup, king_cells)
+        material = board_setup.compute_material()
+
+        assert eval_material_state(material[p1], material[p2], is_win=is_win) == eval_player_state(
+            player_cells, opponent_cells, is_win=is_win
+        )
+
     # todo
     def test_score_compare_to_opponent(self):
         pass
@@ -1,62 +1,171 @@
-class TestHashingBoardStates:
-    # todo
-    def test_get_highest_scored_move(self):
-        pass
+import time
 
-    # todo
-    def test_can_hash_game_state(self):
-        pass
+from ai.alpha_beta_search import AlphaBetaSearch, WIN_SCORE, INFINITY
+from ai.educated_guess_heuristic import eval_player_state
+from ai.heuristic_explorer import HeuristicExplorer
+from component.game import P
+from conftest import setup_board, p1, p2
 
-    # todo
-    def test_correct_memory_overwrite(self):
-        pass
 
-    # todo
-    def test_can_look_up_already_evaluated_value(self):
-        pass
+def plain_minimax(search: AlphaBetaSearch, depth: int) -> tuple[int, int]:
+    """
+    Negamax over the whole tree without pruning, returning the score and the number of nodes visited.
+    """
+    moves = search.get_moves()
+    if not moves or depth == 0:
+        return search.evaluate(), 1
+    best, nodes = -INFINITY, 1
+    for move in moves:
+        records = search.board.make_sequence(move)
+        score, child_nodes = plain_minimax(search, depth - 1)
+        search.board.unmake_sequence(records)
+        nodes += child_nodes
+        best = max(best, -score)
+    return best, nodes
 
-    # todo
-    def test_hashing_consistency_across_turns(self):
-        """
-        Same game state on a different turn has different key.
-        """
 
-    # todo
-    def test_transposition_table_functionality(self):
-        pass
+class TestMinimaxAlphaBetaPruning:
+
+    def test_can_call_eval_function(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p1, "a13"), (p2, "a88")])
+        board_setup.refresh_material()
+        search = AlphaBetaSearch(board_setup)
 
-    # todo
-    def test_can_check_tree_depth(self):
-        pass
+        assert search.evaluate() == eval_player_state(
+            board_setup.cell_manager.get_player_cells(p1), board_setup.cell_manager.get_player_cells(p2)
+        )
+        result = search.search(1)
+        assert result.score == 10
 
-    # todo
-    def test_terminal_state_recognition(self):
-        pass
+    def test_effective_pruning_of_unnecessary_branches(self, board_setup):
+        board_setup.initial_setup()
+        search = AlphaBetaSearch(board_setup)
 
-    # todo
-    def test_maximum_depth_look_ahead(self):
-        pass
+        result = search.search(4)
+        full_tree_score, full_tree_nodes = plain_minimax(search, 4)
 
-    # todo
-    def test_transposition_table_with_high_depth(self):
-        pass
+        assert result.score == full_tree_score
+        assert result.nodes < full_tree_nodes
 
+    def test_search_leaves_board_unchanged(self, board_setup):
+        board_setup.initial_setup()
+        before = str(board_setup)
 
-class TestMinimaxAlphaBetaPruning:
-    # todo
-    def test_can_call_eval_function(self):
-        pass
+        AlphaBetaSearch(board_setup).search(3)
+
+        assert str(board_setup) == before
+        assert board_setup.game.current_player == P.P1
+        assert board_setup.game.turn_counter == 0
 
-    # todo
-    def test_effective_pruning_of_unnecessary_branches(self):
-        pass
+    def test_minimax_response_to_bad_opponent_move(self, board_setup):
+        # a33 -> a44 is listed first but walks into the a55 piece
+        setup_board(board_setup, [(p1, "a33"), (p2, "a55"), (p2, "a88")])
 
-    def test_minimax_response_to_bad_opponent_move(self):
-        pass
+        result = AlphaBetaSearch(board_setup).search(2)
 
-    # todo
-    def test_minmax_response_to_opponent_blunder(self):
+        assert str(result.best_move) == "a33 -> a42"
+        assert result.score == -10
+
+    def test_minmax_response_to_opponent_blunder(self, board_setup):
         """
         Minimax can recognize opponent mistakes and doesn't miss on obvious benefits
         """
-        pass
+        setup_board(board_setup, [(p1, "a33"), (p2, "a42"), (p2, "a44"), (p2, "a66"), (p2, "a88")])
+
+        result = AlphaBetaSearch(board_setup).search(1)
+
+        # the capture of a44 chains into the capture of a66
+        assert str(result.best_move) == "a33 -> a44 -> a55 -> a66 -> a77"
+        assert result.principal_variation[0] == result.best_move
+
+    def test_returns_loss_when_no_moves(self, board_setup):
+        setup_board(board_setup, [(p1, "a17"), (p2, "a26"), (p2, "a28"), (p2, "a35")])
+        board_setup.game.set_player_manually(p1)
+
+        result = AlphaBetaSearch(board_setup).search(2)
+
+        assert result.best_move is None
+        assert result.score < -WIN_SCORE / 2
+
+    def test_leaves_do_not_build_move_sequences(self, board_setup, monkeypatch):
+        board_setup.initial_setup()
+        calls = []
+        get_move_sequences = board_setup.get_move_sequences
+        monkeypatch.setattr(board_setup, "get_move_sequences", lambda: calls.append(1) or get_move_sequences())
+
+        result = AlphaBetaSearch(board_setup).search(1)
+
+        # the seven leaves only check that a move exists, only the root builds its moves
+        assert result.nodes == 7
+        assert len(calls) == 1
+
+    def test_leaf_without_moves_is_a_loss(self, board_setup):
+        setup_board(board_setup, [(p1, "a33"), (p2, "a44")])
+
+        result = AlphaBetaSearch(board_setup).search(1)
+
+        assert result.score > WIN_SCORE / 2
+
+    def test_time_budget_returns_a_move(self, board_setup):
+        board_setup.initial_setup()
+
+        result = AlphaBetaSearch(board_setup).search(30, time_limit=0.05)
+
+        assert result.best_move in AlphaBetaSearch(board_setup).get_moves()
+
+    def test_explorer_searches_on_ai_copy(self, board_setup):
+        board_setup.initial_setup()
+        before = str(board_setup)
+
+        result = HeuristicExplorer(board_setup).find_best_move(2)
+
+        assert result.best_move is not None
+        assert str(board_setup) == before
+
+
+class TestIterativeDeepening:
+
+    def test_reaches_max_depth_without_budget(self, board_setup):
+        board_setup.initial_setup()
+
+        result = AlphaBetaSearch(board_setup).iterative_deepening(4)
+
+        assert result.depth == 4
+        assert result.is_complete
+        assert result.score == AlphaBetaSearch(board_setup).search(4).score
+
+    def test_node_budget_returns_last_completed_iteration(self, board_setup):
+        board_setup.initial_setup()
+        depth_two = AlphaBetaSearch(board_setup).search(2)
+
+        result = AlphaBetaSearch(board_setup).iterative_deepening(30, node_limit=depth_two.nodes + 50)
+
+        assert result.is_complete
+        assert result.depth >= 2
+        assert result.depth < 30
+        assert result.best_move in AlphaBetaSearch(board_setup).get_moves()
+
+    def test_time_budget_is_respected(self, board_setup):
+        board_setup.initial_setup()
+
+        start = time.perf_counter()
+        result = AlphaBetaSearch(board_setup).iterative_deepening(time_limit=0.2)
+
+        assert time.perf_counter() - start < 1
+        assert result.best_move is not None
+
+    def test_forced_move_stops_at_first_iteration(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a88")])
+
+        result = AlphaBetaSearch(board_setup).iterative_deepening(10)
+
+        assert str(result.best_move) == "a11 -> a22 -> a33"
+        assert result.depth == 1
+
+    def test_first_iteration_is_used_when_cut_short(self, board_setup):
+        board_setup.initial_setup()
+
+        result = AlphaBetaSearch(board_setup).iterative_deepening(10, node_limit=3)
+
+        assert not result.is_complete
+        assert result.best_move is not None
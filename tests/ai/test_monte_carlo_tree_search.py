@@ -0,0 +1,99 @@
+import random
+
+from ai.monte_carlo_tree_search import MonteCarloTreeSearch
+from board import Board
+from component.game import P
+from conftest import setup_board, p1, p2
+
+
+def new_search(board: Board, seed: int = 3) -> MonteCarloTreeSearch:
+    return MonteCarloTreeSearch(board, rng=random.Random(seed))
+
+
+class TestMonteCarloTreeSearch:
+
+    def test_board_is_left_as_found(self, board_setup):
+        board_setup.initial_setup()
+        before = board_setup.encode_position(), board_setup.game.current_player, board_setup.game.hash_key
+
+        new_search(board_setup).search(iterations=50)
+
+        assert (board_setup.encode_position(), board_setup.game.current_player, board_setup.game.hash_key) == before
+
+    def test_visits_add_up(self, board_setup):
+        board_setup.initial_setup()
+        search = new_search(board_setup)
+
+        result = search.search(iterations=60)
+
+        assert result.iterations == 60
+        assert search.root.visits == 60
+        assert sum(child.visits for child in search.root.children) == 60
+        assert result.best_move in board_setup.get_move_sequences()
+        assert result.principal_variation[0] == result.best_move
+
+    def test_finds_forced_win(self, board_setup):
+        # after a13 -> a24 the p2 man has to step next to a p1 man and is taken
+        setup_board(board_setup, [(p1, "a31"), (p1, "a13"), (p2, "a44")])
+
+        result = new_search(board_setup).search(iterations=200)
+
+        assert str(result.best_move) == "a13 -> a24"
+        assert result.win_rate == 1.0
+
+    def test_takes_winning_capture(self, board_setup):
+        setup_board(board_setup, [(p1, "a33"), (p1, "a11"), (p2, "a44")])
+
+        result = new_search(board_setup).search(iterations=20)
+
+        assert str(result.best_move) == "a33 -> a44 -> a55"
+        assert result.win_rate == 1.0
+
+    def test_no_moves(self, board_setup):
+        setup_board(board_setup, [(p1, "a71"), (p2, "a82")])
+
+        result = new_search(board_setup).search(iterations=10)
+
+        assert result.best_move is None
+
+    def test_time_budget(self, board_setup):
+        board_setup.initial_setup()
+
+        result = new_search(board_setup).search(time_limit=0.05)
+
+        assert result.iterations >= 1
+        assert result.best_move is not None
+
+    def test_tree_is_reused_after_moves(self, board_setup):
+        board_setup.initial_setup()
+        search = new_search(board_setup)
+        first = search.search(iterations=120)
+
+        board_setup.move_sequence(first.best_move)
+        board_setup.move_sequence(first.principal_variation[1])
+        second = search.search(iterations=10)
+
+        assert second.reused_visits > 0
+        assert search.root.visits == second.reused_visits + 10
+        assert search.root.parent is None
+
+    def test_unknown_position_starts_new_tree(self, board_setup):
+        board_setup.initial_setup()
+        search = new_search(board_setup)
+        search.search(iterations=20)
+
+        # the same pieces with the other player to move
+        board_setup.game.set_player_manually(P.P2)
+        result = search.search(iterations=5)
+
+        assert result.reused_visits == 0
+
+    def test_advance_keeps_subtree(self, board_setup):
+        board_setup.initial_setup()
+        search = new_search(board_setup)
+        result = search.search(iterations=100)
+
+        search.advance(result.best_move)
+
+        assert search.root.visits == result.visits
+        assert search.root.parent is None
@@ -0,0 +1,116 @@
+import random
+from typing import Optional
+
+import pytest
+
+from ai.alpha_beta_search import AlphaBetaSearch
+from ai.move_ordering import MoveOrderer
+from state.move_sequence import MoveSequence
+
+quiet = MoveSequence("a33", ("a44",))
+other_quiet = MoveSequence("a31", ("a42",))
+single_capture = MoveSequence("a13", ("a35",), ("a24",))
+double_capture = MoveSequence("a11", ("a33", "a55"), ("a22", "a44"))
+promotion = MoveSequence("a77", ("a88",), promotes=True)
+
+
+class TableMoveOnlyOrderer(MoveOrderer):
+    """
+    Ordering of the search before killer and history moves, only the table move goes first.
+    """
+
+    def order(self, moves, ply, table_move: Optional[MoveSequence] = None, is_king_at=None):
+        if table_move is None or table_move not in moves:
+            return moves
+        return [table_move] + [move for move in moves if move != table_move]
+
+
+class TestMoveOrdering:
+
+    def test_table_move_goes_first(self):
+        orderer = MoveOrderer()
+        moves = [double_capture, quiet, single_capture]
+
+        assert orderer.order(moves, 0, quiet)[0] == quiet
+
+    def test_captures_ordered_by_material_gained(self):
+        orderer = MoveOrderer()
+        moves = [quiet, single_capture, promotion, double_capture]
+
+        assert orderer.order(moves, 0) == [double_capture, single_capture, promotion, quiet]
+
+    def test_captured_king_is_worth_more(self):
+        orderer = MoveOrderer()
+        man_capture = MoveSequence("a13", ("a35",), ("a24",))
+        king_capture = MoveSequence("a17", ("a35",), ("a26",))
+
+        ordered = orderer.order([man_capture, king_capture], 0, is_king_at=lambda name: name == "a26")
+
+        assert ordered == [king_capture, man_capture]
+        assert MoveOrderer.material_gain(double_capture) == 2
+
+    def test_killer_moves_go_before_quiet_moves(self):
+        orderer = MoveOrderer()
+        orderer.record_cutoff(other_quiet, 3, 1)
+
+        assert orderer.order([quiet, other_quiet], 3) == [other_quiet, quiet]
+        assert orderer.killers[3] == [other_quiet]
+        assert orderer.killers[2] == []
+
+    def test_killer_slots_keep_latest_moves(self):
+        orderer = MoveOrderer(killer_slots=2)
+        third = MoveSequence("a35", ("a46",))
+        for move in (quiet, other_quiet, third):
+            orderer.record_cutoff(move, 0, 1)
+
+        assert orderer.killers[0] == [third, other_quiet]
+
+    def test_captures_are_not_killers(self):
+        orderer = MoveOrderer()
+        orderer.record_cutoff(single_capture, 0, 4)
+
+        assert orderer.killers == []
+        assert orderer.history == {}
+
+    def test_history_orders_quiet_moves(self):
+        orderer = MoveOrderer()
+        orderer.record_cutoff(other_quiet, 5, 3)
+        orderer.record_cutoff(quiet, 6, 1)
+
+        # no killers at ply 0, so the deeper cutoff wins
+        assert orderer.order([quiet, other_quiet], 0) == [other_quiet, quiet]
+        assert orderer.history[("a31", "a42")] == 9
+
+    def test_new_search_ages_history(self):
+        orderer = MoveOrderer()
+        orderer.record_cutoff(quiet, 0, 3)
+        orderer.record_cutoff(other_quiet, 0, 1)
+
+        orderer.new_search()
+
+        assert orderer.killers == []
+        assert orderer.history == {("a33", "a44"): 4}
+
+    @pytest.mark.parametrize("depth", [3, 4, 5])
+    def test_same_score_with_fewer_nodes(self, board_setup, depth):
+        board_setup.initial_setup()
+        plain = AlphaBetaSearch(board_setup, move_orderer=TableMoveOnlyOrderer())
+        ordered = AlphaBetaSearch(board_setup)
+
+        plain_result = plain.search(depth)
+        ordered_result = ordered.search(depth)
+
+        assert ordered_result.score == plain_result.score
+        assert ordered_result.nodes <= plain_result.nodes
+
+    def test_fewer_nodes_in_middle_game(self, board_setup):
+        board_setup.initial_setup()
+        rng = random.Random(0)
+        for _ in range(12):
+            board_setup.make_sequence(rng.choice(board_setup.get_move_sequences()))
+
+        plain = AlphaBetaSearch(board_setup, move_orderer=TableMoveOnlyOrderer()).iterative_deepening(6)
+        ordered = AlphaBetaSearch(board_setup).iterative_deepening(6)
+
+        assert ordered.score == plain.score
+        assert ordered.nodes < plain.nodes
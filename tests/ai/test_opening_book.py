@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+from ai.heuristic_explorer import HeuristicExplorer
+from ai.opening_book import OpeningBook, OpeningBookError, generate_book, HEADER_FORMAT, RECORD_FORMAT
+from board import Board
+from conftest import setup_board, p1, p2
+from state.move_sequence import MoveSequence
+
+first = MoveSequence("a33", ("a44",))
+second = MoveSequence("a31", ("a42",))
+reply = MoveSequence("a66", ("a55",))
+
+
+def initial_board(use_bitboard: bool = False) -> Board:
+    board = Board(use_bitboard=use_bitboard)
+    board.initial_setup()
+    return board
+
+
+class TestOpeningBook:
+
+    def test_probe_known_position(self):
+        board = initial_board()
+        book = OpeningBook()
+        book.add(board.game.hash_key, first, 3)
+        book.add(board.game.hash_key, second)
+
+        assert dict(book.probe(board)) == {first: 3, second: 1}
+        assert board.game.hash_key in book
+
+    def test_out_of_book_position(self):
+        board = initial_board()
+        book = OpeningBook()
+        book.add(board.game.hash_key, first)
+        board.move_piece("a33", "a44")
+
+        assert book.probe(board) == []
+        assert book.choose_move(board) is None
+
+    def test_illegal_book_move_is_ignored(self):
+        board = initial_board()
+        book = OpeningBook()
+        book.add(board.game.hash_key, MoveSequence("a11", ("a22",)))
+
+        assert book.choose_move(board) is None
+
+    def test_weighted_move_selection(self):
+        board = initial_board()
+        book = OpeningBook(rng=random.Random(1))
+        book.add(board.game.hash_key, first, 9)
+        book.add(board.game.hash_key, second, 1)
+
+        chosen = [book.choose_move(board) for _ in range(200)]
+
+        assert chosen.count(first) > chosen.count(second) > 0
+
+    def test_weights_add_up(self):
+        book = OpeningBook()
+        book.add(1, first)
+        book.add(1, first, 2)
+
+        assert book.entries[1] == {("a33", "a44"): 3}
+
+    def test_add_line(self):
+        board = initial_board()
+        book = OpeningBook()
+
+        book.add_line(board, [first, reply])
+
+        assert board.encode_position() == initial_board().encode_position()
+        assert len(book) == 2
+        board.move_sequence(first)
+        assert book.choose_move(board) == reply
+
+    def test_binary_round_trip(self, tmp_path):
+        board = initial_board()
+        book = OpeningBook()
+        book.add_line(board, [first, reply], 5)
+        book.add(board.game.hash_key, second, 2)
+        path = tmp_path / "book.bin"
+
+        book.save(path)
+        loaded = OpeningBook.load(path)
+
+        assert loaded.entries == book.entries
+        assert path.stat().st_size == HEADER_FORMAT.size + 3 * RECORD_FORMAT.size
+
+    @pytest.mark.parametrize("data", [
+        b"",
+        b"XXXX" + bytes(HEADER_FORMAT.size),
+    ])
+    def test_reject_invalid_file(self, data):
+        with pytest.raises(OpeningBookError):
+            OpeningBook.from_bytes(data)
+
+    def test_reject_truncated_file(self):
+        book = OpeningBook()
+        book.add(1, first)
+
+        with pytest.raises(OpeningBookError):
+            OpeningBook.from_bytes(book.to_bytes()[:-1])
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    def test_generate_book(self, use_bitboard):
+        board = initial_board(use_bitboard)
+
+        book = generate_book(board, 2, 2)
+
+        # the initial position and all 7 replies
+        assert len(book) == 8
+        assert book.choose_move(board) in board.get_move_sequences()
+
+
+class TestOpeningBookHandOff:
+
+    def test_explorer_plays_book_move(self):
+        board = initial_board()
+        book = OpeningBook()
+        book.add(board.game.hash_key, second)
+        explorer = HeuristicExplorer(board, book)
+
+        result = explorer.find_best_move(4)
+
+        assert result.is_book_move
+        assert result.best_move == second
+        assert result.nodes == 0
+
+    def test_explorer_searches_out_of_book(self, board_setup):
+        setup_board(board_setup, [(p1, "a33"), (p1, "a11"), (p2, "a44")])
+        book = OpeningBook()
+        book.add(initial_board().game.hash_key, first)
+        explorer = HeuristicExplorer(board_setup, book)
+
+        result = explorer.find_best_move(3)
+
+        assert not result.is_book_move
+        assert str(result.best_move) == "a33 -> a44 -> a55"
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from ai.monte_carlo_tree_search import DRAW
+from ai.parallel_monte_carlo_tree_search import ParallelMonteCarloTreeSearch, run_playouts
+from component.game import NO_PROGRESS_TURN_LIMIT
+from conftest import setup_board, p1, p2
+
+
+@pytest.fixture(scope="module")
+def mcts_pool():
+    """
+    One process pool for the module, starting workers is slow.
+    """
+    search = ParallelMonteCarloTreeSearch(None, workers=2)
+    yield search.executor
+    search.close()
+
+
+def new_search(board, pool, workers: int = 2) -> ParallelMonteCarloTreeSearch:
+    return ParallelMonteCarloTreeSearch(board, workers, pool, random.Random(4))
+
+
+class TestParallelMonteCarloTreeSearch:
+
+    def test_iterations_are_split_over_workers(self, board_setup, mcts_pool):
+        board_setup.initial_setup()
+
+        result = new_search(board_setup, mcts_pool).search(iterations=41)
+
+        assert result.iterations == 41
+        assert result.best_move in board_setup.get_move_sequences()
+        assert 0 < result.visits <= 41
+
+    def test_more_tasks_than_processes(self, board_setup, mcts_pool):
+        # a single move, so its merged visits are all the visits of the root
+        setup_board(board_setup, [(p1, "a11"), (p2, "a88")])
+
+        result = new_search(board_setup, mcts_pool, workers=5).search(iterations=41)
+
+        assert str(result.best_move) == "a11 -> a22"
+        assert result.visits == result.iterations == 41
+
+    def test_draw_rule_history_reaches_workers(self, board_setup, mcts_pool):
+        setup_board(board_setup, [(p1, "a11"), (p1, "a13"), (p2, "a88")])
+        for name in ("a11", "a13", "a88"):
+            board_setup.cell_manager.get_cell_by_name(name).set_king()
+        board_setup.refresh_hash_key()
+        board_setup.game.reset_position_history()
+        board_setup.game.no_progress_turns = NO_PROGRESS_TURN_LIMIT - 1
+
+        result = new_search(board_setup, mcts_pool).search(iterations=20)
+
+        # every king move ends the last turn allowed without progress
+        assert result.win_rate == DRAW
+
+    def test_takes_winning_capture(self, board_setup, mcts_pool):
+        setup_board(board_setup, [(p1, "a33"), (p1, "a11"), (p2, "a44")])
+
+        result = new_search(board_setup, mcts_pool).search(iterations=10)
+
+        assert str(result.best_move) == "a33 -> a44 -> a55"
+        assert result.win_rate == 1.0
+
+    def test_finds_forced_win(self, board_setup, mcts_pool):
+        # after a13 -> a24 the p2 man has to step next to a p1 man and is taken
+        setup_board(board_setup, [(p1, "a31"), (p1, "a13"), (p2, "a44")])
+
+        result = new_search(board_setup, mcts_pool).search(iterations=200)
+
+        assert str(result.best_move) == "a13 -> a24"
+        assert result.win_rate == 1.0
+
+    def test_time_budget(self, board_setup, mcts_pool):
+        board_setup.initial_setup()
+
+        result = new_search(board_setup, mcts_pool).search(time_limit=0.05)
+
+        assert result.iterations >= 2
+        assert result.best_move is not None
+
+    def test_no_moves(self, board_setup, mcts_pool):
+        setup_board(board_setup, [(p1, "a71"), (p2, "a82")])
+
+        assert new_search(board_setup, mcts_pool).search(iterations=4).best_move is None
+
+    def test_worker_reuses_its_tree(self, board_setup):
+        board_setup.initial_setup()
+        snapshot = board_setup.get_position_snapshot()
+
+        run_playouts(snapshot, 20, None, 1)
+        children, iterations, reused = run_playouts(snapshot, 5, None, 2)
+
+        assert (iterations, reused) == (5, 20)
+        assert sum(visits for _, visits, _ in children) == 5
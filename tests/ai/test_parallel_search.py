@@ -0,0 +1,106 @@
+import pytest
+
+from ai.alpha_beta_search import AlphaBetaSearch
+from ai.parallel_search import ParallelSearch, SplitNode, search_line
+from component.game import NO_PROGRESS_TURN_LIMIT
+from conftest import setup_board, p1, p2
+from state.move_sequence import MoveSequence
+
+
+@pytest.fixture(scope="module")
+def parallel_search_pool():
+    """
+    One process pool for the module, starting workers is slow.
+    """
+    search = ParallelSearch(None, workers=2)
+    yield search.executor
+    search.close()
+
+
+class TestParallelSearch:
+
+    @pytest.mark.parametrize("split_ply", [1, 2])
+    def test_matches_serial_search(self, board_setup, parallel_search_pool, split_ply):
+        board_setup.initial_setup()
+        serial = AlphaBetaSearch(board_setup).search(3)
+
+        parallel = ParallelSearch(board_setup, 2, split_ply, executor=parallel_search_pool).search(3)
+
+        assert parallel.score == serial.score
+        assert parallel.is_complete
+        assert parallel.principal_variation[0] == parallel.best_move
+
+    def test_chain_capture_at_root(self, board_setup, parallel_search_pool):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a44"), (p2, "a88")])
+        serial = AlphaBetaSearch(board_setup).search(2)
+
+        parallel = ParallelSearch(board_setup, 2, executor=parallel_search_pool).search(2)
+
+        assert str(parallel.best_move) == "a11 -> a22 -> a33 -> a44 -> a55"
+        assert parallel.score == serial.score
+
+    def test_iterative_deepening_matches_serial_search(self, board_setup, parallel_search_pool):
+        board_setup.initial_setup()
+        serial = AlphaBetaSearch(board_setup).iterative_deepening(3)
+
+        parallel = ParallelSearch(board_setup, 2, 2, executor=parallel_search_pool).iterative_deepening(3)
+
+        assert (parallel.depth, parallel.score) == (3, serial.score)
+        assert parallel.is_complete
+
+    def test_position_with_unsearched_reply_is_not_backed_up(self):
+        def leaf(line, score):
+            node = SplitNode(line, 0)
+            node.result = None if score is None else (score, [])
+            return node
+
+        refuted, safe = SplitNode(["a"], 1), SplitNode(["b"], 1)
+        # the reply of "a" worth most to the opponent was not searched in time
+        refuted.children = [("a1", leaf(["a", "a1"], 5)), ("a2", leaf(["a", "a2"], None))]
+        safe.children = [("b1", leaf(["b", "b1"], 1))]
+        root = SplitNode([], 2, [("a", refuted), ("b", safe)])
+
+        assert ParallelSearch(None)._back_up(root) == (1, ["b", "b1"])
+
+    def test_board_is_left_unchanged(self, board_setup, parallel_search_pool):
+        board_setup.initial_setup()
+        before = board_setup.get_position_snapshot()
+
+        ParallelSearch(board_setup, 2, 2, executor=parallel_search_pool).search(2)
+
+        assert board_setup.get_position_snapshot() == before
+
+    def test_search_line_scores_position_after_line(self, board_setup):
+        board_setup.initial_setup()
+        snapshot = board_setup.get_position_snapshot()
+
+        score, continuation, nodes = search_line(snapshot, [MoveSequence("a33", ("a44",))], 1, -1000, 1000)
+
+        board_setup.make_move("a33", "a44")
+        assert score == AlphaBetaSearch(board_setup).search(1).score
+        assert nodes > 0
+
+    def test_draw_rule_history_reaches_workers(self, board_setup, parallel_search_pool):
+        setup_board(board_setup, [(p1, "a11"), (p1, "a13"), (p2, "a88")])
+        for name in ("a11", "a13", "a88"):
+            board_setup.cell_manager.get_cell_by_name(name).set_king()
+        board_setup.refresh_hash_key()
+        board_setup.game.reset_position_history()
+        board_setup.game.no_progress_turns = NO_PROGRESS_TURN_LIMIT - 1
+        serial = AlphaBetaSearch(board_setup).search(2)
+
+        parallel = ParallelSearch(board_setup, 2, executor=parallel_search_pool).search(2)
+
+        # every king move ends the last turn allowed without progress
+        assert serial.score == parallel.score == 0
+
+    def test_search_line_counts_repeated_position(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p1, "a13"), (p2, "a88")])
+        snapshot = board_setup.get_position_snapshot()
+        line = [MoveSequence("a11", ("a22",))]
+        board_setup.refresh_hash_key()
+        board_setup.make_sequence(line[0])
+        seen = {board_setup.game.hash_key: 1}
+
+        assert search_line(snapshot, line, 1, -1000, 1000)[0] != 0
+        assert search_line(snapshot, line, 1, -1000, 1000, position_counts=seen)[0] == 0
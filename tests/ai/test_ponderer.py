@@ -0,0 +1,125 @@
+import threading
+
+from ai.alpha_beta_search import AlphaBetaSearch
+from ai.monte_carlo_tree_search import MonteCarloTreeSearch
+from ai.ponderer import Ponderer
+from main import GamePlay
+from conftest import p2
+
+
+def think_until_stopped(stop_event: threading.Event) -> str:
+    stop_event.wait()
+    return "stopped"
+
+
+class TestPonderer:
+
+    def test_result_of_finished_search_is_taken_for_its_position(self):
+        ponderer = Ponderer()
+        ponderer.start(7, lambda stop_event: "best")
+
+        assert ponderer.wait(5)
+        assert ponderer.take_result(7) == "best"
+        # taken once, a later move is searched again
+        assert ponderer.take_result(7) is None
+
+    def test_result_is_dropped_for_another_position(self):
+        ponderer = Ponderer()
+        ponderer.start(7, lambda stop_event: "best")
+        ponderer.wait(5)
+
+        assert ponderer.take_result(8) is None
+
+    def test_stopped_search_gives_no_result(self):
+        ponderer = Ponderer()
+        ponderer.start(7, think_until_stopped)
+
+        assert ponderer.is_pondering
+        assert not ponderer.wait(0.05)
+        assert ponderer.take_result(7) is None
+        assert not ponderer.is_pondering
+
+    def test_start_stops_earlier_pondering(self):
+        ponderer = Ponderer()
+        ponderer.start(7, think_until_stopped)
+        ponderer.start(8, lambda stop_event: "best")
+        ponderer.wait(5)
+
+        assert ponderer.take_result(8) == "best"
+
+    def test_stop_event_ends_alpha_beta_search(self, board_setup):
+        board_setup.initial_setup()
+        stop_event = threading.Event()
+        stop_event.set()
+
+        result = AlphaBetaSearch(board_setup).iterative_deepening(20, stop_event=stop_event)
+
+        assert result.best_move in board_setup.get_move_sequences()
+        assert result.depth < 20
+
+    def test_stop_event_ends_monte_carlo_search(self, board_setup):
+        board_setup.initial_setup()
+        stop_event = threading.Event()
+        stop_event.set()
+
+        result = MonteCarloTreeSearch(board_setup).search(1000, stop_event=stop_event)
+
+        assert result.iterations == 0
+
+
+class TestGamePlayPondering:
+
+    @staticmethod
+    def play_until_ai_expects_reply(game: GamePlay) -> None:
+        game.init_game()
+        game.board.move_sequence(game.board.get_move_sequences()[0])
+        game.board.move_sequence(game.choose_ai_move())
+
+    def test_expected_reply_is_answered_with_pondered_move(self):
+        game = GamePlay(ai_player=p2, ai_depth=3, ai_move_time=None)
+        self.play_until_ai_expects_reply(game)
+        expected_reply = game.expected_reply
+
+        game.start_pondering()
+        assert game.ponderer.wait(30)
+        game.board.move_sequence(expected_reply)
+        move = game.choose_ai_move()
+
+        assert game.ponder_hits == 1
+        assert move == game.explorer.find_best_move(3).best_move
+
+    def test_other_reply_is_searched(self):
+        game = GamePlay(ai_player=p2, ai_depth=3, ai_move_time=None)
+        self.play_until_ai_expects_reply(game)
+        other_reply = next(move for move in game.board.get_move_sequences() if move != game.expected_reply)
+
+        game.start_pondering()
+        game.ponderer.wait(30)
+        game.board.move_sequence(other_reply)
+        move = game.choose_ai_move()
+
+        assert game.ponder_hits == 0
+        assert move in game.board.get_move_sequences()
+
+    def test_mcts_reuses_pondered_tree(self):
+        game = GamePlay(ai_player=p2, ai_move_time=0.05, engine="mcts")
+        self.play_until_ai_expects_reply(game)
+
+        game.start_pondering()
+        assert game.ponderer.is_pondering
+        game.ponderer.wait(0.2)
+        game.ponderer.stop()
+        reply = max(game.mcts.root.children, key=lambda child: child.visits)
+        game.board.move_sequence(reply.move)
+        game.choose_ai_move()
+
+        assert reply.visits > 0
+        assert game.mcts.root is reply
+
+    def test_no_pondering_when_disabled(self):
+        game = GamePlay(ai_player=p2, ai_depth=2, ai_move_time=None, ponder=False)
+        self.play_until_ai_expects_reply(game)
+
+        game.start_pondering()
+
+        assert not game.ponderer.is_pondering
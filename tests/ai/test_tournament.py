@@ -0,0 +1,138 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from ai.match_runner import EngineConfig, MatchScore, RANDOM_ENGINE
+from ai.rating import SPRT, ACCEPT_H0, ACCEPT_H1, elo_estimate, elo_to_score, score_to_elo
+from ai.tournament import Tournament, generate_openings, GAUNTLET
+from board import Board
+from run_match import parse_engine_config
+from run_tournament import parse_sprt
+
+STRONG = EngineConfig("strong", depth=3)
+WEAK = EngineConfig("weak", depth=1)
+RANDOM = EngineConfig("random", RANDOM_ENGINE)
+
+
+@pytest.fixture(scope="module")
+def tournament_pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+class TestRating:
+
+    @pytest.mark.parametrize("elo", [-200, 0, 35, 400])
+    def test_elo_and_score_convert_back(self, elo):
+        assert score_to_elo(elo_to_score(elo)) == pytest.approx(elo)
+
+    def test_even_score_is_no_difference(self):
+        estimate = elo_estimate(MatchScore(wins=30, losses=30, draws=40))
+
+        assert estimate.elo == pytest.approx(0)
+        assert estimate.lower < 0 < estimate.upper
+
+    def test_interval_narrows_with_games(self):
+        few = elo_estimate(MatchScore(wins=6, losses=4, draws=10))
+        many = elo_estimate(MatchScore(wins=600, losses=400, draws=1000))
+
+        assert few.elo == pytest.approx(many.elo)
+        assert many.error < few.error
+
+    def test_same_result_every_game_has_finite_interval(self):
+        estimate = elo_estimate(MatchScore(wins=8))
+
+        assert 0 < estimate.lower < estimate.elo < estimate.upper
+
+    @pytest.mark.parametrize("score, decision", [
+        (MatchScore(wins=400, losses=300, draws=800), ACCEPT_H1),
+        (MatchScore(wins=300, losses=400, draws=800), ACCEPT_H0),
+        (MatchScore(wins=30, losses=29, draws=40), None),
+    ])
+    def test_sprt_decision(self, score, decision):
+        assert SPRT(0, 10).decide(score) == decision
+
+    def test_sprt_bounds_follow_error_rates(self):
+        strict, loose = SPRT(alpha=0.01, beta=0.01), SPRT(alpha=0.1, beta=0.1)
+
+        assert strict.upper_bound > loose.upper_bound
+        assert strict.lower_bound < loose.lower_bound
+
+
+class TestOpenings:
+
+    def test_openings_are_balanced_legal_lines(self):
+        openings = generate_openings(3, 4, depth=2, seed=1)
+
+        assert len(openings) == 3
+        assert len(set(openings)) == 3
+        for line in openings:
+            board = Board()
+            board.initial_setup()
+            for move in line:
+                assert move in board.get_move_sequences()
+                board.move_sequence(move)
+
+    def test_no_score_is_balanced_enough(self):
+        assert generate_openings(2, 4, depth=1, max_score=-1, seed=1, max_attempts=5) == []
+
+
+class TestTournament:
+
+    def test_round_robin_pairs_every_engine(self):
+        tournament = Tournament([STRONG, WEAK, RANDOM], games=2, workers=1)
+
+        assert [pairing.names for pairing in tournament.pairings] == [
+            ("strong", "weak"), ("strong", "random"), ("weak", "random")
+        ]
+
+    def test_gauntlet_pairs_the_first_engine(self):
+        tournament = Tournament([STRONG, WEAK, RANDOM], GAUNTLET, games=2, workers=1)
+
+        assert [pairing.names for pairing in tournament.pairings] == [("strong", "weak"), ("strong", "random")]
+
+    def test_engines_need_own_names(self):
+        with pytest.raises(ValueError, match="own name"):
+            Tournament([STRONG, STRONG])
+
+    def test_games_start_from_openings(self):
+        openings = generate_openings(2, 2, depth=1, seed=4)
+        result = Tournament([WEAK, RANDOM], games=4, openings=openings, workers=1, max_turns=6, seed=1).run()
+
+        assert [tuple(record.moves[:2]) for record in result.records] == [
+            openings[0], openings[0], openings[1], openings[1]
+        ]
+
+    def test_sprt_stops_decided_pairing(self, tournament_pool):
+        with Tournament(
+                [STRONG, RANDOM], games=40, sprt=SPRT(0, 200), executor=tournament_pool, workers=2,
+                opening_turns=2, seed=2
+        ) as tournament:
+            result = tournament.run()
+
+        pairing = result.pairings[0]
+        assert pairing.decision == ACCEPT_H1
+        assert len(result.records) < 40
+        assert pairing.score.games == len(result.records)
+
+    def test_standings_rank_engines(self, tournament_pool):
+        with Tournament(
+                [RANDOM, WEAK, STRONG], games=4, executor=tournament_pool, workers=2, opening_turns=2, seed=5
+        ) as tournament:
+            result = tournament.run()
+
+        standings = result.standings()
+        assert standings[0][0] == "strong"
+        assert sum(score.games for _, score, _ in standings) == 2 * len(result.records) == 24
+        assert [record.index for record in result.records] == list(range(12))
+
+
+class TestTournamentArguments:
+
+    def test_parse_heuristic_weights(self):
+        config = parse_engine_config("alphabeta:depth=2,piece=5,king=3")
+
+        assert config.heuristic.keywords == {"piece_score": 5, "king_modifier": 3}
+
+    def test_parse_sprt(self):
+        assert parse_sprt("0,10") == SPRT(0, 10)
@@ -0,0 +1,142 @@
+import random
+
+import pytest
+
+from board import Board
+from component.piece import Piece
+from conftest import p1, p2
+from exceptions.cell_not_found_error import CellNotFoundError
+from exceptions.illegal_move_error import IllegalMoveError
+from utils import moves, captures
+
+
+def setup_both_boards(pieces: list[tuple[str, str]], king_cells: list[str] = ()) -> tuple[Board, Board]:
+    """
+    Set up a cell based board and a bitboard based board with the same pieces.
+    """
+    cell_board, bit_board = Board(), Board(use_bitboard=True)
+    for owner, name in pieces:
+        for board in (cell_board, bit_board):
+            piece = Piece(owner)
+            if name in king_cells:
+                piece.set_king()
+            board.cell_manager.set_piece_by_name(name, piece)
+    return cell_board, bit_board
+
+
+def get_move_pairs(board: Board) -> list[tuple[str, str]]:
+    return sorted(
+        (move.src_name, target)
+        for move in board.get_available_moves()
+        for target in move.target_names
+    )
+
+
+class TestBitboardMoveGeneration:
+
+    def test_initial_setup_moves_match(self):
+        cell_board, bit_board = Board(), Board(use_bitboard=True)
+        cell_board.initial_setup()
+        bit_board.initial_setup()
+
+        assert bit_board.get_available_moves() == cell_board.get_available_moves()
+        assert str(bit_board) == str(cell_board)
+
+    @pytest.mark.parametrize("pieces, king_cells, expected_moves", [
+        ([(p1, "a11"), (p2, "a88")], [], moves("a11", ["a22"])),
+        ([(p1, "a13"), (p2, "a24")], [], moves("a13", ["a24"], True, [captures("a24", "a35")])),
+        ([(p1, "a33"), (p2, "a88")], ["a33"], moves("a33", ["a24", "a22", "a44", "a42"])),
+        ([(p1, "a33"), (p2, "a22"), (p2, "a44")], ["a33"],
+         moves("a33", ["a22", "a44"], True, [captures("a22", "a11"), captures("a44", "a55")])),
+    ])
+    def test_generates_same_moves_as_cell_manager(self, pieces, king_cells, expected_moves):
+        cell_board, bit_board = setup_both_boards(pieces, king_cells)
+
+        assert cell_board.get_available_moves() == expected_moves
+        assert bit_board.get_available_moves() == expected_moves
+
+    def test_chained_cell_restricts_moves(self):
+        cell_board, bit_board = setup_both_boards([(p1, "a11"), (p1, "a17"), (p2, "a22"), (p2, "a44")])
+        for board in (cell_board, bit_board):
+            board.move_piece("a11", "a22")
+
+        assert bit_board.game.chaining_cell_name == "a33"
+        assert bit_board.get_available_moves() == cell_board.get_available_moves()
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_games_match_cell_manager(self, seed):
+        rng = random.Random(seed)
+        cell_board, bit_board = Board(), Board(use_bitboard=True)
+        cell_board.initial_setup()
+        bit_board.initial_setup()
+
+        for _ in range(80):
+            pairs = get_move_pairs(cell_board)
+            assert get_move_pairs(bit_board) == pairs
+            if not pairs:
+                break
+            src, tar = rng.choice(pairs)
+            cell_board.move_piece(src, tar)
+            bit_board.move_piece(src, tar)
+            assert bit_board.get_current_player_turn() == cell_board.get_current_player_turn()
+            assert bit_board.game.chaining_cell_name == cell_board.game.chaining_cell_name
+
+        assert str(bit_board) == str(cell_board)
+
+
+class TestBitboardMovePiece:
+
+    def test_capture_removes_opponent(self):
+        _, bit_board = setup_both_boards([(p1, "a11"), (p2, "a22"), (p2, "a66")])
+        bit_board.move_piece("a11", "a22")
+
+        assert not bit_board.cell_manager.get_cell_by_name("a11").has_piece()
+        assert not bit_board.cell_manager.get_cell_by_name("a22").has_piece()
+        assert bit_board.cell_manager.get_cell_by_name("a33").get_piece_owner() == p1
+        assert bit_board.get_current_player_turn() == p2
+
+    def test_promotion_to_king(self):
+        _, bit_board = setup_both_boards([(p1, "a71"), (p2, "a15")])
+        bit_board.move_piece("a71", "a82")
+
+        assert bit_board.cell_manager.get_cell_by_name("a82").is_king()
+
+    @pytest.mark.parametrize("pieces, source, target, error, message", [
+        ([(p1, "a11")], "a11", "a11", IllegalMoveError, "Cannot move to the same cell"),
+        ([(p1, "a22")], "a22", "a11", IllegalMoveError, "Normal piece cannot move in opposite direction"),
+        ([(p1, "a13")], "a13", "a33", IllegalMoveError, "Non capture move is a single cell distance."),
+        ([(p1, "a13"), (p2, "a24")], "a13", "a22", IllegalMoveError,
+         "Cannot make a normal move when capture is available"),
+        ([(p1, "a17"), (p2, "a28")], "a17", "a28", CellNotFoundError,
+         "Cannot capture if after target cell out of bounds"),
+        ([(p1, "a11")], "a11", "a199", CellNotFoundError, "Cell a199 not found"),
+    ])
+    def test_invalid_moves_raise(self, pieces, source, target, error, message):
+        _, bit_board = setup_both_boards(pieces)
+
+        with pytest.raises(error, match=message):
+            bit_board.move_piece(source, target)
+
+    @pytest.mark.parametrize("source, target", [("a99", "a11"), ("a12", "a99"), (None, "a11"), ("a34", "a45")])
+    def test_unknown_cells_raise_cell_not_found(self, source, target):
+        for board in setup_both_boards([(p1, "a11"), (p2, "a88")]):
+            with pytest.raises(CellNotFoundError, match="not found"):
+                board.move_piece(source, target)
+
+    def test_position_is_three_integers(self):
+        bit_board = Board(use_bitboard=True)
+        bit_board.initial_setup()
+        manager = bit_board.cell_manager
+
+        assert bin(manager.p1).count("1") == 12
+        assert bin(manager.p2).count("1") == 12
+        assert manager.kings == 0
+        assert manager.p1 & manager.p2 == 0
+
+    def test_snapshot_and_hash_do_not_build_cells(self, monkeypatch):
+        cell_board, bit_board = setup_both_boards([(p1, "a31"), (p2, "a44"), (p2, "a66")], king_cells=["a66"])
+        monkeypatch.setattr(type(bit_board.cell_manager), "cell_map", property(lambda _: pytest.fail("built cells")))
+
+        assert bit_board.get_position_snapshot().pieces == cell_board.get_position_snapshot().pieces
+        assert bit_board.compute_hash_key() == cell_board.compute_hash_key()
+        assert bit_board.cell_manager.get_cell_by_index(2, 3).name == "a34"
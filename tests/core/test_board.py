@@ -2,7 +2,8 @@ import pytest
 
 from component import piece
 from conftest import put_piece_on_cell_and_return_cell, get_cell_by_index
-from component.game import Player as P
+from component.cell import Cell
+from component.game import Game, Player as P
 from component.piece import Piece
 from utils import index_offset
 
@@ -118,3 +119,24 @@ class TestPiece:
         cell, cell_piece = piece_placement_setup(board_setup, piece_setup)
         cell.remove_piece_from_game()
         assert cell_piece.playable is False
+
+    def test_king_state_is_kept_per_piece(self):
+        king, normal = Piece(P.P1.name), Piece(P.P1.name)
+        king.set_king()
+
+        assert king.is_king() and not normal.is_king()
+        # the king flag is state, not identity
+        assert king == normal
+
+
+class TestSlottedTypes:
+
+    @pytest.mark.parametrize("instance", [
+        Piece(P.P1.name), Cell(1, 1), Game()
+    ], ids=["piece", "cell", "game"])
+    def test_has_no_instance_dict(self, instance):
+        assert not hasattr(instance, "__dict__")
+
+    def test_cannot_add_attributes(self):
+        with pytest.raises(AttributeError):
+            Piece(P.P1.name).owner = P.P2.name
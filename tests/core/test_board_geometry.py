@@ -0,0 +1,72 @@
+import pytest
+
+from board import Board
+from component.game import P
+from component.piece import Piece
+from managers.board_geometry import get_board_geometry, get_direction_index, ALL_DIRECTIONS, FORWARD_DIRECTIONS
+
+
+class TestBoardGeometry:
+
+    def test_has_a_square_per_playable_cell(self):
+        geometry = get_board_geometry()
+
+        assert len(geometry.names) == 32
+        assert geometry.names[0] == "a11"
+        assert geometry.names[-1] == "a88"
+        assert all(geometry.square_ids[name] == square for square, name in enumerate(geometry.names))
+
+    def test_geometry_is_built_once_per_size(self):
+        assert get_board_geometry(8, 8) is get_board_geometry()
+
+    @pytest.mark.parametrize("name, directions, expected_names", [
+        ("a11", ALL_DIRECTIONS, ["a22"]),
+        ("a33", ALL_DIRECTIONS, ["a24", "a22", "a44", "a42"]),
+        ("a13", FORWARD_DIRECTIONS[P.P1.name], ["a24", "a22"]),
+        ("a82", FORWARD_DIRECTIONS[P.P2.name], ["a73", "a71"]),
+        ("a88", FORWARD_DIRECTIONS[P.P1.name], []),
+    ])
+    def test_neighbour_names(self, name, directions, expected_names):
+        assert get_board_geometry().get_neighbour_names(name, directions) == expected_names
+
+    @pytest.mark.parametrize("source, over, landing", [
+        ("a11", "a22", "a33"),
+        ("a13", "a22", "a31"),
+        ("a82", "a73", "a64"),
+        ("a17", "a28", None),
+    ])
+    def test_jump_tables(self, source, over, landing):
+        geometry = get_board_geometry()
+        direction = geometry.get_direction(source, over)
+        square = geometry.square_ids[source]
+
+        assert geometry.names[geometry.neighbours[square][direction]] == over
+        landing_square = geometry.landings[square][direction]
+        assert (geometry.names[landing_square] if landing_square is not None else None) == landing
+
+    def test_direction_only_between_adjacent_cells(self):
+        geometry = get_board_geometry()
+
+        assert geometry.get_direction("a11", "a22") == get_direction_index(1, 1)
+        assert geometry.get_direction("a11", "a33") is None
+        assert geometry.get_direction("a11", "a11") is None
+
+    def test_shift_masks_agree_with_neighbour_table(self):
+        geometry = get_board_geometry()
+
+        for direction in ALL_DIRECTIONS:
+            for mask, shift in geometry.step_masks[direction]:
+                for square in range(len(geometry.names)):
+                    if mask >> square & 1:
+                        assert geometry.neighbours[square][direction] == square + shift
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    def test_moves_use_the_geometry_of_the_board(self, use_bitboard):
+        # the capture lands on a99, a square a 10x10 board has and an 8x8 board does not
+        board = Board(10, 10, use_bitboard=use_bitboard)
+        board.cell_manager.set_piece_by_name("a77", Piece(P.P1.name))
+        board.cell_manager.set_piece_by_name("a88", Piece(P.P2.name))
+
+        board.move_piece("a77", "a88")
+
+        assert board.get_position_snapshot().pieces == (("a99", P.P1.name, False),)
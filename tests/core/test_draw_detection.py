@@ -0,0 +1,89 @@
+import pytest
+
+from ai.alpha_beta_search import AlphaBetaSearch
+from board import Board
+from component.game import NO_PROGRESS_TURN_LIMIT, REPETITION_LIMIT
+from conftest import setup_board, p1, p2, get_cell_by_name
+from state.position_snapshot import PositionSnapshot
+
+# two kings walking back and forth, every fourth turn repeats the position
+KING_SHUFFLE = [("a11", "a22"), ("a88", "a77"), ("a22", "a11"), ("a77", "a88")]
+
+
+def setup_kings(board: Board) -> None:
+    board.load_position_snapshot(
+        PositionSnapshot(board.rows, board.columns, (("a11", p1, True), ("a88", p2, True)), p1)
+    )
+
+
+class TestDrawDetection:
+
+    def test_initial_position_is_counted_once(self, board_setup):
+        board_setup.initial_setup()
+
+        assert board_setup.game.position_counts == {board_setup.game.hash_key: 1}
+        assert board_setup.game.no_progress_turns == 0
+
+    def test_repeated_king_moves_draw_the_game(self, board_setup):
+        setup_kings(board_setup)
+
+        for repetition in range(1, REPETITION_LIMIT):
+            assert not board_setup.game.is_repetition()
+            for src, tar in KING_SHUFFLE:
+                board_setup.move_piece(src, tar)
+            assert board_setup.game.position_counts[board_setup.game.hash_key] == repetition + 1
+
+        assert board_setup.game.is_draw_by_rule()
+        assert board_setup.is_game_end(board_setup.get_available_moves(), [object()])
+        assert board_setup.game.winner is None
+        assert board_setup.is_game_over()
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    def test_king_moves_count_turns_without_progress(self, use_bitboard):
+        board = Board(use_bitboard=use_bitboard)
+        setup_kings(board)
+
+        for turn in range(NO_PROGRESS_TURN_LIMIT):
+            src, tar = KING_SHUFFLE[turn % len(KING_SHUFFLE)]
+            board.make_move(src, tar)
+
+        assert board.game.no_progress_turns == NO_PROGRESS_TURN_LIMIT
+        assert board.game.is_no_progress_draw()
+
+    def test_man_move_and_capture_reset_the_count(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p1, "a31"), (p2, "a66"), (p2, "a88")])
+        get_cell_by_name(board_setup, "a11").set_king()
+        get_cell_by_name(board_setup, "a88").set_king()
+        board_setup.refresh_hash_key()
+
+        board_setup.move_piece("a11", "a22")
+        board_setup.move_piece("a88", "a77")
+        assert board_setup.game.no_progress_turns == 2
+
+        board_setup.move_piece("a31", "a42")
+        assert board_setup.game.no_progress_turns == 0
+
+    def test_unmake_restores_the_history(self, board_setup):
+        setup_kings(board_setup)
+        counts = dict(board_setup.game.position_counts)
+
+        records = [board_setup.make_move(src, tar) for src, tar in KING_SHUFFLE]
+        assert board_setup.game.is_repetition(2)
+        for record in reversed(records):
+            board_setup.unmake_move(record)
+
+        assert board_setup.game.position_counts == counts
+        assert board_setup.game.no_progress_turns == 0
+
+    def test_search_scores_a_repetition_as_a_draw(self, board_setup):
+        setup_kings(board_setup)
+        # the kings were here before, moving back repeats the position
+        for src, tar in KING_SHUFFLE[:3]:
+            board_setup.move_piece(src, tar)
+        search = AlphaBetaSearch(board_setup)
+
+        record = board_setup.make_move("a77", "a88")
+        score, line = search.search_window(3, ply=1)
+        board_setup.unmake_move(record)
+
+        assert (score, line) == (0, [])
@@ -0,0 +1,145 @@
+import random
+
+import pytest
+
+from board import Board
+from component.game import P
+from conftest import p1, p2, setup_board, get_cell_by_name
+
+
+def snapshot(board: Board) -> tuple:
+    """
+    Capture the position and the game state of the board for comparison.
+    """
+    pieces = tuple(
+        (name, cell.get_piece_owner(), cell.is_king())
+        for name, cell in sorted(board.cell_manager.cell_map.items())
+        if cell.has_piece()
+    )
+    game = board.game
+    return (
+        pieces, game.current_player, game.turn_counter, game.is_chained_move, game.chaining_cell_name,
+        dict(game.position_counts), game.no_progress_turns
+    )
+
+
+def get_move_pairs(board: Board) -> list[tuple[str, str]]:
+    return [
+        (move.src_name, target)
+        for move in board.get_available_moves()
+        for target in move.target_names
+    ]
+
+
+class TestMakeUnmake:
+
+    def test_normal_move_record(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a88")])
+        record = board_setup.make_move("a11", "a22")
+
+        assert (record.src_name, record.dest_name) == ("a11", "a22")
+        assert record.captured_name is None
+        assert not record.promoted
+        assert board_setup.game.current_player == P.P2
+
+    def test_capture_move_record(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a88")])
+        captured_piece = get_cell_by_name(board_setup, "a22").piece
+
+        record = board_setup.make_move("a11", "a22")
+
+        assert record.dest_name == "a33"
+        assert record.captured_name == "a22"
+        assert record.captured_piece is captured_piece
+        assert not get_cell_by_name(board_setup, "a22").has_piece()
+
+    def test_chain_capture_keeps_player(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a44")])
+        record = board_setup.make_move("a11", "a22")
+
+        assert record.is_chain_capture
+        assert board_setup.game.current_player == P.P1
+        assert board_setup.game.chaining_cell_name == "a33"
+
+        board_setup.unmake_move(record)
+        assert board_setup.game.chaining_cell_name is None
+        assert not board_setup.game.is_chained_move
+
+    def test_promotion_is_undone(self, board_setup):
+        setup_board(board_setup, [(p1, "a71"), (p2, "a15")])
+        piece = get_cell_by_name(board_setup, "a71").piece
+
+        record = board_setup.make_move("a71", "a82")
+        assert record.promoted
+        assert piece.is_king()
+
+        board_setup.unmake_move(record)
+        assert not piece.is_king()
+        assert get_cell_by_name(board_setup, "a71").piece is piece
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    @pytest.mark.parametrize("seed", range(3))
+    def test_unmaking_a_game_restores_the_start(self, use_bitboard, seed):
+        rng = random.Random(seed)
+        board = Board(use_bitboard=use_bitboard)
+        board.initial_setup()
+        initial = snapshot(board)
+
+        records, states = [], []
+        for _ in range(60):
+            pairs = get_move_pairs(board)
+            if not pairs:
+                break
+            states.append(snapshot(board))
+            records.append(board.make_move(*rng.choice(pairs)))
+
+        while records:
+            board.unmake_move(records.pop())
+            assert snapshot(board) == states.pop()
+
+        assert snapshot(board) == initial
+
+    def test_make_move_matches_move_piece(self):
+        rng = random.Random(7)
+        made, moved = Board(), Board()
+        made.initial_setup()
+        moved.initial_setup()
+
+        for _ in range(60):
+            pairs = get_move_pairs(moved)
+            if not pairs:
+                break
+            src, tar = rng.choice(pairs)
+            made.make_move(src, tar)
+            moved.move_piece(src, tar)
+            assert snapshot(made) == snapshot(moved)
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    def test_material_counts_follow_moves(self, use_bitboard):
+        rng = random.Random(11)
+        board = Board(use_bitboard=use_bitboard)
+        board.initial_setup()
+
+        records, counts = [], []
+        for _ in range(80):
+            pairs = get_move_pairs(board)
+            if not pairs:
+                break
+            counts.append(board.compute_material())
+            records.append(board.make_move(*rng.choice(pairs)))
+            assert board.game.material == board.compute_material()
+
+        while records:
+            board.unmake_move(records.pop())
+            assert board.game.material == counts.pop()
+
+    def test_captured_king_is_counted_back(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a88")])
+        get_cell_by_name(board_setup, "a22").set_king()
+        board_setup.refresh_material()
+
+        record = board_setup.make_move("a11", "a22")
+        assert board_setup.game.material[p2].kings == 0
+
+        board_setup.unmake_move(record)
+        assert (board_setup.game.material[p2].men, board_setup.game.material[p2].kings) == (1, 1)
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from board import Board
+from component.game import P
+from conftest import setup_board, p1, p2
+from state.move_sequence import MoveSequence
+from test_make_unmake import snapshot
+
+
+class TestMoveSequences:
+
+    def test_chain_capture_is_a_single_move(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a44"), (p2, "a88")])
+
+        sequences = board_setup.get_move_sequences()
+
+        assert sequences == [MoveSequence("a11", ("a33", "a55"), ("a22", "a44"))]
+        assert sequences[0].hops == [("a11", "a22"), ("a33", "a44")]
+        assert str(sequences[0]) == "a11 -> a22 -> a33 -> a44 -> a55"
+
+    def test_branching_chain_gives_every_sequence(self, board_setup):
+        # after taking a22 the piece on a33 can go on over a42 or a44
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a42"), (p2, "a44"), (p2, "a88")])
+
+        sequences = board_setup.get_move_sequences()
+
+        assert {str(sequence) for sequence in sequences} == {
+            "a11 -> a22 -> a33 -> a42 -> a51",
+            "a11 -> a22 -> a33 -> a44 -> a55",
+        }
+
+    def test_normal_moves_and_promotion(self, board_setup):
+        setup_board(board_setup, [(p1, "a71"), (p2, "a15")])
+
+        sequences = board_setup.get_move_sequences()
+
+        assert sequences == [MoveSequence("a71", ("a82",), promotes=True)]
+        assert not sequences[0].is_capture
+
+    def test_capture_ending_on_last_row_promotes(self, board_setup):
+        setup_board(board_setup, [(p1, "a64"), (p2, "a75"), (p2, "a15")])
+
+        sequence, = board_setup.get_move_sequences()
+        board_setup.make_sequence(sequence)
+
+        assert sequence.promotes
+        assert sequence.dest_name == "a86"
+        assert board_setup.cell_manager.get_cell_by_name("a86").is_king()
+
+    def test_generation_leaves_board_unchanged(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a42"), (p2, "a44"), (p2, "a88")])
+        before = snapshot(board_setup)
+
+        board_setup.get_move_sequences()
+
+        assert snapshot(board_setup) == before
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    def test_make_and_unmake_sequences(self, use_bitboard):
+        rng = random.Random(11)
+        board = Board(use_bitboard=use_bitboard)
+        board.initial_setup()
+
+        played, states = [], []
+        for _ in range(40):
+            sequences = board.get_move_sequences()
+            if not sequences:
+                break
+            player = board.game.current_player
+            states.append(snapshot(board))
+            played.append(board.make_sequence(rng.choice(sequences)))
+            # a sequence always completes the turn
+            assert board.game.current_player != player
+            assert board.game.chaining_cell_name is None
+
+        while played:
+            board.unmake_sequence(played.pop())
+            assert snapshot(board) == states.pop()
+
+    def test_move_sequence_validates_every_hop(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a44"), (p2, "a88")])
+
+        board_setup.move_sequence(board_setup.get_move_sequences()[0])
+
+        assert board_setup.cell_manager.get_cell_by_name("a55").get_piece_owner() == p1
+        assert board_setup.game.current_player == P.P2
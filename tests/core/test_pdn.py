@@ -0,0 +1,186 @@
+import io
+
+import pytest
+
+from ai.match_runner import EngineConfig, GameTask, play_game, RANDOM_ENGINE
+from board import Board
+from component.game import P
+from exceptions.pdn_error import PDNError
+from managers.pdn_util import (
+    square_name, square_number, parse_move, parse_fen, to_fen, resolve_move, replay_pdn_game, iter_pdn_games,
+    read_pdn, write_pdn, format_pdn_game, to_pdn_game, INITIAL_FEN
+)
+from state.pdn_game import PDNGame, PDNMove, BLACK_WINS, WHITE_WINS, DRAW, UNFINISHED
+from state.position_snapshot import PositionSnapshot
+
+GAMES = """
+[Event "Club match"]
+[Black "Ann"]
+[White "Bob"]
+[Result "1-0"]
+1. 11-15 23-19 {a quiet
+opening, see (the notes)} 2. 8-11 22-17 $1 (2... 9-14 17-13) 3. 9-13 17-14! ; trades
+4. 10x17 21x14 1-0
+
+[Event "Unfinished"]
+1.9-14 22-17 *
+[Event "No result"]
+1. 11-16
+"""
+
+
+def new_board() -> Board:
+    board = Board()
+    board.initial_setup()
+    return board
+
+
+class TestSquareNumbers:
+
+    @pytest.mark.parametrize("number, name", [(1, "a17"), (4, "a11"), (5, "a28"), (11, "a33"), (32, "a82")])
+    def test_square_number_to_cell_name(self, number, name):
+        assert square_name(number) == name
+        assert square_number(name) == number
+
+    def test_black_starts_on_first_squares(self):
+        board = new_board()
+
+        cells = board.cell_manager.get_player_cells(P.P1.name)
+
+        assert {square_number(cell.name) for cell in cells} == set(range(1, 13))
+
+    @pytest.mark.parametrize("number", [0, 33])
+    def test_square_off_board(self, number):
+        with pytest.raises(PDNError):
+            square_name(number)
+
+
+class TestReadPDN:
+
+    def test_games_are_read_one_at_a_time(self):
+        games = iter_pdn_games(io.StringIO(GAMES))
+
+        first = next(games)
+        assert first.tags == {"Event": "Club match", "Black": "Ann", "White": "Bob", "Result": "1-0"}
+        assert [str(move) for move in first.moves] == [
+            "11-15", "23-19", "8-11", "22-17", "9-13", "17-14", "10x17", "21x14"
+        ]
+        assert first.result == BLACK_WINS
+        assert [(game.tags["Event"], len(game.moves), game.result) for game in games] == [
+            ("Unfinished", 2, UNFINISHED), ("No result", 1, UNFINISHED)
+        ]
+
+    def test_lines_are_read_lazily(self):
+        def lines():
+            yield from ['[Event "first"]', "1. 11-15 1-0"]
+            raise AssertionError("read past the first game")
+
+        assert next(iter_pdn_games(lines())).result == BLACK_WINS
+
+    @pytest.mark.parametrize("lines", [
+        ['[Event "a"][Result "*"]', '[Event "b"] 1. 11-15 23-19 1-0'],
+        ['[Event "a"]', '[Result "*"]', "", '[Site "b"]', "1. 11-15 23-19 1-0"]
+    ])
+    def test_game_without_moves_before_next_tags(self, lines):
+        games = list(iter_pdn_games(lines))
+
+        assert [(len(game.tags), len(game.moves), game.result) for game in games] == [
+            (2, 0, UNFINISHED), (1, 2, BLACK_WINS)
+        ]
+
+    @pytest.mark.parametrize("text, move", [
+        ("11-15", PDNMove((11, 15))), ("12.15x24x31!?", PDNMove((15, 24, 31), True)),
+        ("9x18", PDNMove((9, 18), True))
+    ])
+    def test_parse_move(self, text, move):
+        assert parse_move(text) == move
+
+    @pytest.mark.parametrize("result, expected", [("0-2", WHITE_WINS), ("1-1", DRAW), ("1/2-1/2", DRAW)])
+    def test_results_of_other_variants(self, result, expected):
+        assert next(iter_pdn_games([f"1. 11-15 {result}"])).result == expected
+
+    def test_unreadable_move_names_line(self):
+        with pytest.raises(PDNError, match="line 2"):
+            list(iter_pdn_games(['[Event "bad"]', "1. 11-15 e4 *"]))
+
+    def test_replay_game(self):
+        board = Board()
+        game = next(iter_pdn_games(io.StringIO(GAMES)))
+
+        sequences = replay_pdn_game(board, game)
+
+        assert [str(sequence) for sequence in sequences[-2:]] == ["a35 -> a46 -> a57", "a68 -> a57 -> a46"]
+        assert board.game.current_player == P.P1
+        assert len(board.cell_manager.get_player_cells(P.P1.name)) == 11
+
+    def test_illegal_move(self):
+        with pytest.raises(PDNError, match="Illegal move 12-15"):
+            resolve_move(new_board(), PDNMove((12, 15)))
+
+
+class TestFEN:
+
+    def test_initial_position(self):
+        snapshot = parse_fen(INITIAL_FEN)
+
+        assert snapshot.current_player == P.P1.name
+        assert Board.from_position_snapshot(snapshot).get_move_sequences() == new_board().get_move_sequences()
+
+    def test_kings_and_player_to_move(self):
+        snapshot = parse_fen("W:W18,K27:BK1,12.")
+
+        assert snapshot == PositionSnapshot(
+            8, 8, (("a55", P.P2.name, False), ("a73", P.P2.name, True), ("a17", P.P1.name, True),
+                   ("a31", P.P1.name, False)), P.P2.name
+        )
+        assert to_fen(snapshot) == "W:W18,K27:BK1,12"
+
+    @pytest.mark.parametrize("fen", ["X:W1:B2", "B:W1:Q2", "B:Wx:B2"])
+    def test_unreadable_fen(self, fen):
+        with pytest.raises(PDNError):
+            parse_fen(fen)
+
+    def test_game_from_position(self):
+        game = next(iter_pdn_games(['[FEN "W:W18:B14"]', "1... 18x9 0-1"]))
+        board = Board()
+
+        replay_pdn_game(board, game)
+
+        assert [name for name, _, _ in board.get_position_snapshot().pieces] == ["a37"]
+
+
+class TestWritePDN:
+
+    def test_played_game_reads_back(self, tmp_path):
+        random = EngineConfig("random", RANDOM_ENGINE)
+        records = [play_game(GameTask(index, random, random, seed=index)) for index in range(3)]
+        path = str(tmp_path / "games.pdn")
+
+        write_pdn(path, (record.to_pdn() for record in records[:2]))
+        write_pdn(path, [records[2].to_pdn()], append=True)
+        games = list(read_pdn(path))
+
+        assert [game.tags["Round"] for game in games] == ["1", "2", "3"]
+        for record, game in zip(records, games):
+            assert replay_pdn_game(Board(), game) == record.moves
+            assert game.result == {P.P1.name: BLACK_WINS, P.P2.name: WHITE_WINS, None: DRAW}[record.winner]
+
+    def test_moves_are_numbered_and_wrapped(self):
+        game = PDNGame({"Event": "long", "Black": "Ann"}, [PDNMove((11, 15)), PDNMove((23, 19))] * 20, DRAW)
+
+        text = format_pdn_game(game)
+
+        assert text.startswith('[Event "long"]\n[Black "Ann"]\n[Result "1/2-1/2"]\n1. 11-15 23-19 2. 11-15')
+        assert max(len(line) for line in text.splitlines()) <= 79
+        assert "20. 11-15 23-19" in text
+        assert text.rstrip().endswith("1/2-1/2")
+
+    def test_start_position_is_written_as_fen(self):
+        board = Board.from_position_snapshot(parse_fen("W:W18:B14"))
+        sequence = board.get_move_sequences()[0]
+
+        game = to_pdn_game([sequence], WHITE_WINS, start=board.get_position_snapshot())
+
+        assert game.tags["FEN"] == "W:W18:B14"
+        assert "1... 18x9 0-1" in format_pdn_game(game)
+        assert "FEN" not in to_pdn_game([], start=new_board().get_position_snapshot()).tags
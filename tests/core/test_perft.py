@@ -0,0 +1,65 @@
+import pytest
+
+from board import Board
+from exceptions.cell_not_found_error import CellNotFoundError
+from exceptions.illegal_move_error import IllegalMoveError
+from conftest import setup_board, p1, p2
+from perft import perft, divide, run_perft, main, REFERENCE_COUNTS
+
+
+class TestPerft:
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    @pytest.mark.parametrize("depth", [1, 2, 3, 4])
+    def test_initial_setup_matches_reference(self, use_bitboard, depth):
+        board = Board(use_bitboard=use_bitboard)
+        board.initial_setup()
+
+        assert perft(board, depth) == REFERENCE_COUNTS[depth - 1]
+
+    def test_divide_sums_to_perft(self, board_setup):
+        board_setup.initial_setup()
+
+        counts = divide(board_setup, 3)
+
+        assert len(counts) == 7
+        assert sum(counts.values()) == perft(board_setup, 3)
+
+    def test_chain_capture_counts_as_one_move(self, board_setup):
+        # a11 has to capture a22 and then a44, the a88 piece is left with a single move
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a44"), (p2, "a88")])
+
+        assert {str(move): count for move, count in divide(board_setup, 1).items()} == {
+            "a11 -> a22 -> a33 -> a44 -> a55": 1
+        }
+        assert perft(board_setup, 2) == 1
+
+    def test_board_is_left_unchanged(self, board_setup):
+        board_setup.initial_setup()
+        before = board_setup.get_position_snapshot()
+
+        run_perft(board_setup, 3)
+
+        assert board_setup.get_position_snapshot() == before
+
+    def test_result_reports_speed(self, board_setup):
+        board_setup.initial_setup()
+
+        result = run_perft(board_setup, 2)
+
+        assert result.nodes == result.expected == 49
+        assert result.nodes_per_second > 0
+
+    def test_command_line_checks_reference(self, capsys):
+        assert main(["--depth", "3", "--bitboard"])
+        assert "depth 3: 302 nodes" in capsys.readouterr().out
+
+    def test_move_generation_raises_no_errors(self, board_setup, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("move generation should not raise errors")
+
+        monkeypatch.setattr(IllegalMoveError, "__init__", fail)
+        monkeypatch.setattr(CellNotFoundError, "__init__", fail)
+        board_setup.initial_setup()
+
+        assert perft(board_setup, 4) == REFERENCE_COUNTS[3]
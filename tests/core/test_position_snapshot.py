@@ -0,0 +1,72 @@
+import pickle
+
+import pytest
+
+from board import Board
+from component.game import P
+from conftest import setup_board, p1, p2
+
+
+class TestPositionSnapshot:
+
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    def test_snapshot_round_trip(self, use_bitboard):
+        board = Board(use_bitboard=use_bitboard)
+        board.initial_setup()
+        board.make_move("a33", "a44")
+
+        snapshot = pickle.loads(pickle.dumps(board.get_position_snapshot()))
+        copy = Board.from_position_snapshot(snapshot)
+
+        assert str(copy) == str(board)
+        assert copy.game.current_player == P.P2
+        assert copy.game.turn_counter == 1
+        assert copy.game.hash_key == board.game.hash_key
+
+    def test_snapshot_keeps_kings_and_chain(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a44")])
+        board_setup.cell_manager.get_cell_by_name("a44").set_king()
+        board_setup.make_move("a11", "a22")
+
+        copy = Board.from_position_snapshot(board_setup.get_position_snapshot())
+
+        assert copy.cell_manager.get_cell_by_name("a44").is_king()
+        assert copy.game.chaining_cell_name == "a33"
+        assert copy.game.is_chained_move
+        assert copy.get_available_moves() == board_setup.get_available_moves()
+
+    def test_loading_replaces_position(self, board_setup):
+        board_setup.initial_setup()
+        empty = Board().get_position_snapshot()
+
+        board_setup.load_position_snapshot(empty)
+
+        assert board_setup.get_position_snapshot() == empty
+
+
+class TestPositionEncoding:
+
+    def test_encode_initial_setup(self, board_setup):
+        board_setup.initial_setup()
+
+        encoded = board_setup.encode_position()
+
+        assert encoded == [1] * 12 + [0] * 8 + [-1] * 12
+
+    def test_encode_kings(self, board_setup):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a88"), (p2, "a13")])
+        board_setup.cell_manager.get_cell_by_name("a88").set_king()
+
+        encoded = board_setup.encode_position()
+
+        assert (encoded[0], encoded[1], encoded[31]) == (1, -1, -2)
+        assert encoded.count(0) == 29
+
+    def test_backends_encode_the_same(self):
+        cells, bits = Board(), Board(use_bitboard=True)
+        for board in (cells, bits):
+            board.initial_setup()
+            for move in (("a33", "a44"), ("a66", "a55"), ("a44", "a55")):
+                board.move_piece(*move)
+
+        assert cells.encode_position() == bits.encode_position()
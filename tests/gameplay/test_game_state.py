@@ -1,8 +1,10 @@
 import pytest
 
-from component.game import P
-from conftest import setup_piece_on_cell_by_name_and_owner, p1, p2
-from main import GamePlay
+from board import Board
+from component.game import P, NO_PROGRESS_TURN_LIMIT
+from conftest import setup_piece_on_cell_by_name_and_owner, setup_board, p1, p2
+from main import GamePlay, parse_arguments
+from managers.pdn_util import read_pdn, replay_pdn_game
 from test_user_interaction import mock_user_input
 
 
@@ -15,10 +17,16 @@ def game_instance(board=None):
 
 
 class TestGameState:
-    # todo
 
-    def test_can_undo_action(self):
-        pass
+    def test_can_undo_action(self, monkeypatch, game_instance, capsys):
+        mock_user_input(monkeypatch, "1\nu\nq")
+        game_instance.init_game()
+
+        game_instance.game_loop()
+
+        assert "Move taken back." in capsys.readouterr().out
+        assert game_instance.moves == []
+        assert game_instance.board.game.current_player == P.P1
 
     def test_game_exit(self, monkeypatch, game_instance, capsys):
         game_quit_msg = "Quitting the game."
@@ -75,10 +83,127 @@ class TestGameState:
         assert end_message in capsys.readouterr().out
 
         pass
+
+    def test_no_progress_draw_ends_game_loop(self, board_setup, game_instance, capsys):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a88")])
+        board_setup.game.no_progress_turns = NO_PROGRESS_TURN_LIMIT
+        game_instance.board = board_setup
+        game_instance.game_loop()
+
+        assert board_setup.game.winner is None
+        assert "The game is a draw." in capsys.readouterr().out
+
+    def test_ai_plays_its_turn(self, monkeypatch, capsys):
+        game = GamePlay(ai_player=p1, ai_depth=2, ai_move_time=1)
+        mock_user_input(monkeypatch, "q")
+        game.init_game()
+        game.game_loop()
+
+        assert "AI plays" in capsys.readouterr().out
+        assert game.board.game.current_player == P.P2
+
+    def test_mcts_engine_plays_its_turn(self, monkeypatch, capsys):
+        game = GamePlay(ai_player=p1, ai_move_time=0.1, engine="mcts")
+        mock_user_input(monkeypatch, "q")
+        game.init_game()
+        game.game_loop()
+
+        assert "AI plays" in capsys.readouterr().out
+        assert game.board.game.current_player == P.P2
+
+    def test_alpha_beta_search_over_workers(self, monkeypatch, capsys):
+        game = GamePlay(ai_player=p1, ai_depth=2, ai_move_time=1, workers=2, ponder=False)
+        mock_user_input(monkeypatch, "q")
+        game.init_game()
+        try:
+            game.game_loop()
+        finally:
+            game.parallel_search.close()
+
+        assert "AI plays" in capsys.readouterr().out
+        assert game.parallel_search.board is game.board
+        assert game.board.game.current_player == P.P2
+
+    def test_search_boards_keep_draw_history(self):
+        game = GamePlay(ai_player=p1, ai_move_time=0.05, engine="mcts")
+        game.init_game()
+        history = game.board.game
+        history.no_progress_turns = 12
+        history.position_counts[123] = 2
+
+        game.choose_ai_move()
+        game.engine = "alphabeta"
+        game.expected_reply = game.board.get_move_sequences()[0]
+        game.start_pondering()
+        game.ponderer.stop()
+
+        for board in (game.mcts.board, game.ponder_board):
+            assert board.game.position_counts[123] == 2
+        assert game.mcts.board.game.no_progress_turns == 12
+        # the pondered reply is a man move, which is progress
+        assert game.ponder_board.game.no_progress_turns == 0
+
+    def test_parse_ai_arguments(self):
+        arguments = parse_arguments(["--ai", p2, "--depth", "3", "--time", "0.5"])
+
+        assert (arguments.ai, arguments.depth, arguments.time) == (p2, 3, 0.5)
+        assert parse_arguments([]).ai is None
+        assert parse_arguments(["--book", "book.bin"]).book == "book.bin"
+        assert parse_arguments(["--tablebase", "endgame.bin"]).tablebase == "endgame.bin"
+        assert parse_arguments(["--engine", "mcts"]).engine == "mcts"
+        assert parse_arguments([]).engine == "alphabeta"
+        assert parse_arguments(["--no-ponder"]).ponder is False
+        assert parse_arguments([]).ponder is True
+        assert parse_arguments(["--pdn", "games.pdn"]).pdn == "games.pdn"
+        assert parse_arguments(["--workers", "4"]).workers == 4
+
  # todo
     def test_can_keep_track_of_turns(self):
         pass
 
-    # todo
-    def test_can_undo_player_turn(self):
-        pass
+    def test_can_undo_player_turn(self, monkeypatch, capsys):
+        game = GamePlay(ai_player=p2, ai_depth=2, ai_move_time=1, ponder=False)
+        mock_user_input(monkeypatch, "1\nu\nr\nq")
+        game.init_game()
+
+        game.game_loop()
+
+        out = capsys.readouterr().out
+        assert "Move taken back." in out and "Move played again." in out
+        # the reply of the AI is taken back and played again with the move of the human
+        assert len(game.moves) == 2
+        assert game.board.game.current_player == P.P1
+
+    def test_nothing_to_undo(self, monkeypatch, game_instance, capsys):
+        mock_user_input(monkeypatch, "u\nr\nq")
+        game_instance.init_game()
+
+        game_instance.game_loop()
+
+        out = capsys.readouterr().out
+        assert "Nothing to undo." in out and "Nothing to redo." in out
+
+    def test_chain_capture_is_chosen_once(self, monkeypatch, board_setup, game_instance, capsys):
+        setup_board(board_setup, [(p1, "a11"), (p2, "a22"), (p2, "a44"), (p2, "a88")])
+        game_instance.board = board_setup
+        mock_user_input(monkeypatch, "1\nq")
+
+        game_instance.game_loop()
+
+        assert "[1] a11 -> a22 -> a33 -> a44 -> a55" in capsys.readouterr().out
+        assert board_setup.cell_manager.get_cell_by_name("a55").get_piece_owner() == p1
+        assert board_setup.game.current_player == P.P2
+
+    def test_moves_are_saved_as_pdn_at_game_end(self, monkeypatch, tmp_path, capsys):
+        path = str(tmp_path / "game.pdn")
+        game = GamePlay(pdn_path=path)
+        mock_user_input(monkeypatch, "1\n1\nq")
+        game.init_game()
+
+        game.game_loop()
+
+        assert "Moves:\n[Result \"*\"]\n1. " in capsys.readouterr().out
+        [pdn] = read_pdn(path)
+        assert pdn.result == "*"
+        assert replay_pdn_game(Board(), pdn) == game.moves
+        assert len(game.moves) == 2
@@ -1,21 +1,117 @@
+import pytest
+
+from board import Board
+from component.game import P
+from conftest import setup_board, p1, p2
+from exceptions.illegal_move_error import IllegalMoveError
+from state.move_sequence import MoveSequence
+
+opening = [
+    MoveSequence("a33", ("a44",)),
+    MoveSequence("a66", ("a55",)),
+    MoveSequence("a44", ("a66",), ("a55",)),
+]
+
+
+@pytest.fixture
+def board() -> Board:
+    board = Board()
+    board.initial_setup()
+    return board
+
+
+def play(board: Board, moves: list[MoveSequence]) -> None:
+    for move in moves:
+        board.play_sequence(move)
+
+
 class TestUndo:
 
-    # todo
-    def test_each_move_stored_in_undo(self):
-        pass
+    def test_each_move_stored_in_undo(self, board):
+        play(board, opening)
+
+        assert board.get_played_moves() == opening
+        assert board.can_undo()
+        assert not board.can_redo()
+
+    def test_undo_holds_game_states(self, board):
+        states = []
+        for move in opening:
+            game = board.game
+            states.append((game.current_player, game.turn_counter, game.no_progress_turns, game.hash_key))
+            board.play_sequence(move)
+
+        for state in reversed(states):
+            board.undo()
+            game = board.game
+            assert (game.current_player, game.turn_counter, game.no_progress_turns, game.hash_key) == state
+
+    def test_can_undo_a_move(self, board):
+        play(board, opening[:2])
+        before = board.get_position_snapshot()
+        key, counts = board.game.hash_key, dict(board.game.position_counts)
+        board.play_sequence(opening[2])
+
+        assert board.undo() == opening[2]
+        assert board.get_position_snapshot() == before
+        assert (board.game.hash_key, board.game.position_counts) == (key, counts)
+        assert board.game.material[p2].men == 12
+
+    def test_handle_undo_empty(self, board):
+        assert board.undo() is None
+        assert board.redo() is None
+        assert not board.can_undo()
+
+    def test_undo_to_the_beginning(self, board):
+        initial = board.get_position_snapshot()
+        play(board, opening)
+
+        while board.can_undo():
+            board.undo()
+
+        assert board.get_position_snapshot() == initial
+        assert board.game.current_player == P.P1
+        assert board.game.turn_counter == 0
+
+    def test_redo_plays_undone_moves(self, board):
+        play(board, opening)
+        after = board.get_position_snapshot()
+        board.undo()
+        board.undo()
+
+        assert board.redo() == opening[1]
+        assert board.redo() == opening[2]
+        assert board.get_position_snapshot() == after
+        assert board.get_played_moves() == opening
+
+    def test_new_move_drops_redo(self, board):
+        play(board, opening[:2])
+        board.undo()
+
+        board.play_sequence(MoveSequence("a62", ("a53",)))
+
+        assert not board.can_redo()
+
+    def test_undo_reopens_finished_game(self, board_setup):
+        setup_board(board_setup, [(p1, "a33"), (p2, "a44")])
+        capture = board_setup.get_move_sequences()[0]
+        board_setup.play_sequence(capture)
+        board_setup.is_game_end(board_setup.get_available_moves(), [])
+
+        board_setup.undo()
+
+        assert board_setup.game.winner is None
+        assert not board_setup.is_game_over()
+
+    def test_illegal_move_is_not_played(self, board):
+        with pytest.raises(IllegalMoveError):
+            board.play_sequence(MoveSequence("a33", ("a55",)))
 
-    # todo
-    def test_undo_holds_game_states(self):
-        pass
+        assert not board.can_undo()
 
-    # todo
-    def test_can_undo_a_move(self):
-        pass
+    def test_setup_clears_history(self, board):
+        play(board, opening)
 
-    # todo
-    def test_handle_undo_empty(self):
-        pass
+        board.load_position_snapshot(board.get_position_snapshot())
 
-    # todo
-    def test_undo_to_the_beginning(self):
-        pass
+        assert not board.can_undo()
@@ -4,7 +4,7 @@ import pytest
 
 from component.cell import Cell
 from conftest import setup_board, setup_piece_on_cell_by_name_and_owner, get_cell_by_name, board_setup, p1, p2
-from display.cli import get_choice, moves_dto_to_dict, parse_prompt, extract_src_target_names, \
+from display.cli import get_choice, HISTORY_COMMANDS, moves_dto_to_dict, parse_prompt, extract_src_target_names, \
     extract_move_chosen_by_user
 from state.move_state import MoveState
 from utils import captures
@@ -121,6 +121,18 @@ class TestGameInteraction:
         assert selection == expected
         assert option == options.get(expected)
 
+    @pytest.mark.parametrize("user_in, expected", [("u", ("u", "undo")), ("R", ("r", "redo"))])
+    def test_player_can_give_history_command(self, monkeypatch, options, user_in, expected):
+        mock_user_input(monkeypatch, user_in)
+
+        assert get_choice(options, HISTORY_COMMANDS) == expected
+
+    def test_commands_are_options_only_when_given(self, monkeypatch, capsys, options):
+        mock_user_input(monkeypatch, "u\n1\n")
+
+        assert get_choice(options) == (1, options[1])
+        assert "press 'u'" not in capsys.readouterr().out
+
     @pytest.mark.parametrize("user_in, expected", [
         ('10\n1\n', 1), ('-1\n2\n', 2), ('0\n3\n', 3)
     ])